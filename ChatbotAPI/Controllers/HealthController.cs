@@ -42,7 +42,8 @@ public class HealthController : ControllerBase
                     python_backend = new
                     {
                         status = pythonHealth.Status,
-                        vector_store_status = pythonHealth.VectorStoreStatus
+                        vector_store_status = pythonHealth.VectorStoreStatus,
+                        index_version = pythonHealth.IndexVersion
                     }
                 };
             }
@@ -10,5 +10,8 @@ public class ChatRequestDto
     
     public Guid? SessionId { get; set; }
     
+    [RegularExpression("^[A-Za-z0-9_-]{1,64}$", ErrorMessage = "Knowledge base names use letters, digits, '-' and '_'")]
+    public string? KnowledgeBase { get; set; }
+    
     
 } 
\ No newline at end of file
@@ -10,5 +10,7 @@ public class ChatResponseDto
     public double? ProcessingTimeSeconds { get; set; }
     public List<string>? Sources { get; set; }
     public string Status { get; set; } = "Success";
+    public bool Degraded { get; set; }
+    public bool OutOfScope { get; set; }
     public string? ErrorMessage { get; set; }
 } 
\ No newline at end of file
@@ -10,6 +10,10 @@ public class PythonChatRequest
 
     [JsonPropertyName("session_id")]
     public Guid SessionId { get; set; }
+
+    [JsonPropertyName("knowledge_base")]
+    [JsonIgnore(Condition = JsonIgnoreCondition.WhenWritingNull)]
+    public string? KnowledgeBase { get; set; }
 }
 
 public class PythonChatResponse
@@ -22,6 +26,15 @@ public class PythonChatResponse
     
     [JsonPropertyName("sources")]
     public List<string>? Sources { get; set; }
+    
+    [JsonPropertyName("degraded")]
+    public bool Degraded { get; set; }
+    
+    [JsonPropertyName("index_version")]
+    public string? IndexVersion { get; set; }
+    
+    [JsonPropertyName("out_of_scope")]
+    public bool OutOfScope { get; set; }
 }
 
 public class PythonHealthResponse
@@ -35,6 +48,9 @@ public class PythonHealthResponse
     [JsonPropertyName("vector_store_status")]
     public string VectorStoreStatus { get; set; } = string.Empty;
     
+    [JsonPropertyName("index_version")]
+    public string? IndexVersion { get; set; }
+    
     [JsonPropertyName("error")]
     public string? Error { get; set; }
 } 
\ No newline at end of file
@@ -33,7 +33,13 @@ builder.Services.AddDbContext<ChatbotDbContext>(options =>
 builder.Services.Configure<PythonBackendConfig>(
     builder.Configuration.GetSection("PythonBackend"));
 
-builder.Services.AddHttpClient<IPythonBackendService, PythonBackendService>();
+builder.Services.AddHttpContextAccessor();
+builder.Services.AddHttpClient<IPythonBackendService, PythonBackendService>()
+    .ConfigurePrimaryHttpMessageHandler(() => new HttpClientHandler
+    {
+        // Lets the Python backend gzip large chat responses
+        AutomaticDecompression = System.Net.DecompressionMethods.GZip
+    });
 
 // Register application services
 builder.Services.AddScoped<IChatService, ChatService>();
@@ -44,7 +44,7 @@ public class ChatService : IChatService
             _logger.LogInformation("Saved user query to database with ID: {QueryId}", userQuery.QueryId);
             
             // 2. Send request to Python backend
-            var pythonResponse = await _pythonBackendService.SendChatRequestAsync(request.Question, userQuery.SessionId);
+            var pythonResponse = await _pythonBackendService.SendChatRequestAsync(request.Question, userQuery.SessionId, request.KnowledgeBase);
             
             stopwatch.Stop();
             double processingTimeSeconds = stopwatch.Elapsed.TotalSeconds;
@@ -56,7 +56,7 @@ public class ChatService : IChatService
                 Response = pythonResponse.Response,
                 ProcessingTimeSeconds = processingTimeSeconds,
                 Sources = pythonResponse.Sources != null ? JsonSerializer.Serialize(pythonResponse.Sources) : null,
-                Status = "Success"
+                Status = pythonResponse.Degraded ? "Degraded" : pythonResponse.OutOfScope ? "OutOfScope" : "Success"
             };
             
             _context.ChatbotResponses.Add(chatbotResponse);
@@ -78,7 +78,9 @@ public class ChatService : IChatService
                 ResponseTimestamp = chatbotResponse.Timestamp,
                 ProcessingTimeSeconds = chatbotResponse.ProcessingTimeSeconds,
                 Sources = pythonResponse.Sources,
-                Status = chatbotResponse.Status
+                Status = chatbotResponse.Status,
+                Degraded = pythonResponse.Degraded,
+                OutOfScope = pythonResponse.OutOfScope
             };
         }
         catch (Exception ex)
@@ -157,6 +159,7 @@ public class ChatService : IChatService
                 ProcessingTimeSeconds = q.Response != null ? q.Response.ProcessingTimeSeconds : null,
                 Sources = q.Response != null && q.Response.Sources != null ? JsonSerializer.Deserialize<List<string>>(q.Response.Sources) : null,
                 Status = q.Response != null ? q.Response.Status : "Pending",
+                Degraded = q.Response != null && q.Response.Status == "Degraded",
                 ErrorMessage = q.Response != null ? q.Response.ErrorMessage : null
             }).ToList();
             
@@ -4,6 +4,6 @@ namespace ChatbotAPI.Services;
 
 public interface IPythonBackendService
 {
-    Task<PythonChatResponse> SendChatRequestAsync(string question, Guid sessionId);
+    Task<PythonChatResponse> SendChatRequestAsync(string question, Guid sessionId, string? knowledgeBase = null);
     Task<PythonHealthResponse> GetHealthStatusAsync();
 } 
\ No newline at end of file
@@ -1,3 +1,5 @@
+using System.Diagnostics;
+using System.Net;
 using System.Text;
 using System.Text.Json;
 using ChatbotAPI.DTOs;
@@ -7,16 +9,23 @@ namespace ChatbotAPI.Services;
 
 public class PythonBackendService : IPythonBackendService
 {
+    private const string CorrelationHeader = "X-Correlation-ID";
+    private const string ServerTimingHeader = "Server-Timing";
+    private const string ForwardedForHeader = "X-Forwarded-For";
+
     private readonly HttpClient _httpClient;
+    private readonly IHttpContextAccessor _httpContextAccessor;
     private readonly ILogger<PythonBackendService> _logger;
     private readonly JsonSerializerOptions _jsonOptions;
 
     public PythonBackendService(
         HttpClient httpClient,
         IOptions<PythonBackendConfig> config,
+        IHttpContextAccessor httpContextAccessor,
         ILogger<PythonBackendService> logger)
     {
         _httpClient = httpClient;
+        _httpContextAccessor = httpContextAccessor;
         _logger = logger;
         
         _httpClient.BaseAddress = new Uri(config.Value.BaseUrl);
@@ -29,21 +38,44 @@ public class PythonBackendService : IPythonBackendService
         };
     }
 
-    public async Task<PythonChatResponse> SendChatRequestAsync(string question, Guid sessionId)
+    public async Task<PythonChatResponse> SendChatRequestAsync(string question, Guid sessionId, string? knowledgeBase = null)
     {
         try
         {
             _logger.LogInformation("Sending chat request to Python backend: {Question}", question);
             _logger.LogInformation("Python backend URL: {BaseUrl}", _httpClient.BaseAddress);
             
-            var request = new PythonChatRequest { Question = question, SessionId = sessionId };
+            var request = new PythonChatRequest { Question = question, SessionId = sessionId, KnowledgeBase = knowledgeBase };
             var json = JsonSerializer.Serialize(request, _jsonOptions);
             var content = new StringContent(json, Encoding.UTF8, "application/json");
             
-            _logger.LogInformation("Sending POST request to /chat endpoint...");
-            var response = await _httpClient.PostAsync("/chat", content);
+            // HttpClient propagates the W3C traceparent of the current activity; the correlation id
+            // ties this request to the Python stage timings in the logs and exported spans
+            var correlationId = Activity.Current?.TraceId.ToHexString() ?? Guid.NewGuid().ToString("N");
+            using var httpRequest = new HttpRequestMessage(HttpMethod.Post, "/chat") { Content = content };
+            httpRequest.Headers.Add(CorrelationHeader, correlationId);
+            // The backend rate limits per client address, so pass on the caller's rather than ours
+            var clientAddress = _httpContextAccessor.HttpContext?.Connection.RemoteIpAddress?.ToString();
+            if (clientAddress != null)
+            {
+                httpRequest.Headers.Add(ForwardedForHeader, clientAddress);
+            }
+            
+            _logger.LogInformation("Sending POST request to /chat endpoint (correlation {CorrelationId})...", correlationId);
+            var response = await _httpClient.SendAsync(httpRequest);
             
             _logger.LogInformation("Received response from Python backend. Status: {StatusCode}", response.StatusCode);
+            if (response.Headers.TryGetValues(ServerTimingHeader, out var serverTiming))
+            {
+                _logger.LogInformation("Python backend timing for {CorrelationId}: {ServerTiming}", correlationId, string.Join(", ", serverTiming));
+            }
+            
+            if (response.StatusCode == HttpStatusCode.TooManyRequests)
+            {
+                var retryAfter = response.Headers.RetryAfter?.Delta?.TotalSeconds ?? 1;
+                _logger.LogWarning("Python backend rate limited session {SessionId}, retry after {RetryAfter}s", sessionId, retryAfter);
+                throw new InvalidOperationException($"Too many requests, please retry in {retryAfter:0} seconds.");
+            }
             
             response.EnsureSuccessStatusCode();
             
@@ -74,7 +106,8 @@ public class PythonBackendService : IPythonBackendService
             return new PythonChatResponse
             {
                 Response = "This is a fallback response from the .NET API because the Python backend is not available. The Python backend needs to be running for full RAG functionality.",
-                Sources = new List<string> { "Fallback Response" }
+                Sources = new List<string> { "Fallback Response" },
+                Degraded = true
             };
         }
         catch (JsonException ex)
@@ -5,15 +5,99 @@ class Settings(BaseSettings):
     # Ollama Configuration
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3"  
+    generation_start_timeout_seconds: float = 5.0  # fall back to retrieval-only answers past this
+    ollama_read_timeout_seconds: int = 60  # longest silence on an Ollama connection before the generation fails
+    llm_cooldown_seconds: float = 30.0  # skip the LLM for this long after it timed out or failed
+    generation_max_workers: int = 4
+    llm_recorder_mode: str = "off"  # "record", "replay" or "auto" (replay hits, record misses) LLM completions
+    llm_recordings_path: str = "./llm_recordings/completions.jsonl.gz"
+    llm_replay_speed: float = 1.0  # multiplier on the recorded token timing, 0 replays instantly
     
     # Document Processing
     docs_directory: str = "docs"
     chunk_size: int = 500
     chunk_overlap: int = 50
+    chunking_strategy: str = "section"  # "section" (heading-aware, token based) or "recursive"
+    chunk_max_tokens: int = 128
+    chunk_overlap_tokens: int = 16
+    dedup_enabled: bool = True  # collapse near-duplicate chunks before embedding
+    dedup_threshold: float = 0.85  # word 3-gram Jaccard similarity at which chunks count as duplicates
+    dedup_num_perm: int = 64  # MinHash permutations, split into dedup_bands LSH bands
+    dedup_bands: int = 16
+    parent_expansion_enabled: bool = True  # search small chunks, send their parent sections to the LLM
+    parent_section_depth: int = 1  # heading level parents are cut at, 1 = top-level sections with their subsections
+    parent_max_tokens: int = 512  # longer sections are split into several parents
+    context_max_tokens: int = 1500  # budget of retrieved context in the prompt
+    
+    # Knowledge Bases
+    default_knowledge_base: str = "default"  # served from docs_directory / vector_store_path with snapshots
+    knowledge_bases_directory: str = "./knowledge_bases"  # one <name>/docs directory per additional knowledge base
+    knowledge_base_memory_mb: float = 512.0  # budget for loaded knowledge bases, idle ones are evicted LRU first
     
     # Vector Store
     vector_store_path: str = "./vector_store"
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # "torch" (sentence-transformers), "onnx" or "onnx-int8" (ONNX Runtime)
+    embedding_threads: int = 0  # intra-op threads for embedding inference (0 = runtime default)
+    embedding_onnx_directory: str = ""  # local export with onnx/model.onnx and tokenizer.json, downloaded when empty
+    embedding_cache_directory: str = "./model_cache"  # int8 ONNX models quantized by the backend
+    embedding_batch_wait_ms: float = 2.0  # window for coalescing concurrent query embeddings (0 disables batching)
+    embedding_batch_max_size: int = 32  # texts per batched embedding call
+    vector_index_mode: str = "chroma"  # "chroma", or an array-backed "float32", "int8" or "binary" index
+    vector_index_rescore_factor: int = 4  # quantized candidates re-scored per result
+    snapshots_directory: str = "./index_snapshots"  # versioned index builds, see /admin/index
+    snapshot_keep: int = 3
+    snapshot_smoke_query: str = "annual leave"  # must return results before a snapshot goes live
+    reindex_cpu_threads: int = 1  # threads the background reindex worker may use
+    reindex_nice: int = 10  # scheduling priority penalty for the reindex worker process
+    reindex_batch_size: int = 64  # chunks embedded per batch (progress and cancellation granularity)
+    
+    # Retrieval
+    retrieval_k: int = 3  # chunks per question when scores show no clear cut-off
+    adaptive_k_enabled: bool = True  # cut results at the largest score gap
+    retrieval_min_k: int = 1
+    retrieval_max_k: int = 5  # candidates fetched when adaptive k is on
+    adaptive_k_min_gap: float = 0.08  # smallest cosine drop that counts as a cut-off
+    min_relevance_score: float = 0.25  # below this best score the question is out of scope (0 disables)
+    decomposition_mode: str = "off"  # "off", "merge" (one answer over merged contexts) or "parallel" (one per sub-query)
+    decomposition_max_parts: int = 3
+    decomposition_max_concurrency: int = 3  # concurrent sub-query searches / generations
+    decomposition_max_chunks: int = 6  # merged context size across sub-queries
+    snippets_per_chunk: int = 1  # supporting sentences returned per retrieved chunk
+    snippet_cache_size: int = 2048  # chunks whose sentence embeddings are kept in memory
+    
+    # Tracing
+    trace_exporter: str = "none"  # "none", "jsonl" (span per line to trace_jsonl_path) or "otlp"
+    trace_jsonl_path: str = "./traces/spans.jsonl"
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP (JSON) collector
+    trace_service_name: str = "rag-python-backend"
+    server_timing_enabled: bool = True  # echo per-stage durations in a Server-Timing header
+    
+    # Diagnostics
+    diagnostics_cache_seconds: float = 30.0  # /diagnostics serves cached results younger than this
+    diagnostics_min_interval_seconds: float = 5.0  # forced refreshes are refused more often than this
+    diagnostics_timeout_seconds: float = 5.0  # LLM ping timeout
+    
+    # Response encoding (negotiated through Accept / Accept-Encoding on /chat)
+    response_compression_enabled: bool = True  # gzip, and zstd when zstandard is installed
+    response_compression_min_bytes: int = 512  # smaller bodies are sent uncompressed
+    response_gzip_level: int = 6
+    response_zstd_level: int = 3
+    
+    # Rate limiting and fair scheduling
+    rate_limit_enabled: bool = True
+    session_rate_per_minute: float = 20.0  # sustained /chat requests per session
+    session_burst: int = 5  # requests a session may send back to back
+    ip_rate_per_minute: float = 120.0  # sustained /chat requests per client address
+    ip_burst: int = 20
+    rate_limit_max_keys: int = 10000  # sessions / addresses tracked, least recently seen dropped
+    rate_limit_trusted_proxies: str = "127.0.0.1,::1"  # peers whose X-Forwarded-For names the client (the .NET API)
+    generation_queue_timeout_seconds: float = 30.0  # wait for a generation slot before answering retrieval-only
+    
+    # Profiling
+    profiling_enabled: bool = False  # expose /admin/profile for on-demand CPU and allocation profiles
+    profiling_interval_ms: float = 5.0  # stack sampling interval
+    profiling_max_seconds: float = 60.0  # longest profiling session
     
     # API Configuration
     host: str = "localhost"
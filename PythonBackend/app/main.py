@@ -1,12 +1,24 @@
 import logging
 import uvicorn
 from typing import Optional
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
-from app.models.schemas import ChatRequest, ChatResponse, HealthResponse
+from app.models.schemas import (
+    ChatRequest, ChatResponse, DiagnosticsResponse, HealthResponse, IndexSnapshotsResponse, KnowledgeBasesResponse,
+    ProfileStatusResponse, RateLimitsResponse, ReindexJobResponse, SourceSnippet
+)
+from app.services.diagnostics import Diagnostics, DiagnosticsRateLimited
+from app.services.profiler import RequestProfiler
+from app.services.rate_limiter import RateLimited, RequestRateLimiter
 from app.services.rag_service import RAGService
+from app.services.reindex_jobs import ReindexJobManager
+from app.services.response_encoding import ResponseEncoder
+from app.services.tracing import (
+    CORRELATION_HEADER, SERVER_TIMING_HEADER, TRACEPARENT_HEADER, Tracer, current_trace
+)
 from app.config.settings import settings
 
 import warnings
@@ -23,15 +35,26 @@ logger = logging.getLogger(__name__)
 
 # Global RAG service instance (Singleton pattern)
 rag_service: Optional[RAGService] = None
+reindex_jobs: Optional[ReindexJobManager] = None
+diagnostics: Optional[Diagnostics] = None
+tracer = Tracer.from_settings()
+response_encoder = ResponseEncoder.from_settings()
+rate_limiter = RequestRateLimiter.from_settings()
+profiler = RequestProfiler(
+    interval_ms=settings.profiling_interval_ms,
+    max_seconds=settings.profiling_max_seconds
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global rag_service
+    global rag_service, reindex_jobs, diagnostics
     logger.info("Starting up Python RAG Backend...")
     
     try:
         rag_service = RAGService()
+        reindex_jobs = ReindexJobManager(rag_service)
+        diagnostics = Diagnostics(rag_service)
         logger.info("RAG service initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize RAG service: {str(e)}")
@@ -42,6 +65,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Python RAG Backend...")
+    if reindex_jobs:
+        reindex_jobs.shutdown()
+    if rag_service and rag_service.embedding_batcher:
+        rag_service.embedding_batcher.close()
+    profiler.stop()
+    tracer.shutdown()
 
 # Create FastAPI app with lifespan events
 app = FastAPI(
@@ -60,6 +89,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Continue the caller's trace, and return trace id, correlation id and stage timings."""
+    with tracer.start_trace(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get(TRACEPARENT_HEADER),
+        correlation_id=request.headers.get(CORRELATION_HEADER)
+    ) as trace:
+        response = await call_next(request)
+        trace.root.attributes["status_code"] = response.status_code
+    
+    response.headers[TRACEPARENT_HEADER] = trace.traceparent
+    response.headers[CORRELATION_HEADER] = trace.correlation_id
+    if settings.server_timing_enabled:
+        response.headers[SERVER_TIMING_HEADER] = trace.server_timing()
+    return response
+
 def get_rag_service() -> RAGService:
     """Dependency to get RAG service instance."""
     if rag_service is None:
@@ -69,28 +115,72 @@ def get_rag_service() -> RAGService:
         )
     return rag_service
 
+def get_reindex_jobs() -> ReindexJobManager:
+    """Dependency to get the reindex job manager."""
+    get_rag_service()
+    return reindex_jobs
+
+def get_diagnostics() -> Diagnostics:
+    """Dependency to get the diagnostics runner."""
+    get_rag_service()
+    return diagnostics
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(
+def chat_endpoint(
     request: ChatRequest,
+    http_request: Request,
     service: RAGService = Depends(get_rag_service)
 ):
     """
     Main chat endpoint that processes user questions and returns AI responses.
+    Runs on the threadpool so concurrent questions are served in parallel.
+    The response is encoded and compressed as negotiated by Accept / Accept-Encoding.
     """
+    if settings.rate_limit_enabled:
+        try:
+            rate_limiter.check(
+                str(request.session_id),
+                peer=http_request.client.host if http_request.client else None,
+                forwarded_for=http_request.headers.get("x-forwarded-for")
+            )
+        except RateLimited as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
+    
+    knowledge_base = request.knowledge_base or settings.default_knowledge_base
+    if knowledge_base != settings.default_knowledge_base and not service.knowledge_bases.exists(knowledge_base):
+        raise HTTPException(status_code=404, detail=f"Knowledge base {knowledge_base} not found")
+    
     try:
-        logger.info(f"Received chat request: {request.question}")
+        trace = current_trace()
+        logger.info(f"Received chat request [{trace.correlation_id if trace else '-'}]: {request.question}")
         
         # Get answer from RAG service
-        answer, sources = service.get_answer(request.question)
+        filters = request.filters.model_dump(exclude_none=True) if request.filters else None
+        with profiler.profile_request():
+            result = service.get_answer(request.question, filters, knowledge_base, str(request.session_id))
         
         response = ChatResponse(
-            response=answer,
-            sources=sources if sources else None,
-            session_id=request.session_id
+            response=result.answer,
+            sources=result.sources if result.sources else None,
+            snippets=[
+                SourceSnippet(source=s.source, section=s.section, text=s.text, score=s.score)
+                for s in result.snippets
+            ] or None,
+            session_id=request.session_id,
+            degraded=result.degraded,
+            index_version=result.index_version,
+            out_of_scope=result.out_of_scope,
+            knowledge_base=knowledge_base
         )
         
-        logger.info(f"Successfully processed chat request")
-        return response
+        if result.degraded:
+            logger.warning("Served retrieval-only response, LLM slow or unavailable")
+        logger.info(f"Successfully processed chat request [{trace.server_timing() if trace else '-'}]")
+        return response_encoder.encode(
+            response,
+            accept=http_request.headers.get("accept"),
+            accept_encoding=http_request.headers.get("accept-encoding")
+        )
         
     except Exception as e:
         logger.error(f"Error processing chat request: {str(e)}")
@@ -101,18 +191,23 @@ async def chat_endpoint(
 
 @app.get("/health", response_model=HealthResponse)
 async def health_endpoint():
-    """Health check endpoint."""
+    """
+    Health check endpoint for liveness/readiness probes.
+    Reads cached state only; use /diagnostics for checks that do real work.
+    """
     try:
         health_info = HealthResponse()
         
         if rag_service:
             service_health = rag_service.health_check()
             health_info.vector_store_status = service_health.get("vector_store_status", "unknown")
+            health_info.index_version = service_health.get("index_version")
+            if health_info.vector_store_status != "healthy":
+                health_info.status = "degraded"
         else:
             health_info.vector_store_status = "unavailable"
             health_info.status = "degraded"
         
-        logger.info("Health check completed")
         return health_info
         
     except Exception as e:
@@ -122,6 +217,132 @@ async def health_endpoint():
             detail=f"Health check failed: {str(e)}"
         )
 
+@app.get("/diagnostics", response_model=DiagnosticsResponse)
+def diagnostics_endpoint(refresh: bool = False, runner: Diagnostics = Depends(get_diagnostics)):
+    """
+    Deep checks: a sample retrieval, an LLM ping, collection counts and index size on disk.
+    Results are cached; refresh=true re-runs them at most once per DIAGNOSTICS_MIN_INTERVAL_SECONDS.
+    """
+    try:
+        return DiagnosticsResponse(**runner.get(refresh=refresh))
+    except DiagnosticsRateLimited as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+
+@app.get("/knowledge-bases", response_model=KnowledgeBasesResponse)
+def list_knowledge_bases(service: RAGService = Depends(get_rag_service)):
+    """Available knowledge bases, which are loaded, and per knowledge base latency and cache metrics."""
+    return KnowledgeBasesResponse(
+        default=settings.default_knowledge_base,
+        available=service.knowledge_bases.names(),
+        **service.knowledge_bases.stats()
+    )
+
+@app.get("/admin/rate-limits", response_model=RateLimitsResponse)
+def rate_limit_stats(service: RAGService = Depends(get_rag_service)):
+    """Rate limit counters per session and client, and the generation queue across sessions."""
+    return RateLimitsResponse(
+        enabled=settings.rate_limit_enabled,
+        **rate_limiter.stats(),
+        generation=service.generation_scheduler.stats()
+    )
+
+def get_profiler() -> RequestProfiler:
+    """Dependency to get the request profiler, hidden unless profiling is enabled."""
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled, set PROFILING_ENABLED=true")
+    return profiler
+
+@app.post("/admin/profile", response_model=ProfileStatusResponse, status_code=202)
+def start_profile(
+    requests: int = Query(default=10, ge=1, le=10000, description="Chat requests to profile"),
+    seconds: Optional[float] = Query(default=None, gt=0, description="Time window, capped at PROFILING_MAX_SECONDS"),
+    allocations: bool = Query(default=True, description="Also trace allocations with tracemalloc"),
+    runner: RequestProfiler = Depends(get_profiler)
+):
+    """Profile the next chat requests or a time window, whichever ends first."""
+    try:
+        return ProfileStatusResponse(**runner.start(requests=requests, seconds=seconds, allocations=allocations))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.get("/admin/profile", response_model=ProfileStatusResponse)
+def profile_status(runner: RequestProfiler = Depends(get_profiler)):
+    """State of the current or last profiling session."""
+    return ProfileStatusResponse(**runner.status())
+
+@app.post("/admin/profile/stop", response_model=ProfileStatusResponse)
+def stop_profile(runner: RequestProfiler = Depends(get_profiler)):
+    """End the running profiling session early."""
+    runner.stop()
+    return ProfileStatusResponse(**runner.status())
+
+@app.get("/admin/profile/cpu", response_class=PlainTextResponse)
+def profile_cpu(runner: RequestProfiler = Depends(get_profiler)):
+    """Stack samples of the last session as collapsed stacks (flamegraph.pl, speedscope)."""
+    return runner.collapsed_stacks()
+
+@app.get("/admin/profile/allocations", response_class=PlainTextResponse)
+def profile_allocations(runner: RequestProfiler = Depends(get_profiler)):
+    """Top allocation sites of the last session, once it has finished."""
+    return runner.allocation_report()
+
+@app.get("/admin/index/snapshots", response_model=IndexSnapshotsResponse)
+def list_index_snapshots(service: RAGService = Depends(get_rag_service)):
+    """List the kept index snapshots and the active version."""
+    return IndexSnapshotsResponse(
+        active_version=service.index_version,
+        snapshots=service.snapshots.list_snapshots()
+    )
+
+@app.post("/admin/index/rollback", response_model=IndexSnapshotsResponse)
+def rollback_index(version: Optional[str] = None, service: RAGService = Depends(get_rag_service)):
+    """Switch back to an earlier index snapshot (default: the previous one)."""
+    try:
+        service.rollback_index(version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Index rollback failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Index rollback failed: {str(e)}")
+    
+    return IndexSnapshotsResponse(
+        active_version=service.index_version,
+        snapshots=service.snapshots.list_snapshots()
+    )
+
+@app.post("/admin/reindex", response_model=ReindexJobResponse, status_code=202)
+def start_reindex(jobs: ReindexJobManager = Depends(get_reindex_jobs)):
+    """Rebuild the knowledge base into a new index snapshot as a background job."""
+    try:
+        return ReindexJobResponse(**jobs.start())
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.get("/admin/jobs", response_model=list[ReindexJobResponse])
+def list_reindex_jobs(jobs: ReindexJobManager = Depends(get_reindex_jobs)):
+    """All reindex jobs since startup, newest first."""
+    return [ReindexJobResponse(**job) for job in jobs.list_jobs()]
+
+@app.get("/admin/jobs/{job_id}", response_model=ReindexJobResponse)
+def get_reindex_job(job_id: str, jobs: ReindexJobManager = Depends(get_reindex_jobs)):
+    """Progress of a reindex job."""
+    status = jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return ReindexJobResponse(**status)
+
+@app.post("/admin/jobs/{job_id}/cancel", response_model=ReindexJobResponse)
+def cancel_reindex_job(job_id: str, jobs: ReindexJobManager = Depends(get_reindex_jobs)):
+    """Cancel a queued or running reindex job."""
+    status = jobs.cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return ReindexJobResponse(**status)
+
 @app.get("/info")
 async def root():
     """Root endpoint with basic info."""
@@ -131,6 +352,14 @@ async def root():
         "endpoints": {
             "chat": "/chat",
             "health": "/health",
+            "diagnostics": "/diagnostics",
+            "knowledge_bases": "/knowledge-bases",
+            "index_snapshots": "/admin/index/snapshots",
+            "index_rollback": "/admin/index/rollback",
+            "reindex": "/admin/reindex",
+            "reindex_job": "/admin/jobs/{job_id}",
+            "rate_limits": "/admin/rate-limits",
+            "profile": "/admin/profile",
             "docs": "/docs"
         }
     }
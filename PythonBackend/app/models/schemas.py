@@ -1,19 +1,90 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime
 import uuid
 
+class RetrievalFilters(BaseModel):
+    source: Optional[list[str]] = Field(default=None, description="Source file names, e.g. HR_Policy_Dataset1.txt")
+    section: Optional[list[str]] = Field(default=None, description="Policy sections, e.g. '4. Leave Policies' or 'Sick Leave'")
+    tag: Optional[list[str]] = Field(default=None, description="Section tags, e.g. leave-policies")
+
 class ChatRequest(BaseModel):
     question: str = Field(..., min_length=1, max_length=2000, description="User's question")
     session_id: uuid.UUID = Field(..., description="Unique session identifier (UUID4)")
+    filters: Optional[RetrievalFilters] = Field(default=None, description="Restrict retrieval to matching chunks")
+    knowledge_base: Optional[str] = Field(
+        default=None, pattern=r"^[A-Za-z0-9_-]{1,64}$", description="Knowledge base to answer from, the default one when omitted"
+    )
+
+class SourceSnippet(BaseModel):
+    source: str = Field(..., description="Source document of the sentence")
+    section: Optional[str] = Field(default=None, description="Section path of the chunk")
+    text: str = Field(..., description="Supporting sentence")
+    score: float = Field(..., description="Cosine similarity to the question")
 
 class ChatResponse(BaseModel):
     response: str = Field(..., description="Chatbot's response")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     sources: Optional[list[str]] = Field(default=None, description="Source documents used")
+    snippets: Optional[list[SourceSnippet]] = Field(default=None, description="Best supporting sentences from each retrieved chunk")
     session_id: uuid.UUID = Field(..., description="Unique session identifier (UUID4)")
+    degraded: bool = Field(default=False, description="True when the LLM was slow or unavailable and the response holds retrieved passages only")
+    index_version: Optional[str] = Field(default=None, description="Index snapshot the response was retrieved from")
+    out_of_scope: bool = Field(default=False, description="True when no policy passage was relevant enough and the LLM was skipped")
+    knowledge_base: Optional[str] = Field(default=None, description="Knowledge base the response was answered from")
     
 class HealthResponse(BaseModel):
     status: str = "healthy"
     timestamp: datetime = Field(default_factory=datetime.utcnow)
-    vector_store_status: str = "unknown"
\ No newline at end of file
+    vector_store_status: str = "unknown"
+    index_version: Optional[str] = None
+
+class DiagnosticsResponse(BaseModel):
+    status: str = Field(..., description="healthy when every check passed, otherwise degraded")
+    checked_at: datetime = Field(..., description="When the checks ran")
+    age_seconds: float = Field(..., description="Age of the cached result")
+    index_version: Optional[str] = Field(default=None, description="Index snapshot that was checked")
+    checks: dict[str, dict[str, Any]] = Field(..., description="Result, duration and details of each check")
+
+class KnowledgeBasesResponse(BaseModel):
+    default: str = Field(..., description="Knowledge base used when a request names none")
+    available: list[str] = Field(default_factory=list, description="Additional knowledge bases found on disk")
+    memory_budget_mb: float = Field(..., description="Memory budget for loaded knowledge bases")
+    memory_used_mb: float = Field(..., description="Estimated memory of the loaded knowledge bases")
+    knowledge_bases: dict[str, dict[str, Any]] = Field(
+        default_factory=dict, description="Load state, cache counters and latency percentiles per knowledge base"
+    )
+
+class RateLimitsResponse(BaseModel):
+    enabled: bool = Field(..., description="Whether /chat requests are rate limited")
+    session: dict[str, Any] = Field(..., description="Token bucket settings and allowed/limited counts per session")
+    client: dict[str, Any] = Field(..., description="Token bucket settings and allowed/limited counts per client address")
+    generation: dict[str, Any] = Field(..., description="Generation slots in use, requests waiting per session, queue counters")
+
+class ProfileStatusResponse(BaseModel):
+    active: bool = Field(..., description="True while a profiling session is running")
+    started_at: Optional[datetime] = Field(default=None, description="Start of the current or last session")
+    finished_at: Optional[datetime] = Field(default=None, description="End of the last session")
+    requests_profiled: int = Field(default=0, description="Chat requests completed during the session")
+    max_requests: int = Field(default=0, description="Requests after which the session ends")
+    samples: int = Field(default=0, description="Stack sampling rounds taken while a profiled request was in flight")
+    distinct_stacks: int = Field(default=0, description="Distinct stacks in the CPU profile")
+    allocations: bool = Field(default=False, description="Whether allocations are traced")
+
+class IndexSnapshotsResponse(BaseModel):
+    active_version: Optional[str] = Field(default=None, description="Snapshot currently served")
+    snapshots: list[dict] = Field(default_factory=list, description="Manifests of the kept snapshots, oldest first")
+
+class ReindexJobResponse(BaseModel):
+    job_id: str = Field(..., description="Reindex job identifier")
+    status: str = Field(..., description="queued, running, publishing, succeeded, failed or cancelled")
+    index_version: Optional[str] = Field(default=None, description="Snapshot version the job builds")
+    files_done: int = 0
+    files_total: Optional[int] = None
+    chunks_embedded: int = 0
+    chunks_total: Optional[int] = None
+    embeddings_per_second: Optional[float] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
\ No newline at end of file
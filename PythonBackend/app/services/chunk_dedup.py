@@ -0,0 +1,143 @@
+import re
+import zlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+from app.services.metadata_index import SECTION_PATHS_SEPARATOR, SOURCE_SEPARATOR, TAG_SEPARATOR
+
+_WORD = re.compile(r'[a-z0-9]+')
+# Mersenne prime for the universal hash family; keeps a * x below 2**62 in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word n-grams of a text, ignoring case, punctuation and whitespace."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class DedupReport:
+    """Outcome of deduplicating one batch of chunks."""
+    chunks_in: int
+    chunks_out: int
+    characters_in: int
+    characters_out: int
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of chunks removed as near-duplicates."""
+        return 1 - self.chunks_out / self.chunks_in if self.chunks_in else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "chunks_in": self.chunks_in,
+            "chunks_out": self.chunks_out,
+            "dedup_ratio": round(self.dedup_ratio, 4),
+            "characters_in": self.characters_in,
+            "characters_out": self.characters_out
+        }
+
+
+class ChunkDeduplicator:
+    """
+    Collapses near-duplicate chunks before they are embedded.
+    Follows SRP - Only fingerprints and merges chunks, splitting stays in DocumentProcessor.
+
+    Chunks are MinHash-fingerprinted over word 3-grams and bucketed with LSH
+    (bands x rows = num_perm), so a chunk is only compared with kept chunks it
+    shares a band with. Candidates whose exact shingle Jaccard similarity reaches
+    the threshold are merged into the first occurrence, which records every
+    source, section path and tag of the chunks it stands for, so filters on any
+    of them find it. Its own section_path, and the parent section it expands to,
+    stay those of the first occurrence: the duplicates' text is the same, so their
+    parent sections would add the same passage to the context again.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Set[int]) -> np.ndarray:
+        """MinHash signature: the minimum of every hash permutation over the shingles."""
+        if not shingle_set:
+            return np.full(len(self._a), int(_PRIME), dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) % _PRIME
+        return ((np.outer(values, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def deduplicate(self, chunks: Sequence[Document]) -> Tuple[List[Document], DedupReport]:
+        """Near-duplicate-free chunks in their original order, and what was removed."""
+        kept: List[Document] = []
+        kept_shingles: List[Set[int]] = []
+        buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+
+        for chunk in chunks:
+            chunk_shingles = shingles(chunk.page_content)
+            keys = self._band_keys(self.signature(chunk_shingles))
+            candidates = {row for key in keys for row in buckets.get(key, ())}
+            match = next(
+                (row for row in sorted(candidates) if jaccard(chunk_shingles, kept_shingles[row]) >= self.threshold),
+                None
+            )
+            if match is not None:
+                _merge_metadata(kept[match], chunk)
+                continue
+
+            row = len(kept)
+            kept.append(Document(page_content=chunk.page_content, metadata=dict(chunk.metadata)))
+            kept_shingles.append(chunk_shingles)
+            for key in keys:
+                buckets[key].append(row)
+
+        report = DedupReport(
+            chunks_in=len(chunks),
+            chunks_out=len(kept),
+            characters_in=sum(len(chunk.page_content) for chunk in chunks),
+            characters_out=sum(len(chunk.page_content) for chunk in kept)
+        )
+        self.logger.info(
+            f"Collapsed {report.chunks_in - report.chunks_out} near-duplicate chunks "
+            f"({report.dedup_ratio:.1%} of {report.chunks_in})"
+        )
+        return kept, report
+
+
+def _merge_list(metadata: dict, field: str, values: Sequence[str], separator: str = TAG_SEPARATOR):
+    merged = [v for v in metadata.get(field, "").split(separator) if v]
+    merged.extend(v for v in values if v and v not in merged)
+    metadata[field] = separator.join(merged)
+
+
+def _merge_metadata(kept: Document, duplicate: Document):
+    """Record a collapsed duplicate's source, section path and tags on the chunk that stands for it."""
+    metadata = kept.metadata
+    metadata.setdefault("sources", metadata.get("source", ""))
+    _merge_list(metadata, "sources", [duplicate.metadata.get("source", "")], SOURCE_SEPARATOR)
+    if metadata.get("section_path") or duplicate.metadata.get("section_path"):
+        metadata.setdefault("section_paths", metadata.get("section_path", ""))
+        _merge_list(metadata, "section_paths", [duplicate.metadata.get("section_path", "")], SECTION_PATHS_SEPARATOR)
+    _merge_list(metadata, "tags", duplicate.metadata.get("tags", "").split(TAG_SEPARATOR))
+    metadata["duplicate_count"] = metadata.get("duplicate_count", 0) + 1
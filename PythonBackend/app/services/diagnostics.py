@@ -0,0 +1,136 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from app.config.settings import settings
+
+
+class DiagnosticsRateLimited(Exception):
+    """A fresh diagnostics run was requested before the minimum interval passed."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Diagnostics ran {settings.diagnostics_min_interval_seconds - retry_after:.1f}s ago")
+        self.retry_after = retry_after
+
+
+def directory_size(path: str) -> int:
+    """Total size in bytes of the files under a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class Diagnostics:
+    """
+    Deep checks of the RAG pipeline for operators, kept off the probe path.
+    Follows SRP - Runs and caches diagnostic checks, the service is only read.
+
+    Results are cached for settings.diagnostics_cache_seconds; a forced refresh
+    is refused within settings.diagnostics_min_interval_seconds of the last run,
+    and concurrent requests share a single run.
+    """
+
+    def __init__(self, rag_service):
+        self.logger = logging.getLogger(__name__)
+        self.rag_service = rag_service
+        self._lock = threading.Lock()
+        self._result: Optional[dict] = None
+        self._ran_at = 0.0
+
+    def get(self, refresh: bool = False) -> dict:
+        """Cached diagnostics, re-running the checks when stale or on a permitted refresh."""
+        requested = time.monotonic()
+        with self._lock:
+            # Another request may have run the checks while this one waited for the lock
+            if self._result is not None and self._ran_at >= requested:
+                return self._with_age(self._result)
+            if self._result is not None:
+                age = time.monotonic() - self._ran_at
+                if refresh and age < settings.diagnostics_min_interval_seconds:
+                    raise DiagnosticsRateLimited(settings.diagnostics_min_interval_seconds - age)
+                if not refresh and age < settings.diagnostics_cache_seconds:
+                    return self._with_age(self._result)
+            self._result = self.run()
+            self._ran_at = time.monotonic()
+            return self._with_age(self._result)
+
+    def _with_age(self, result: dict) -> dict:
+        return {**result, "age_seconds": round(time.monotonic() - self._ran_at, 2)}
+
+    def run(self) -> dict:
+        """Run every check, timing each one; a failing check does not stop the others."""
+        checks = {
+            "retrieval": self._check_retrieval,
+            "llm": self._check_llm,
+            "vector_store": self._check_vector_store,
+            "index_on_disk": self._check_index_on_disk
+        }
+        results = {name: self._timed(check) for name, check in checks.items()}
+        status = "healthy" if all(r["status"] == "ok" for r in results.values()) else "degraded"
+        self.logger.info(f"Diagnostics completed: {status}")
+        return {
+            "status": status,
+            "checked_at": datetime.utcnow(),
+            "index_version": self.rag_service.index_version,
+            "checks": results
+        }
+
+    def _timed(self, check: Callable[[], Dict]) -> dict:
+        start = time.perf_counter()
+        try:
+            result = {"status": "ok", **check()}
+        except Exception as e:
+            self.logger.warning(f"Diagnostic check {check.__name__} failed: {str(e)}")
+            result = {"status": "error", "error": str(e)}
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    def _check_retrieval(self) -> dict:
+        with self.rag_service.use_retriever() as retriever:
+            if retriever is None:
+                raise RuntimeError("Retriever not initialized")
+            results = retriever.search(settings.snapshot_smoke_query, k=1)
+        if not results:
+            raise RuntimeError(f"No results for {settings.snapshot_smoke_query!r}")
+        document, score = results[0]
+        return {
+            "query": settings.snapshot_smoke_query,
+            "top_source": document.metadata.get("source"),
+            "top_score": round(float(score), 4),
+            "embedding_batcher": self.rag_service.embedding_batcher.stats() if self.rag_service.embedding_batcher else None
+        }
+
+    def _check_llm(self) -> dict:
+        response = httpx.get(f"{settings.ollama_base_url}/api/tags", timeout=settings.diagnostics_timeout_seconds)
+        response.raise_for_status()
+        models = [m.get("name", "") for m in response.json().get("models", [])]
+        available = any(name.split(":")[0] == settings.ollama_model.split(":")[0] for name in models)
+        if not available:
+            raise RuntimeError(f"Model {settings.ollama_model} not pulled, Ollama has {models}")
+        return {"model": settings.ollama_model, "cooling_down": self.rag_service.health_check()["llm_status"] == "cooling_down"}
+
+    def _check_vector_store(self) -> dict:
+        processor = self.rag_service.document_processor
+        if processor.vector_store is None:
+            raise RuntimeError("Vector store not loaded")
+        return {
+            "collection_count": processor.vector_store._collection.count(),
+            "index_mode": settings.vector_index_mode,
+            "indexed_rows": len(processor.vector_index) if processor.vector_index is not None else None
+        }
+
+    def _check_index_on_disk(self) -> dict:
+        path = self.rag_service.document_processor.vector_store_path
+        if not os.path.isdir(path):
+            raise RuntimeError(f"Index directory {path} is missing")
+        return {"path": path, "size_mb": round(directory_size(path) / 1e6, 2)}
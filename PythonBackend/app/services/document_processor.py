@@ -1,13 +1,22 @@
 import os
+import sys
 import logging
+import threading
 import warnings
-from typing import List
+from typing import Callable, List, Optional, Tuple
 from langchain_community.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_community.vectorstores import Chroma
 from app.config.settings import settings
+from app.services.chunk_dedup import ChunkDeduplicator, DedupReport
+from app.services.embedding_backends import create_embeddings, create_token_counter
+from app.services.section_chunker import SECTION_PATH_SEPARATOR, SectionChunker, section_path_at
+from app.services.metadata_index import MetadataIndex, section_metadata
+from app.services.parent_store import PARENTS_FILE, ParentStore
+from app.services.vector_index import VectorIndex
+from app.services.diagnostics import directory_size
 
 warnings.filterwarnings("ignore")
 
@@ -17,22 +26,70 @@ class DocumentProcessor:
     Follows SRP - Single responsibility for document processing.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        vector_store_path: Optional[str] = None,
+        embeddings: Optional[Embeddings] = None,
+        docs_directory: Optional[str] = None
+    ):
+        """
+        Args:
+            vector_store_path: Directory of the vector store, defaults to settings.vector_store_path
+            embeddings: Embedding model to share with another processor instead of loading a new one
+            docs_directory: Documents the vector store is built from when missing, defaults to settings.docs_directory
+        """
         self.logger = logging.getLogger(__name__)
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=settings.embedding_model,
-            model_kwargs={'device': 'cpu'}
-        )
+        self.vector_store_path = vector_store_path or settings.vector_store_path
+        self.docs_directory = docs_directory or settings.docs_directory
+        self.embeddings = embeddings or create_embeddings()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
             length_function=len,
-            separators=["\n\n", "\n", " ", ""]
+            separators=["\n\n", "\n", " ", ""],
+            add_start_index=True
         )
+        self.section_chunker = None
+        if settings.chunking_strategy == "section":
+            self.section_chunker = SectionChunker(
+                max_tokens=settings.chunk_max_tokens,
+                overlap_tokens=settings.chunk_overlap_tokens,
+                token_counter=create_token_counter()
+            )
+        self.deduplicator = None
+        if settings.dedup_enabled:
+            self.deduplicator = ChunkDeduplicator(
+                threshold=settings.dedup_threshold,
+                num_perm=settings.dedup_num_perm,
+                bands=settings.dedup_bands
+            )
+        self.dedup_report: Optional[DedupReport] = None
+        self.parent_chunker = None
+        if settings.parent_expansion_enabled:
+            self.parent_chunker = SectionChunker(
+                max_tokens=settings.parent_max_tokens,
+                overlap_tokens=0,
+                token_counter=self.section_chunker.count_tokens if self.section_chunker else None
+            )
+        self.parent_store: Optional[ParentStore] = None
         self.vector_store = None
+        self.vector_index = None
+        self.indexed_documents: List[Document] = []
+        self.metadata_index = None
+        self._memory_bytes: Tuple[tuple, int] = ((), 0)  # (what was loaded, its size) at the last measurement
+        # Concurrent first queries would otherwise all build and save the same index files
+        self._index_lock = threading.RLock()
         
-    def load_documents(self, docs_path: str) -> List[Document]:
-        """Load all text documents from the specified directory."""
+    def load_documents(
+        self,
+        docs_path: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> List[Document]:
+        """
+        Load all text documents from the specified directory, reporting (files loaded, total files).
+        Stops before the next file with InterruptedError when should_stop returns True.
+        """
         documents = []
         
         if not os.path.exists(docs_path):
@@ -40,21 +97,27 @@ class DocumentProcessor:
             return documents
             
         try:
-            for filename in os.listdir(docs_path):
-                if filename.endswith('.txt'):
-                    file_path = os.path.join(docs_path, filename)
-                    self.logger.info(f"Loading document: {filename}")
-                    
-                    loader = TextLoader(file_path, encoding='utf-8')
-                    file_documents = loader.load()
-                    
-                    # Add metadata to documents
-                    for doc in file_documents:
-                        doc.metadata['source'] = filename
-                        doc.metadata['file_path'] = file_path
-                    
-                    documents.extend(file_documents)
-                    
+            filenames = [f for f in os.listdir(docs_path) if f.endswith('.txt')]
+            for position, filename in enumerate(filenames, start=1):
+                if should_stop and should_stop():
+                    raise InterruptedError("Document loading cancelled")
+                file_path = os.path.join(docs_path, filename)
+                self.logger.info(f"Loading document: {filename}")
+                
+                loader = TextLoader(file_path, encoding='utf-8')
+                file_documents = loader.load()
+                
+                # Add metadata to documents
+                for doc in file_documents:
+                    doc.metadata['source'] = filename
+                    doc.metadata['file_path'] = file_path
+                
+                documents.extend(file_documents)
+                if on_progress:
+                    on_progress(position, len(filenames))
+                
+        except InterruptedError:
+            raise
         except Exception as e:
             self.logger.error(f"Error loading documents: {str(e)}")
             
@@ -64,50 +127,101 @@ class DocumentProcessor:
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """Split documents into chunks for better retrieval."""
         try:
-            chunks = self.text_splitter.split_documents(documents)
+            if self.section_chunker:
+                chunks = self._split_by_section(documents)
+            else:
+                chunks = self.text_splitter.split_documents(documents)
+                self._add_section_metadata(documents, chunks)
             self.logger.info(f"Split documents into {len(chunks)} chunks")
+            if self.deduplicator:
+                chunks, self.dedup_report = self.deduplicator.deduplicate(chunks)
+            if self.parent_chunker:
+                self.parent_store = ParentStore.build(
+                    documents, chunks, self.parent_chunker, depth=settings.parent_section_depth
+                )
             return chunks
         except Exception as e:
             self.logger.error(f"Error splitting documents: {str(e)}")
             return []
     
+    def _split_by_section(self, documents: List[Document]) -> List[Document]:
+        """Split documents on their heading hierarchy, keeping offsets and section path in metadata."""
+        chunks = []
+        for doc in documents:
+            text = doc.page_content
+            for span in self.section_chunker.split_text(text):
+                metadata = dict(doc.metadata)
+                metadata['start_index'] = span.start
+                metadata['end_index'] = span.end
+                metadata['section_path'] = span.section
+                metadata['token_count'] = span.token_count
+                metadata.update(section_metadata(span.section_path))
+                chunks.append(Document(page_content=span.text(text), metadata=metadata))
+        return chunks
+    
+    def _add_section_metadata(self, documents: List[Document], chunks: List[Document]):
+        """Populate section path, section and tags on chunks produced by the character splitter."""
+        texts = {doc.metadata.get('file_path'): doc.page_content for doc in documents}
+        for chunk in chunks:
+            text = texts.get(chunk.metadata.get('file_path'), "")
+            path = section_path_at(text, chunk.metadata.get('start_index', 0))
+            chunk.metadata['section_path'] = SECTION_PATH_SEPARATOR.join(path)
+            chunk.metadata.update(section_metadata(path))
+    
     def create_vector_store(self, documents: List[Document]) -> Chroma:
         """Create and persist vector store from documents."""
+        return self.build_vector_store(documents)
+    
+    def build_vector_store(
+        self,
+        documents: List[Document],
+        batch_size: int = 64,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Chroma:
+        """
+        Create and persist the vector store in batches of chunks.
+        Reports (chunks embedded, total chunks) after each batch and stops between
+        batches with InterruptedError when should_stop returns True.
+        """
         try:
-            # Split documents into chunks
             chunks = self.split_documents(documents)
             
             if not chunks:
                 raise ValueError("No document chunks available for vector store creation")
             
-            # Create vector store
-            self.vector_store = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory=settings.vector_store_path
+            self.vector_store = Chroma(
+                persist_directory=self.vector_store_path,
+                embedding_function=self.embeddings
             )
+            for start in range(0, len(chunks), batch_size):
+                if should_stop and should_stop():
+                    raise InterruptedError("Vector store build cancelled")
+                self.vector_store.add_documents(chunks[start:start + batch_size])
+                if on_progress:
+                    on_progress(min(start + batch_size, len(chunks)), len(chunks))
             
-            # Chroma auto-persists, no need to call persist() manually
-            self.logger.info("Vector store created and persisted successfully")
-            
+            if self.parent_store:
+                self.parent_store.save(self.vector_store_path)
+            self.logger.info(f"Vector store built with {len(chunks)} chunks")
             return self.vector_store
             
         except Exception as e:
-            self.logger.error(f"Error creating vector store: {str(e)}")
+            self.logger.error(f"Error building vector store: {str(e)}")
             raise
     
     def load_vector_store(self) -> Chroma:
         """Load existing vector store or create new one."""
         try:
-            if os.path.exists(settings.vector_store_path):
+            if os.path.exists(self.vector_store_path):
                 self.logger.info("Loading existing vector store")
                 self.vector_store = Chroma(
-                    persist_directory=settings.vector_store_path,
+                    persist_directory=self.vector_store_path,
                     embedding_function=self.embeddings
                 )
             else:
                 self.logger.info("Creating new vector store")
-                documents = self.load_documents(settings.docs_directory)
+                documents = self.load_documents(self.docs_directory)
                 if not documents:
                     raise ValueError("No documents found to create vector store")
                 self.vector_store = self.create_vector_store(documents)
@@ -122,4 +236,131 @@ class DocumentProcessor:
         """Get the vector store instance."""
         if self.vector_store is None:
             self.vector_store = self.load_vector_store()
-        return self.vector_store
\ No newline at end of file
+        return self.vector_store
+    
+    def load_vector_index(self) -> Tuple[VectorIndex, List[Document]]:
+        """Load the array-backed index over the vector store, rebuilding it if the store changed."""
+        try:
+            vector_store = self.get_vector_store()
+            stored = vector_store.get(include=["documents", "metadatas"])
+            
+            # Chroma mode still uses an exact array index for metadata-filtered queries
+            mode = "float32" if settings.vector_index_mode == "chroma" else settings.vector_index_mode
+            index_path = os.path.join(self.vector_store_path, f"index_{mode}")
+            index = None
+            if os.path.exists(os.path.join(index_path, "index.json")):
+                index = VectorIndex.load(index_path, rescore_factor=settings.vector_index_rescore_factor)
+                if index.ids == stored["ids"]:
+                    self.logger.info(f"Loaded {index.mode} vector index with {len(index)} vectors")
+                else:
+                    self.logger.info("Vector index is stale, rebuilding")
+                    index = None
+            
+            if index is None:
+                stored = vector_store.get(include=["embeddings", "documents", "metadatas"])
+                VectorIndex(
+                    mode=mode,
+                    rescore_factor=settings.vector_index_rescore_factor
+                ).build(stored["embeddings"], ids=stored["ids"]).save(index_path)
+                # Reload so the float32 vectors are memory-mapped rather than resident
+                index = VectorIndex.load(index_path, rescore_factor=settings.vector_index_rescore_factor)
+            
+            documents = [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(stored["documents"], stored["metadatas"])
+            ]
+            return index, documents
+            
+        except Exception as e:
+            self.logger.error(f"Error loading vector index: {str(e)}")
+            raise
+    
+    def get_vector_index(self) -> Tuple[VectorIndex, List[Document]]:
+        """Get the array-backed vector index and the documents for its rows."""
+        if self.vector_index is None:
+            with self._index_lock:
+                if self.vector_index is None:
+                    index, self.indexed_documents = self.load_vector_index()
+                    # Published last: readers that skip the lock check vector_index only
+                    self.vector_index = index
+        return self.vector_index, self.indexed_documents
+    
+    def get_metadata_index(self) -> MetadataIndex:
+        """Get the inverted metadata index over the rows of the vector index."""
+        if self.metadata_index is None:
+            with self._index_lock:
+                if self.metadata_index is None:
+                    _, documents = self.get_vector_index()
+                    self.metadata_index = MetadataIndex([doc.metadata for doc in documents])
+        return self.metadata_index
+    
+    def get_parent_store(self) -> ParentStore:
+        """Get the parent sections saved with the vector store (empty for stores built without them)."""
+        if self.parent_store is None:
+            self.parent_store = ParentStore.load(self.vector_store_path)
+        return self.parent_store
+    
+    def memory_bytes(self) -> int:
+        """
+        Estimated bytes held in memory by what is loaded: the resident vector index
+        arrays (memory-mapped float32 re-scoring vectors excluded), the chunk texts and
+        metadata, the metadata index and the parent sections. In chroma mode the HNSW
+        index lives inside Chroma, so its size on disk stands in for it.
+        Measured again only after one of them was loaded, e.g. the indexes that chroma
+        mode builds on the first filtered query.
+        """
+        loaded = tuple(
+            part is not None
+            for part in (self.vector_store, self.vector_index, self.metadata_index, self.parent_store)
+        )
+        measured, total = self._memory_bytes
+        if measured == loaded:
+            return total
+        
+        total = 0
+        if self.vector_store is not None and settings.vector_index_mode == "chroma":
+            # Only Chroma's own files, the array indexes and parents saved beside them are counted below
+            for name in os.listdir(self.vector_store_path):
+                path = os.path.join(self.vector_store_path, name)
+                if name.startswith("index_") or name == PARENTS_FILE:
+                    continue
+                total += directory_size(path) if os.path.isdir(path) else os.path.getsize(path)
+        if self.vector_index is not None:
+            index_bytes = self.vector_index.memory_bytes()
+            total += index_bytes["scan_bytes"]
+            if self.vector_index.mode != "float32" and not index_bytes["float32_memory_mapped"]:
+                total += index_bytes["float32_bytes"]
+        for doc in self.indexed_documents:
+            total += sys.getsizeof(doc.page_content)
+            total += sum(sys.getsizeof(value) for value in doc.metadata.values())
+        if self.metadata_index is not None:
+            total += self.metadata_index.memory_bytes()
+        if self.parent_store is not None:
+            total += self.parent_store.memory_bytes()
+        self._memory_bytes = (loaded, total)
+        return total
+    
+    def close(self):
+        """
+        Drop the loaded index and release the Chroma client. chromadb keeps one system
+        (SQLite connection and HNSW segments) per persist directory in a process-wide
+        cache that outlives the client, so it is removed from that cache and stopped.
+        """
+        with self._index_lock:
+            vector_store = self.vector_store
+            self.vector_store = None
+            self.vector_index = None
+            self.indexed_documents = []
+            self.metadata_index = None
+            self.parent_store = None
+        if vector_store is None:
+            return
+        client = vector_store._client
+        # Renamed from the misspelt _identifer_to_system in newer chromadb releases
+        systems = getattr(client, "_identifier_to_system", None) or getattr(client, "_identifer_to_system", {})
+        system = systems.pop(getattr(client, "_identifier", None), None)
+        if system is not None:
+            try:
+                system.stop()
+            except Exception as e:
+                self.logger.warning(f"Error stopping Chroma client for {self.vector_store_path}: {str(e)}")
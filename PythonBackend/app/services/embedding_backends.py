@@ -0,0 +1,189 @@
+import os
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.config.settings import settings
+from app.services.section_chunker import TokenCounter, approximate_token_count, build_token_counter
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+ONNX_MODEL_FILE = "onnx/model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"  # written to settings.embedding_cache_directory
+TOKENIZER_FILE = "tokenizer.json"
+# all-MiniLM-L6-v2 is trained on and truncates to 256 word pieces
+MAX_SEQUENCE_LENGTH = 256
+BATCH_SIZE = 32
+
+
+def _repo_id(model_name: str) -> str:
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def _model_file(model_dir: Optional[str], model_name: str, filename: str) -> str:
+    """Path of a model file, from the local model directory or downloaded from the Hugging Face Hub."""
+    if model_dir:
+        return os.path.join(model_dir, filename)
+    from huggingface_hub import hf_hub_download
+
+    return hf_hub_download(_repo_id(model_name), filename)
+
+
+def _quantized_path(model_name: str) -> str:
+    """Where the int8 model is cached: a directory of the app's, never the Hugging Face cache or a local export."""
+    return os.path.join(settings.embedding_cache_directory, _repo_id(model_name).replace("/", "--"), ONNX_INT8_MODEL_FILE)
+
+
+def _quantized_model(model_path: str, quantized_path: str) -> str:
+    """Dynamically quantize the weights of an ONNX model to int8, again only when the model changed."""
+    if not os.path.exists(quantized_path) or os.path.getmtime(quantized_path) < os.path.getmtime(model_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logging.getLogger(__name__).info(f"Quantizing {model_path} to int8")
+        os.makedirs(os.path.dirname(quantized_path), exist_ok=True)
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Sentence-transformers model run with ONNX Runtime instead of torch.
+    Follows SRP - Only encodes text; it reproduces the model's mean pooling and
+    normalization so vectors are interchangeable with the torch backend's.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantized: bool = False,
+        threads: int = 0,
+        model_dir: Optional[str] = None,
+        batch_size: int = BATCH_SIZE
+    ):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.logger = logging.getLogger(__name__)
+        self.batch_size = batch_size
+
+        model_path = _model_file(model_dir, model_name, ONNX_MODEL_FILE)
+        if quantized:
+            model_path = _quantized_model(model_path, _quantized_path(model_name))
+
+        self.tokenizer = Tokenizer.from_file(_model_file(model_dir, model_name, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQUENCE_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.logger.info(f"Loaded ONNX embeddings from {model_path} (threads={threads or 'default'})")
+
+    def _encode_batch(self, texts: Sequence[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        feed = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64)
+        }
+        hidden = self.session.run(None, {name: value for name, value in feed.items() if name in self.input_names})[0]
+
+        # Mean pooling over real tokens, then unit length, as the sentence-transformers pipeline does
+        mask = feed["attention_mask"][:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts as a float32 matrix, in input order."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        # Batch texts of similar length together to keep padding small
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        vectors = np.empty((len(texts), 0), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            rows = order[start:start + self.batch_size]
+            batch = self._encode_batch([texts[i] for i in rows]).astype(np.float32)
+            if not vectors.shape[1]:
+                vectors = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+            vectors[rows] = batch
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+def create_embeddings(backend: Optional[str] = None) -> Embeddings:
+    """Embedding model for settings.embedding_model on the configured backend."""
+    backend = backend or settings.embedding_backend
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {EMBEDDING_BACKENDS}")
+
+    if backend == "torch":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+        if settings.embedding_threads > 0:
+            import torch
+            torch.set_num_threads(settings.embedding_threads)
+        return HuggingFaceEmbeddings(
+            model_name=settings.embedding_model,
+            model_kwargs={'device': 'cpu'}
+        )
+
+    return OnnxEmbeddings(
+        settings.embedding_model,
+        quantized=backend == "onnx-int8",
+        threads=settings.embedding_threads,
+        model_dir=settings.embedding_onnx_directory or None
+    )
+
+
+def create_token_counter(backend: Optional[str] = None) -> TokenCounter:
+    """
+    Token counter for settings.embedding_model that loads no more than the backend does:
+    the tokenizer.json of the ONNX export with tokenizers, transformers only for torch.
+    """
+    backend = backend or settings.embedding_backend
+    if backend == "torch":
+        return build_token_counter(settings.embedding_model)
+    try:
+        from tokenizers import Tokenizer
+
+        model_dir = settings.embedding_onnx_directory or None
+        tokenizer = Tokenizer.from_file(_model_file(model_dir, settings.embedding_model, TOKENIZER_FILE))
+        tokenizer.no_truncation()
+        tokenizer.no_padding()
+
+        def count_tokens(text: str) -> int:
+            return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+        return count_tokens
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Tokenizer for {settings.embedding_model} unavailable, approximating token counts: {str(e)}")
+        return approximate_token_count
+
+
+def compare_embeddings(reference: Embeddings, candidate: Embeddings, texts: Sequence[str]) -> dict:
+    """
+    Cosine similarity between two backends' embeddings of the same texts.
+    The vector store was built with one backend and is queried with another,
+    so they must agree closely for retrieval results to stay the same.
+    """
+    a = np.asarray(reference.embed_documents(list(texts)), dtype=np.float32)
+    b = np.asarray(candidate.embed_documents(list(texts)), dtype=np.float32)
+    a /= np.linalg.norm(a, axis=1, keepdims=True)
+    b /= np.linalg.norm(b, axis=1, keepdims=True)
+    cosines = (a * b).sum(axis=1)
+    return {
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "max_abs_diff": float(np.abs(a - b).max())
+    }
@@ -0,0 +1,124 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Sequence
+
+# Sentinel that stops the batching thread
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces query embeddings from concurrent requests into batched model calls.
+    Follows SRP - Only schedules embedding calls, the model is injected.
+
+    A batch is sent once max_wait_ms have passed since its first request or
+    max_batch_size texts are waiting, whichever comes first. Each caller blocks
+    on its own future and gets back vectors for exactly the texts it submitted.
+
+    Questions are embedded with embed_documents, the only batched call of the
+    Embeddings interface. That gives the same vectors as embed_query for both
+    backends (HuggingFaceEmbeddings and OnnxEmbeddings encode queries exactly like
+    documents); a model that encodes queries differently, e.g. with an instruction
+    prefix, must not be put behind the batcher.
+    """
+
+    def __init__(self, embeddings, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        self.logger = logging.getLogger(__name__)
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._closing_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._texts = 0
+        self._largest_batch = 0
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        """
+        Queue texts for the next batch; the future resolves to their vectors in order.
+
+        Raises:
+            RuntimeError: if the batcher was closed, nothing would ever serve the request
+        """
+        future: Future = Future()
+        with self._closing_lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed")
+            self._queue.put((list(texts), future))
+        return future
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.submit([text]).result()[0]
+
+    def embed_queries(self, texts: Sequence[str]) -> List[List[float]]:
+        return self.submit(texts).result()
+
+    def _collect(self, first) -> list:
+        """The first request plus whatever arrives within the wait window, up to the batch size."""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                self.logger.error(f"Batched embedding of {len(texts)} texts failed: {str(e)}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
+            with self._stats_lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._texts += len(texts)
+                self._largest_batch = max(self._largest_batch, len(texts))
+
+    def stats(self) -> dict:
+        """Counters since startup: requests served, model calls and batch sizes."""
+        with self._stats_lock:
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "mean_batch_size": round(self._texts / self._batches, 2) if self._batches else None,
+                "largest_batch": self._largest_batch
+            }
+
+    def close(self):
+        """Stop the batching thread after the queued requests are served."""
+        with self._closing_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout=5)
@@ -0,0 +1,186 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+from app.services.section_chunker import find_headings
+
+# A sentence ends at terminal punctuation followed by whitespace or at a line end (headings, list items);
+# a dot right after a digit is a section number such as "5. Working Hours", not a sentence end
+SENTENCE_PATTERN = re.compile(r'[^\n]+?(?:(?<!\d)[.!?]+(?=\s)|$)', re.MULTILINE)
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset("""
+a an and are as at be by can do does for from how i if in is it me my of on or our the their
+there this to was we what when where which who will with you your about any
+""".split())
+
+MIN_SNIPPET_WORDS = 3  # list fragments rarely support an answer on their own
+
+NO_PASSAGES_ANSWER = "The AI assistant is temporarily unavailable and no matching policy passages were found."
+RETRIEVAL_ONLY_HEADER = (
+    "The AI assistant is temporarily unavailable, so here are the most relevant "
+    "policy passages for your question:"
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a passage into trimmed, non-empty sentences."""
+    return [s.strip() for s in SENTENCE_PATTERN.findall(text) if s.strip()]
+
+
+def is_heading(sentence: str) -> bool:
+    """A numbered section heading on its own, e.g. "4.2 Sick Leave"."""
+    return any(start == 0 and end == len(sentence) for start, end, _, _ in find_headings(sentence))
+
+
+def candidate_sentences(text: str) -> List[str]:
+    """Sentences of a passage that can support an answer: no headings, and short fragments only as a last resort."""
+    sentences = [s for s in split_sentences(text) if not is_heading(s)]
+    long_enough = [s for s in sentences if len(s.split()) >= MIN_SNIPPET_WORDS]
+    return long_enough or sentences
+
+
+def _terms(text: str) -> set:
+    return {word for word in WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS}
+
+
+def highlight_passage(question: str, passage: str, max_sentences: int = 2) -> List[str]:
+    """Pick the passage sentences that share the most terms with the question, in passage order."""
+    sentences = candidate_sentences(passage)
+    question_terms = _terms(question)
+    scored = [(len(question_terms & _terms(sentence)), i) for i, sentence in enumerate(sentences)]
+    best = sorted((i for score, i in sorted(scored, reverse=True)[:max_sentences] if score > 0))
+    return [sentences[i] for i in best] or sentences[:1]
+
+
+@dataclass
+class Snippet:
+    """A supporting sentence from a retrieved chunk."""
+    source: str
+    section: Optional[str]
+    text: str
+    score: float
+    document_index: int  # position of the chunk in the retrieval results
+
+
+def build_retrieval_only_answer(
+    question: str,
+    documents: Sequence[Document],
+    snippets: Optional[Sequence[Snippet]] = None
+) -> str:
+    """
+    Format retrieved passages with their best sentences highlighted, for use without the LLM.
+    Uses the precomputed snippets when given, otherwise falls back to term overlap.
+    """
+    by_document: Dict[int, List[str]] = {}
+    for snippet in snippets or []:
+        by_document.setdefault(snippet.document_index, []).append(snippet.text)
+
+    lines = [RETRIEVAL_ONLY_HEADER]
+    for index, doc in enumerate(documents):
+        sentences = by_document.get(index) or highlight_passage(question, doc.page_content)
+        if not sentences:
+            # Nothing to show for an empty or heading-only chunk
+            continue
+        label = doc.metadata.get("source", "Unknown")
+        section = doc.metadata.get("section_path")
+        if section:
+            label = f"{label} - {section}"
+        highlights = " ... ".join(f"**{sentence}**" for sentence in sentences)
+        lines.append(f"[{label}] {highlights}")
+    if len(lines) == 1:
+        return NO_PASSAGES_ANSWER
+    return "\n\n".join(lines)
+
+
+class SnippetExtractor:
+    """
+    Picks the sentences of retrieved chunks that best support a question.
+    Sentence embeddings are computed once per chunk and cached; all candidate
+    sentences are then scored against the question embedding from retrieval
+    in a single matrix-vector product.
+    """
+
+    def __init__(self, embeddings, per_chunk: int = 1, cache_size: int = 2048):
+        self.embeddings = embeddings
+        self.per_chunk = per_chunk
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[List[str], np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sentence_vectors(self, documents: Sequence[Document]) -> List[Tuple[List[str], np.ndarray]]:
+        """Sentences and unit-length sentence embeddings for each document, embedding cache misses in one batch."""
+        entries: List[Optional[Tuple[List[str], np.ndarray]]] = []
+        missing: Dict[str, List[str]] = {}
+
+        with self._lock:
+            for doc in documents:
+                entry = self._cache.get(doc.page_content)
+                if entry is not None:
+                    self._cache.move_to_end(doc.page_content)
+                elif doc.page_content not in missing:
+                    missing[doc.page_content] = candidate_sentences(doc.page_content)
+                entries.append(entry)
+
+        if missing:
+            flat = [sentence for sentences in missing.values() for sentence in sentences]
+            vectors = np.asarray(self.embeddings.embed_documents(flat), dtype=np.float32) if flat else np.empty((0, 0), np.float32)
+            if vectors.size:
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors /= np.where(norms == 0, 1.0, norms)
+
+            offset = 0
+            with self._lock:
+                for text, sentences in missing.items():
+                    self._cache[text] = (sentences, vectors[offset:offset + len(sentences)])
+                    offset += len(sentences)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+            for i, doc in enumerate(documents):
+                if entries[i] is None:
+                    entries[i] = self._cache.get(doc.page_content) or (missing[doc.page_content], np.empty((0, 0), np.float32))
+
+        return entries
+
+    def warm(self, texts: Sequence[str], batch_size: int = 64):
+        """Precompute sentence embeddings for chunk texts so requests only pay for the scoring."""
+        for start in range(0, len(texts), batch_size):
+            self._sentence_vectors([Document(page_content=text) for text in texts[start:start + batch_size]])
+
+    def extract(self, query_embedding: Sequence[float], documents: Sequence[Document]) -> List[Snippet]:
+        """Best supporting sentences of each document, ordered by document then score."""
+        entries = self._sentence_vectors(documents)
+        blocks = [vectors for _, vectors in entries if len(vectors)]
+        if not blocks:
+            return []
+
+        matrix = np.vstack(blocks)
+        owners = np.concatenate([np.full(len(vectors), i) for i, (_, vectors) in enumerate(entries) if len(vectors)])
+        local = np.concatenate([np.arange(len(vectors)) for _, vectors in entries if len(vectors)])
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query
+
+        # Group by document, best score first, and keep the first per_chunk of each group
+        order = np.lexsort((-scores, owners))
+        rank_in_group = np.arange(order.size) - np.searchsorted(owners[order], owners[order])
+        keep = order[rank_in_group < self.per_chunk]
+
+        snippets = []
+        for row in keep:
+            doc = documents[owners[row]]
+            sentences, _ = entries[owners[row]]
+            snippets.append(Snippet(
+                source=doc.metadata.get("source", "Unknown"),
+                section=doc.metadata.get("section_path") or None,
+                text=sentences[local[row]],
+                score=float(scores[row]),
+                document_index=int(owners[row])
+            ))
+        return snippets
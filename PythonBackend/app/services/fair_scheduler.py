@@ -0,0 +1,84 @@
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+
+class FairScheduler:
+    """
+    Fair-share admission to a fixed number of generation slots.
+    Follows SRP - Only decides who generates next, generation itself stays in RAGService.
+
+    While a slot is free requests start right away. Once all are busy, waiting
+    requests queue per session and freed slots go to the sessions in turn, one
+    request each, so a session with many queued questions waits behind its own
+    requests instead of in front of everyone else's.
+    """
+
+    def __init__(self, slots: int):
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.logger = logging.getLogger(__name__)
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._active = 0
+        # Sessions with waiting requests in turn order; each holds its waiters first come, first served
+        self._queues: "OrderedDict[str, Deque[threading.Event]]" = OrderedDict()
+        self._granted = 0
+        self._queued = 0
+        self._timeouts = 0
+        self._max_wait = 0.0
+
+    def acquire(self, session: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a generation slot; False if none was granted within the timeout."""
+        with self._lock:
+            if self._active < self.slots and not self._queues:
+                self._active += 1
+                self._granted += 1
+                return True
+            waiter = threading.Event()
+            self._queues.setdefault(session, deque()).append(waiter)
+            self._queued += 1
+
+        started = time.monotonic()
+        granted = waiter.wait(timeout)
+        with self._lock:
+            if not granted and not waiter.is_set():
+                waiting = self._queues[session]
+                waiting.remove(waiter)
+                if not waiting:
+                    del self._queues[session]
+                self._timeouts += 1
+                return False
+            self._max_wait = max(self._max_wait, time.monotonic() - started)
+        return True
+
+    def release(self):
+        """Free a slot, handing it straight to the next session in turn if any is waiting."""
+        with self._lock:
+            if not self._queues:
+                self._active -= 1
+                return
+            session, waiting = next(iter(self._queues.items()))
+            waiter = waiting.popleft()
+            if waiting:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            self._granted += 1
+            # The slot passes to the waiter, so the active count stays the same
+            waiter.set()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "slots": self.slots,
+                "active": self._active,
+                "waiting": sum(len(waiting) for waiting in self._queues.values()),
+                "waiting_sessions": len(self._queues),
+                "granted": self._granted,
+                "queued": self._queued,
+                "timeouts": self._timeouts,
+                "max_wait_seconds": round(self._max_wait, 3)
+            }
@@ -0,0 +1,98 @@
+import os
+import json
+import uuid
+import shutil
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+
+class IndexSnapshotManager:
+    """
+    Keeps every index build in its own immutable, versioned directory.
+    The active version is recorded in a CURRENT file that is replaced atomically,
+    so a build never touches the directory that is being served from.
+    """
+
+    def __init__(self, root: str, keep: int = 3):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        # The active and the previous snapshot are always kept for rollback
+        self.keep = max(2, keep)
+
+    def snapshot_path(self, version: str) -> str:
+        """Directory of a snapshot version."""
+        return os.path.join(self.root, version)
+
+    def active_version(self) -> Optional[str]:
+        """Version currently marked active, or None if no snapshot was ever activated."""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if version and os.path.isdir(self.snapshot_path(version)) else None
+
+    def allocate(self) -> Tuple[str, str]:
+        """Reserve a new, empty snapshot directory and return (version, path)."""
+        version = datetime.utcnow().strftime("v%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        path = self.snapshot_path(version)
+        os.makedirs(path)
+        return version, path
+
+    def write_manifest(self, version: str, info: dict):
+        """Record build information; a snapshot without a manifest is incomplete and never listed."""
+        manifest = {"version": version, "created_at": datetime.utcnow().isoformat(), **info}
+        with open(os.path.join(self.snapshot_path(version), MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    def list_snapshots(self) -> List[dict]:
+        """Manifests of all complete snapshots, oldest first."""
+        snapshots = []
+        if not os.path.isdir(self.root):
+            return snapshots
+        for name in os.listdir(self.root):
+            manifest_path = os.path.join(self.root, name, MANIFEST_FILE)
+            if os.path.isfile(manifest_path):
+                with open(manifest_path, encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+        return sorted(snapshots, key=lambda m: m["created_at"])
+
+    def activate(self, version: str):
+        """Atomically mark a complete snapshot as the active one."""
+        if not os.path.isfile(os.path.join(self.snapshot_path(version), MANIFEST_FILE)):
+            raise ValueError(f"Snapshot {version} does not exist or is incomplete")
+
+        temp_path = os.path.join(self.root, f"{CURRENT_FILE}.{uuid.uuid4().hex}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, os.path.join(self.root, CURRENT_FILE))
+        self.logger.info(f"Activated index snapshot {version}")
+
+    def previous_version(self, version: Optional[str] = None) -> Optional[str]:
+        """The snapshot built just before the given (default: active) one."""
+        version = version or self.active_version()
+        versions = [m["version"] for m in self.list_snapshots()]
+        if version not in versions:
+            return versions[-1] if versions else None
+        position = versions.index(version)
+        return versions[position - 1] if position > 0 else None
+
+    def discard(self, version: str):
+        """Delete a snapshot directory, e.g. after a failed build."""
+        shutil.rmtree(self.snapshot_path(version), ignore_errors=True)
+
+    def prune(self) -> List[str]:
+        """Delete all but the newest `keep` snapshots, never the active one."""
+        active = self.active_version()
+        versions = [m["version"] for m in self.list_snapshots()]
+        removed = [v for v in versions[:-self.keep] if v != active]
+        for version in removed:
+            self.discard(version)
+            self.logger.info(f"Pruned index snapshot {version}")
+        return removed
@@ -0,0 +1,197 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.services.document_processor import DocumentProcessor
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.retriever import PolicyRetriever
+
+KNOWLEDGE_BASE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+DOCS_SUBDIRECTORY = "docs"
+VECTOR_STORE_SUBDIRECTORY = "vector_store"
+LATENCY_WINDOW = 1024  # recent requests kept per knowledge base for percentiles
+
+
+@dataclass
+class KnowledgeBaseMetrics:
+    """Request and cache counters of one knowledge base."""
+    requests: int = 0
+    hits: int = 0  # requests served by an already loaded knowledge base
+    loads: int = 0
+    evictions: int = 0
+    load_seconds: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def to_dict(self) -> dict:
+        p50, p95 = np.percentile(self.latencies, [50, 95]) if self.latencies else (None, None)
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "load_seconds": round(self.load_seconds, 3),
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+
+@dataclass
+class _LoadedKnowledgeBase:
+    retriever: PolicyRetriever
+    size_bytes: int
+    in_use: int = 0
+
+
+class KnowledgeBaseRegistry:
+    """
+    Named knowledge bases, each with its own documents, collection and index.
+    Follows SRP - Loads, tracks and evicts retrievers; answering stays in RAGService.
+
+    A knowledge base lives in <root>/<name>/docs, and its vector store is built
+    into <root>/<name>/vector_store on first use. Loaded knowledge bases are kept
+    in LRU order; when their memory (DocumentProcessor.memory_bytes, measured when
+    loaded and again after each request) exceeds the budget, the least recently used ones that no request is
+    using are evicted and their index and Chroma client released.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        embeddings,
+        embedding_batcher: Optional[EmbeddingBatcher] = None,
+        memory_budget_mb: float = 512.0
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.embeddings = embeddings
+        self.embedding_batcher = embedding_batcher
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._loaded: "OrderedDict[str, _LoadedKnowledgeBase]" = OrderedDict()
+        self._metrics: Dict[str, KnowledgeBaseMetrics] = defaultdict(KnowledgeBaseMetrics)
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+    def _path(self, name: str, subdirectory: str) -> str:
+        return os.path.join(self.root, name, subdirectory)
+
+    def exists(self, name: str) -> bool:
+        return bool(KNOWLEDGE_BASE_NAME.match(name)) and os.path.isdir(self._path(name, DOCS_SUBDIRECTORY))
+
+    def names(self) -> List[str]:
+        """Knowledge bases found under the root directory."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if self.exists(name))
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[PolicyRetriever]:
+        """Retriever of a knowledge base, loaded if needed and protected from eviction while in use."""
+        entry = self._acquire(name)
+        try:
+            yield entry.retriever
+        finally:
+            # Indexes built lazily by the request (e.g. on its first filtered query) count from now on
+            size_bytes = entry.retriever.document_processor.memory_bytes()
+            with self._lock:
+                entry.size_bytes = size_bytes
+                entry.in_use -= 1
+                self._evict_idle()
+
+    def _acquire(self, name: str) -> _LoadedKnowledgeBase:
+        with self._lock:
+            self._metrics[name].requests += 1
+            entry = self._checkout(name)
+            if entry:
+                self._metrics[name].hits += 1
+                return entry
+            load_lock = self._load_locks[name]
+
+        # Load outside the registry lock so other knowledge bases keep serving
+        with load_lock:
+            with self._lock:
+                entry = self._checkout(name)
+                if entry:
+                    self._metrics[name].hits += 1
+                    return entry
+
+            if not self.exists(name):
+                raise KeyError(f"Unknown knowledge base {name!r}")
+            start = time.perf_counter()
+            entry = self._load(name)
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                metrics = self._metrics[name]
+                metrics.loads += 1
+                metrics.load_seconds += elapsed
+                entry.in_use += 1
+                self._loaded[name] = entry
+                self._evict_idle()
+            self.logger.info(f"Loaded knowledge base {name} ({entry.size_bytes / 1e6:.1f} MB) in {elapsed:.2f}s")
+            return entry
+
+    def _checkout(self, name: str) -> Optional[_LoadedKnowledgeBase]:
+        """Mark a loaded knowledge base as used and most recent. Caller holds the lock."""
+        entry = self._loaded.get(name)
+        if entry:
+            entry.in_use += 1
+            self._loaded.move_to_end(name)
+        return entry
+
+    def _load(self, name: str) -> _LoadedKnowledgeBase:
+        vector_store_path = self._path(name, VECTOR_STORE_SUBDIRECTORY)
+        processor = DocumentProcessor(
+            vector_store_path=vector_store_path,
+            embeddings=self.embeddings,
+            docs_directory=self._path(name, DOCS_SUBDIRECTORY)
+        )
+        retriever = PolicyRetriever(processor, embedding_batcher=self.embedding_batcher)
+        return _LoadedKnowledgeBase(retriever=retriever, size_bytes=processor.memory_bytes())
+
+    def _evict_idle(self):
+        """Evict idle knowledge bases, least recently used first, until within budget. Caller holds the lock."""
+        used = sum(entry.size_bytes for entry in self._loaded.values())
+        for name in list(self._loaded):
+            if used <= self.memory_budget_bytes:
+                return
+            entry = self._loaded[name]
+            if entry.in_use:
+                continue
+            del self._loaded[name]
+            entry.retriever.close()
+            entry.retriever.document_processor.close()
+            used -= entry.size_bytes
+            self._metrics[name].evictions += 1
+            self.logger.info(f"Evicted idle knowledge base {name} ({entry.size_bytes / 1e6:.1f} MB)")
+        if used > self.memory_budget_bytes:
+            self.logger.warning(f"Knowledge bases in use take {used / 1e6:.1f} MB, over the memory budget")
+
+    def record_latency(self, name: str, seconds: float):
+        with self._lock:
+            self._metrics[name].latencies.append(seconds)
+
+    def stats(self) -> dict:
+        """Memory use, and load state and metrics of every knowledge base seen so far."""
+        with self._lock:
+            knowledge_bases = {
+                name: {
+                    "loaded": name in self._loaded,
+                    "size_mb": round(self._loaded[name].size_bytes / 1e6, 2) if name in self._loaded else None,
+                    **metrics.to_dict()
+                }
+                for name, metrics in self._metrics.items()
+            }
+            used = sum(entry.size_bytes for entry in self._loaded.values())
+        return {
+            "memory_budget_mb": round(self.memory_budget_bytes / 1024 / 1024, 1),
+            "memory_used_mb": round(used / 1024 / 1024, 1),
+            "knowledge_bases": knowledge_bases
+        }
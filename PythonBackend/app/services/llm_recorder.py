@@ -0,0 +1,135 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+RECORDER_MODES = ("off", "record", "replay", "auto")
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    """Recording key of a completion: hash of the model and the fully rendered prompt."""
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class ReplayMiss(KeyError):
+    """A prompt with no recorded completion was asked for in replay mode."""
+
+
+@dataclass
+class Recording:
+    """A recorded completion with the arrival time of every token."""
+    key: str
+    tokens: List[str]
+    delays_ms: List[int]  # before each token: first-token latency, then inter-token gaps
+
+    def to_json(self) -> str:
+        return json.dumps({"k": self.key, "t": self.tokens, "d": self.delays_ms}, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "Recording":
+        data = json.loads(line)
+        return cls(key=data["k"], tokens=data["t"], delays_ms=data["d"])
+
+
+class RecordingStore:
+    """
+    Completions keyed by prompt hash, in a gzip-compressed JSON lines file.
+    New recordings are appended as extra gzip members, so recording never
+    rewrites the file; the last recording of a key wins on load.
+    """
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._recordings: Dict[str, Recording] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        recording = Recording.from_json(line)
+                        self._recordings[recording.key] = recording
+            self.logger.info(f"Loaded {len(self._recordings)} LLM recordings from {path}")
+
+    def __len__(self) -> int:
+        return len(self._recordings)
+
+    def get(self, key: str) -> Optional[Recording]:
+        return self._recordings.get(key)
+
+    def add(self, recording: Recording):
+        with self._lock:
+            self._recordings[recording.key] = recording
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(recording.to_json() + "\n")
+
+
+class RecordReplayChain:
+    """
+    Record/replay layer in front of the generation chain.
+    Follows SRP - Only stores and serves completions, prompting stays in RAGService.
+
+    record: call the LLM and store every completion with its token timing
+    replay: serve stored completions only, a prompt that was never recorded fails
+    auto:   replay what was recorded and record the rest
+    Replayed tokens are delayed by their recorded timing times `speed`
+    (0 replays instantly, 1 at the recorded speed).
+    """
+
+    def __init__(
+        self,
+        chain,
+        render: Callable[[dict], str],
+        store: RecordingStore,
+        mode: str = "replay",
+        model: str = "",
+        speed: float = 1.0
+    ):
+        if mode not in RECORDER_MODES or mode == "off":
+            raise ValueError(f"Unknown record/replay mode {mode!r}, expected one of {RECORDER_MODES[1:]}")
+        self.logger = logging.getLogger(__name__)
+        self.chain = chain
+        self.render = render
+        self.store = store
+        self.mode = mode
+        self.model = model
+        self.speed = speed
+
+    def stream(self, inputs: dict) -> Iterator[str]:
+        key = prompt_key(self.model, self.render(inputs))
+        recording = self.store.get(key) if self.mode != "record" else None
+        if recording:
+            return self._replay(recording)
+        if self.mode == "replay":
+            raise ReplayMiss(f"No recorded completion for prompt {key[:12]}")
+        return self._record(key, inputs)
+
+    def invoke(self, inputs: dict) -> str:
+        return "".join(self.stream(inputs))
+
+    def _replay(self, recording: Recording) -> Iterator[str]:
+        for token, delay_ms in zip(recording.tokens, recording.delays_ms):
+            if self.speed > 0 and delay_ms > 0:
+                time.sleep(delay_ms * self.speed / 1000)
+            yield token
+
+    def _record(self, key: str, inputs: dict) -> Iterator[str]:
+        tokens, delays = [], []
+        last = time.perf_counter()
+        for token in self.chain.stream(inputs):
+            now = time.perf_counter()
+            tokens.append(token)
+            delays.append(round((now - last) * 1000))
+            last = now
+            yield token
+        # Only completions that were consumed to the end are stored
+        self.store.add(Recording(key=key, tokens=tokens, delays_ms=delays))
+        self.logger.debug(f"Recorded completion {key[:12]} ({len(tokens)} tokens)")
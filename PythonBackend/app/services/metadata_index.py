@@ -0,0 +1,138 @@
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.section_chunker import SECTION_PATH_SEPARATOR
+
+FILTER_FIELDS = ("source", "section", "tag")
+TAG_SEPARATOR = ","
+# Joins the files a deduplicated chunk came from; unlike a comma it can't occur in a file name
+SOURCE_SEPARATOR = "/"
+# Joins the section paths of a deduplicated chunk; headings are single lines
+SECTION_PATHS_SEPARATOR = "\n"
+
+_HEADING_NUMBER = re.compile(r'^\d+(?:\.\d+)*\.?\s+')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def heading_title(heading: str) -> str:
+    """Strip the section number from a heading, e.g. "4.2 Sick Leave" -> "Sick Leave"."""
+    return _HEADING_NUMBER.sub('', heading).strip()
+
+
+def slugify(value: str) -> str:
+    """Lowercase, hyphen separated form used for tags, e.g. "Leave Policies" -> "leave-policies"."""
+    return _NON_WORD.sub('-', value.lower()).strip('-')
+
+
+def section_metadata(section_path: Sequence[str]) -> Dict[str, str]:
+    """Filterable metadata for a chunk: its top-level section and tags for every heading."""
+    if not section_path:
+        return {"section": "", "tags": ""}
+    tags = [slugify(heading_title(heading)) for heading in section_path]
+    return {
+        "section": section_path[0],
+        "tags": TAG_SEPARATOR.join(tag for tag in tags if tag)
+    }
+
+
+def chunk_sources(metadata: dict) -> List[str]:
+    """Files a chunk came from: all of them for a chunk collapsed from duplicates in several files."""
+    if metadata.get("sources"):
+        return [source for source in metadata["sources"].split(SOURCE_SEPARATOR) if source]
+    return [metadata["source"]] if metadata.get("source") else []
+
+
+def chunk_section_paths(metadata: dict) -> List[str]:
+    """Section paths of a chunk: every duplicate's for a chunk collapsed from several sections."""
+    if metadata.get("section_paths"):
+        return [path for path in metadata["section_paths"].split(SECTION_PATHS_SEPARATOR) if path]
+    return [metadata["section_path"]] if metadata.get("section_path") else []
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def _keys(field: str, metadata: dict) -> Iterable[str]:
+    """Index keys of a chunk for one filter field."""
+    if field == "source":
+        return [_normalize(source) for source in chunk_sources(metadata)]
+
+    if field == "section":
+        # A chunk matches any heading on its paths, with or without the number
+        headings = [h for path in chunk_section_paths(metadata) for h in path.split(SECTION_PATH_SEPARATOR) if h]
+        if not headings and metadata.get("section"):
+            headings = [metadata["section"]]
+        keys = []
+        for heading in headings:
+            keys.append(_normalize(heading))
+            keys.append(_normalize(heading_title(heading)))
+        return keys
+
+    if field == "tag":
+        return [_normalize(tag) for tag in metadata.get("tags", "").split(TAG_SEPARATOR) if tag]
+
+    return []
+
+
+class MetadataIndex:
+    """
+    Inverted index from metadata values to chunk rows.
+    Resolves request filters to a candidate row set before any vector scoring.
+    Values within a field are OR-ed, fields are AND-ed.
+    """
+
+    def __init__(self, metadatas: Sequence[dict]):
+        self.size = len(metadatas)
+        postings: Dict[str, Dict[str, List[int]]] = {field: defaultdict(list) for field in FILTER_FIELDS}
+        for row, metadata in enumerate(metadatas):
+            for field in FILTER_FIELDS:
+                for key in set(_keys(field, metadata or {})):
+                    postings[field][key].append(row)
+
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {
+            field: {key: np.asarray(rows, dtype=np.int64) for key, rows in values.items()}
+            for field, values in postings.items()
+        }
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the posting keys and row arrays."""
+        return sum(
+            sys.getsizeof(key) + rows.nbytes
+            for field_postings in self.postings.values()
+            for key, rows in field_postings.items()
+        )
+
+    def values(self, field: str) -> List[str]:
+        """Known values for a filter field."""
+        return sorted(self.postings.get(field, {}))
+
+    def candidates(self, filters: Optional[Dict[str, Sequence[str]]]) -> Optional[np.ndarray]:
+        """
+        Resolve filters to sorted candidate rows.
+
+        Returns:
+            None when no filter applies, otherwise the (possibly empty) matching rows
+        """
+        if not filters:
+            return None
+
+        result: Optional[np.ndarray] = None
+        for field, values in filters.items():
+            if field not in self.postings:
+                raise ValueError(f"Unknown filter field: {field}. Expected one of {FILTER_FIELDS}")
+            if not values:
+                continue
+
+            field_postings = self.postings[field]
+            matches = [field_postings[key] for key in {_normalize(v) for v in values} if key in field_postings]
+            rows = np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if not result.size:
+                break
+
+        return result
@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import bisect
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.section_chunker import (
+    SECTION_PATH_SEPARATOR, SectionChunker, TokenCounter, approximate_token_count
+)
+
+PARENTS_FILE = "parents.json"
+
+
+@dataclass(frozen=True)
+class ParentSection:
+    """A policy section (or a slice of a long one) that small chunks expand to."""
+    parent_id: str
+    source: str
+    section_path: str
+    start: int
+    end: int
+    token_count: int
+    text: str
+
+
+def parent_spans(text: str, chunker: SectionChunker, depth: int = 1) -> List[Tuple[int, int, Tuple[str, ...], int]]:
+    """
+    (start, end, section path, tokens) of the parent sections of a text: the sections
+    at the given heading depth with all their subsections, packed up to the chunker's
+    max_tokens from its spans, so a long section becomes several consecutive parents.
+    """
+    parents: List[Tuple[int, int, Tuple[str, ...], int]] = []
+    for span in chunker.split_text(text):
+        path = span.section_path[:depth]
+        if parents:
+            start, _, parent_path, tokens = parents[-1]
+            if parent_path == path and tokens + span.token_count <= chunker.max_tokens:
+                parents[-1] = (start, span.end, path, tokens + span.token_count)
+                continue
+        parents.append((span.start, span.end, path, span.token_count))
+    return parents
+
+
+class ParentStore:
+    """
+    Parent sections of the indexed chunks, stored once next to the vector store.
+    Follows SRP - Maps chunks to their parents and packs context, search stays in PolicyRetriever.
+
+    Small chunks are what gets embedded and searched; each carries the id of the
+    section it was cut from in its "parent_id" metadata. Sections are split on the
+    same heading hierarchy as the chunks: a section at settings.parent_section_depth
+    with its subsections, at most settings.parent_max_tokens each. They are never embedded.
+    """
+
+    def __init__(self, parents: Optional[Dict[str, ParentSection]] = None):
+        self.logger = logging.getLogger(__name__)
+        self._parents = parents or {}
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the parent section texts."""
+        return sum(sys.getsizeof(parent.text) for parent in self._parents.values())
+
+    def get(self, parent_id: Optional[str]) -> Optional[ParentSection]:
+        return self._parents.get(parent_id) if parent_id else None
+
+    @classmethod
+    def build(cls, documents: Sequence, chunks: Sequence, chunker: SectionChunker, depth: int = 1) -> "ParentStore":
+        """
+        Split the documents into parent sections and point every chunk at the one
+        holding its midpoint. Only parents with at least one chunk are kept.
+        """
+        chunks_by_file = defaultdict(list)
+        for chunk in chunks:
+            chunks_by_file[chunk.metadata.get("file_path")].append(chunk)
+
+        parents = {}
+        for doc in documents:
+            file_chunks = chunks_by_file.get(doc.metadata.get("file_path"))
+            if not file_chunks:
+                continue
+            text = doc.page_content
+            source = doc.metadata.get("source", "")
+            spans = parent_spans(text, chunker, depth)
+            starts = [start for start, _, _, _ in spans]
+            for chunk in file_chunks:
+                middle = chunk.metadata.get("start_index", 0) + len(chunk.page_content) // 2
+                start, end, section_path, token_count = spans[max(0, bisect.bisect_right(starts, middle) - 1)]
+                parent_id = f"{source}:{start}"
+                if parent_id not in parents:
+                    parents[parent_id] = ParentSection(
+                        parent_id=parent_id,
+                        source=source,
+                        section_path=SECTION_PATH_SEPARATOR.join(section_path),
+                        start=start,
+                        end=end,
+                        token_count=token_count,
+                        text=text[start:end]
+                    )
+                chunk.metadata["parent_id"] = parent_id
+
+        store = cls(parents)
+        store.logger.info(f"Mapped {len(chunks)} chunks to {len(parents)} parent sections")
+        return store
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, PARENTS_FILE), "w", encoding="utf-8") as f:
+            json.dump({"parents": [asdict(parent) for parent in self._parents.values()]}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str) -> "ParentStore":
+        """Parents saved next to a vector store; empty for stores built without them."""
+        path = os.path.join(directory, PARENTS_FILE)
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            parents = [ParentSection(**parent) for parent in json.load(f)["parents"]]
+        store = cls({parent.parent_id: parent for parent in parents})
+        store.logger.info(f"Loaded {len(store)} parent sections from {path}")
+        return store
+
+    def expand(
+        self,
+        chunks: Sequence,
+        max_tokens: int,
+        count_tokens: TokenCounter = approximate_token_count
+    ) -> List[str]:
+        """
+        Context passages for retrieved chunks, best first: the parent section of each
+        chunk once, as long as it fits in max_tokens, otherwise the chunk itself.
+        Chunks that no longer fit are skipped, but the best one is always kept.
+        """
+        passages: List[str] = []
+        included = set()
+        used = 0
+        for chunk in chunks:
+            parent = self.get(chunk.metadata.get("parent_id"))
+            if parent is not None:
+                if parent.parent_id in included:
+                    continue
+                if used + parent.token_count <= max_tokens:
+                    included.add(parent.parent_id)
+                    passages.append(parent.text)
+                    used += parent.token_count
+                    continue
+            tokens = chunk.metadata.get("token_count") or count_tokens(chunk.page_content)
+            if passages and used + tokens > max_tokens:
+                continue
+            passages.append(chunk.page_content)
+            used += tokens
+        return passages
@@ -0,0 +1,222 @@
+import os
+import sys
+import time
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+# Worker threads that run parts of a request (generation, sub-answers, searches, batched embedding)
+REQUEST_WORKER_PREFIXES = ("llm-generation", "sub-answer", "retrieval", "embedding-batcher")
+# Leaf frames of an idle worker waiting for work; such samples say nothing about the request path
+_IDLE_LEAVES = {("threading.py", "wait"), ("queue.py", "get"), ("thread.py", "_worker")}
+TRACEMALLOC_FRAMES = 25
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename.split(os.sep)
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_LEAVES
+
+
+class RequestProfiler:
+    """
+    On-demand CPU and allocation profiles of live requests.
+    Follows SRP - Only samples stacks and allocations; endpoints decide when to profile.
+
+    A session profiles the next N requests or a time window, whichever ends first.
+    While a profiled request is in flight, a background thread samples the stacks
+    of the request threads and the request worker threads into collapsed stacks
+    (one "frame;frame;frame count" line per stack, the flamegraph.pl / speedscope
+    input format). With allocations on, tracemalloc runs for the session and the
+    top allocation sites are compared against its start. Outside a session the
+    request hook is a single attribute check.
+    """
+
+    def __init__(self, interval_ms: float = 5.0, max_seconds: float = 60.0):
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self.active = False
+        self._lock = threading.Lock()
+        self._session = 0  # incremented by every start(), requests are counted in the session they began in
+        self._request_threads: Counter = Counter()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._max_requests = 0
+        self._requests_done = 0
+        self._deadline = 0.0
+        self._started_at: Optional[datetime] = None
+        self._finished_at: Optional[datetime] = None
+        self._allocations = False
+        self._baseline_snapshot = None
+        self._owns_tracemalloc = False
+        self._allocation_report = ""
+        self._report_ready = threading.Event()  # cleared while a finished session's report is being built
+        self._report_ready.set()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self, requests: int = 10, seconds: Optional[float] = None, allocations: bool = True) -> dict:
+        """Arm a profiling session; raises RuntimeError while another one is running."""
+        seconds = min(seconds or self.max_seconds, self.max_seconds)
+        with self._lock:
+            if self.active:
+                raise RuntimeError("A profiling session is already running")
+            self._session += 1
+            self._request_threads = Counter()
+            self._stacks = Counter()
+            self._samples = 0
+            self._max_requests = requests
+            self._requests_done = 0
+            self._deadline = time.monotonic() + seconds
+            self._started_at = datetime.utcnow()
+            self._finished_at = None
+            self._allocations = allocations
+            self._allocation_report = ""
+            self._report_ready.set()
+            if allocations:
+                self._report_ready.clear()
+                # Leave tracing running afterwards if it was started elsewhere, e.g. PYTHONTRACEMALLOC
+                self._owns_tracemalloc = not tracemalloc.is_tracing()
+                if self._owns_tracemalloc:
+                    tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._baseline_snapshot = tracemalloc.take_snapshot()
+            self.active = True
+            self._sampler = threading.Thread(
+                target=self._sample, args=(self._session,), name="request-profiler", daemon=True
+            )
+            self._sampler.start()
+        self.logger.info(f"Profiling the next {requests} requests or {seconds:.0f}s (allocations={allocations})")
+        return self.status()
+
+    @contextmanager
+    def profile_request(self) -> Iterator[None]:
+        """
+        Mark the current thread as serving a request while a session is running.
+        A request still in flight when its session ends is not counted in the next one.
+        """
+        if not self.active:
+            yield
+            return
+        thread_id = threading.get_ident()
+        with self._lock:
+            session = self._session if self.active else None
+            if session is not None:
+                self._request_threads[thread_id] += 1
+        try:
+            yield
+        finally:
+            done = False
+            with self._lock:
+                if session == self._session:
+                    self._request_threads[thread_id] -= 1
+                    if self._request_threads[thread_id] <= 0:
+                        del self._request_threads[thread_id]
+                    if self.active:
+                        self._requests_done += 1
+                        done = self._requests_done >= self._max_requests
+            if done:
+                self.stop()
+
+    def stop(self):
+        """End the running session and build the allocation report."""
+        with self._lock:
+            if not self.active:
+                return
+            self.active = False
+            self._finished_at = datetime.utcnow()
+            session = self._session
+            baseline, self._baseline_snapshot = self._baseline_snapshot, None
+            snapshot = None
+            if self._allocations and baseline is not None:
+                snapshot = tracemalloc.take_snapshot()
+                if self._owns_tracemalloc:
+                    tracemalloc.stop()
+        # Comparing the snapshots is slow, other profiled requests don't wait for it
+        if snapshot is not None:
+            report = self._top_allocations(snapshot, baseline)
+            with self._lock:
+                if self._session == session:
+                    self._allocation_report = report
+                    self._report_ready.set()
+        self.logger.info(f"Profiling session finished: {self._requests_done} requests, {self._samples} samples")
+
+    def _sample(self, session: int):
+        own = threading.get_ident()
+        while self.active and self._session == session:
+            if time.monotonic() >= self._deadline:
+                self.stop()
+                return
+            with self._lock:
+                request_threads = set(self._request_threads)
+            if request_threads:
+                workers = {
+                    thread.ident for thread in threading.enumerate()
+                    if thread.name.startswith(REQUEST_WORKER_PREFIXES)
+                }
+                stacks = []
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own or (thread_id not in request_threads and thread_id not in workers):
+                        continue
+                    if thread_id not in request_threads and _is_idle(frame):
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(_frame_label(frame))
+                        frame = frame.f_back
+                    stacks.append(";".join(reversed(stack)))
+                with self._lock:
+                    if self._session != session:
+                        return
+                    self._stacks.update(stacks)
+                    self._samples += 1
+            time.sleep(self.interval)
+
+    def _top_allocations(self, snapshot, baseline, limit: int = 25) -> str:
+        """Allocation sites that grew most during the session, with their call paths."""
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ]
+        stats = snapshot.filter_traces(filters).compare_to(
+            baseline.filter_traces(filters), "traceback"
+        )
+        lines = [f"Top {limit} allocation sites by growth during the session"]
+        for rank, stat in enumerate(stats[:limit], start=1):
+            lines.append(
+                f"\n#{rank}: {stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+d} blocks "
+                f"(now {stat.size / 1024:.1f} KiB)"
+            )
+            lines.extend(f"    {line}" for line in stat.traceback.format(limit=8, most_recent_first=True))
+        return "\n".join(lines) + "\n"
+
+    def collapsed_stacks(self) -> str:
+        """CPU samples of the last session as collapsed stacks, most frequent first."""
+        with self._lock:
+            stacks = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def allocation_report(self, timeout: float = 30.0) -> str:
+        """Allocation report of the last session, waiting for it if the session just ended."""
+        if not self.active:
+            self._report_ready.wait(timeout)
+        return self._allocation_report
+
+    def status(self) -> dict:
+        return {
+            "active": self.active,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "requests_profiled": self._requests_done,
+            "max_requests": self._max_requests,
+            "samples": self._samples,
+            "distinct_stacks": len(self._stacks),
+            "allocations": self._allocations
+        }
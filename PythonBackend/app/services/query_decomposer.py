@@ -0,0 +1,107 @@
+import re
+from typing import List
+
+# Question boundaries: "...? And what about ...?", "...; ..." or "... and what happens next?"
+QUESTION_SPLIT_PATTERN = re.compile(
+    r'(?<=\?)\s+|\s*;\s*|,?\s+and\s+(?=(?:what|how|when|where|who|which|why)\s)',
+    re.IGNORECASE
+)
+# Coordinated topics: "sick leave and maternity leave", "salary, bonuses and insurance"
+CONJUNCTION_PATTERN = re.compile(r'\s*,\s*(?:and\s+|as well as\s+)?|\s+(?:and|as well as)\s+', re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[A-Za-z0-9'-]+")
+# Set phrases that name one topic: "What are the terms and conditions?" is not two questions
+FIXED_PHRASES = re.compile(
+    r"\b(?:terms|rules|health|pros|dos|drugs?|learning|training|rights)\s+and\s+"
+    r"(?:conditions|regulations|safety|cons|don'ts|alcohol|development|responsibilities)\b",
+    re.IGNORECASE
+)
+_MASK = "\x00"
+
+# Leading words that frame a question rather than name its topic
+FRAME_WORDS = frozenset("""
+what whats what's which how when where who is are was were do does did can could should will would
+the a an my our your about for on of regarding tell me i we get much many long rules policy
+""".split())
+# A frame ending in a subject is followed by the question's verb: "How do I *report* ...", "Who *approves* ..."
+SUBJECT_WORDS = frozenset("i we you who".split())
+# Trailing head nouns shared by coordinated topics: "the sick and annual leave *rules*"
+SHARED_HEADS = frozenset("""
+rules rule policy policies entitlement entitlements rights procedure procedures process
+requirements benefits allowance allowances days limits conditions
+""".split())
+PREPOSITIONS = frozenset("""
+over up out off into under from within during after before per without between through than as
+""".split())
+STOP_WORDS = FRAME_WORDS | PREPOSITIONS | frozenset("and or with to in at by it this that be".split())
+
+
+def _content_words(text: str) -> List[str]:
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
+
+
+class QueryDecomposer:
+    """
+    Splits compound questions into standalone sub-queries with cheap rules.
+    Follows SRP - Only rewrites questions, retrieval and generation live elsewhere.
+
+    Only coordinated noun phrases are split, and every sub-query keeps the whole
+    predicate: "How do I report harassment and discrimination?" becomes
+    ["How do I report harassment?", "How do I report discrimination?"]. Anything
+    else joined by "and" (clauses, modifiers, set phrases) is left as one question.
+    """
+
+    def __init__(self, max_parts: int = 3):
+        self.max_parts = max_parts
+
+    def decompose(self, question: str) -> List[str]:
+        """Return the sub-queries of a question, or just the question if it is not compound."""
+        parts: List[str] = []
+        for sentence in QUESTION_SPLIT_PATTERN.split(question.strip()):
+            if sentence.strip():
+                parts.extend(self._split_coordination(sentence.strip()))
+
+        # Drop fragments without a topic of their own ("and?", "also")
+        parts = [p for p in parts if _content_words(p)]
+        if len(parts) < 2:
+            return [question]
+
+        unique = list(dict.fromkeys(parts))
+        return unique[:self.max_parts]
+
+    def _split_coordination(self, sentence: str) -> List[str]:
+        terminator = sentence[-1] if sentence[-1] in '?.!' else ''
+        body = FIXED_PHRASES.sub(lambda m: m.group(0).replace(' ', _MASK), sentence.rstrip('?.!'))
+        pieces = [piece.split() for piece in CONJUNCTION_PATTERN.split(body) if piece.strip()]
+        if len(pieces) < 2:
+            return [sentence]
+
+        # Predicate and first topic: "How do I report | harassment", "What is the dress code for | men"
+        first = pieces[0]
+        start = 0
+        while start < len(first) and first[start].lower() in FRAME_WORDS:
+            start += 1
+        if 0 < start < len(first) and first[start - 1].lower() in SUBJECT_WORDS:
+            start += 1
+        for position in range(len(first) - 1, start - 1, -1):
+            if first[position].lower() in STOP_WORDS:
+                start = position + 1
+                break
+        predicate = first[:start]
+
+        # Head noun carried over from the last topic: "maternity leave | rules"
+        last = pieces[-1]
+        head = last[-1:] if len(last) > 1 and last[-1].lower() in SHARED_HEADS else []
+        topics = [first[start:]] + pieces[1:-1] + [last[:len(last) - len(head)]]
+
+        # A verb or preposition in a topic means "and" joins clauses or modifiers, not noun phrases
+        for topic in topics:
+            if not topic or any(word.lower() in STOP_WORDS for word in topic) or not _content_words(" ".join(topic)):
+                return [sentence]
+
+        queries = []
+        for topic in topics:
+            words = predicate + topic
+            if head and topic[-1].lower() != head[0].lower():
+                words = words + head
+            queries.append(" ".join(words).replace(_MASK, ' ') + terminator)
+        return queries
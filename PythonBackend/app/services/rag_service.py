@@ -1,17 +1,48 @@
+import contextvars
 import logging
-import re
-from typing import List, Optional, Tuple
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
 import warnings
 
 from langchain_community.llms import Ollama as OllamaLLM
-from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
 from langchain.schema import Document
 from app.config.settings import settings
 from app.services.document_processor import DocumentProcessor
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.extractive import Snippet, SnippetExtractor, build_retrieval_only_answer
+from app.services.fair_scheduler import FairScheduler
+from app.services.index_snapshots import IndexSnapshotManager
+from app.services.knowledge_bases import KnowledgeBaseRegistry
+from app.services.llm_recorder import RecordingStore, RecordReplayChain, ReplayMiss
+from app.services.metadata_index import chunk_sources
+from app.services.query_decomposer import QueryDecomposer
+from app.services.response_normalizer import normalize_response
+from app.services.retriever import LEGACY_INDEX_VERSION, PolicyRetriever, merge_results
+from app.services.tracing import span
 
 warnings.filterwarnings("ignore")
 
+NOT_COVERED_ANSWER = (
+    "I couldn't find anything about this in the company policy documents, so it doesn't appear "
+    "to be covered by policy. Please contact HR for questions the policies don't answer."
+)
+
+@dataclass
+class AnswerResult:
+    """Outcome of a RAG request."""
+    answer: str
+    sources: List[str] = field(default_factory=list)
+    snippets: List[Snippet] = field(default_factory=list)
+    degraded: bool = False  # True when the answer is retrieved passages only, without the LLM
+    index_version: Optional[str] = None  # index snapshot the answer was retrieved from
+    out_of_scope: bool = False  # True when nothing relevant was retrieved and the LLM was skipped
+
 class RAGService:
     """
     Retrieval-Augmented Generation service.
@@ -21,9 +52,55 @@ class RAGService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.document_processor = DocumentProcessor()
+        # Serve the active index snapshot, or the single legacy vector store if none was built yet
+        self.snapshots = IndexSnapshotManager(settings.snapshots_directory, keep=settings.snapshot_keep)
+        active_version = self.snapshots.active_version()
+        self.document_processor = DocumentProcessor(
+            vector_store_path=self.snapshots.snapshot_path(active_version) if active_version else None
+        )
+        self.index_version = active_version or LEGACY_INDEX_VERSION
+        self._index_lock = threading.RLock()
         self.llm = self._initialize_llm()
-        self.retrieval_chain = None
+        self.retriever = None
+        # Requests using each retriever; a replaced one is released when its last request ends
+        self._retriever_lock = threading.Lock()
+        self._retriever_users: Counter = Counter()
+        self._retired_retrievers = set()
+        self.generation_chain = None
+        # Generation runs on worker threads so a slow LLM can be abandoned at the deadline
+        self._generation_executor = ThreadPoolExecutor(
+            max_workers=settings.generation_max_workers,
+            thread_name_prefix="llm-generation"
+        )
+        # Generations waiting for one of those workers take turns across sessions
+        self.generation_scheduler = FairScheduler(settings.generation_max_workers)
+        self._llm_unavailable_until = 0.0
+        # Caps how many sub-query answers are generated at once in "parallel" decomposition mode
+        self._sub_answer_executor = ThreadPoolExecutor(
+            max_workers=settings.decomposition_max_concurrency,
+            thread_name_prefix="sub-answer"
+        )
+        # Query embeddings of concurrent requests share model calls
+        self.embedding_batcher = None
+        if settings.embedding_batch_wait_ms > 0:
+            self.embedding_batcher = EmbeddingBatcher(
+                self.document_processor.embeddings,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_wait_ms
+            )
+        # Knowledge bases other than the default one, loaded on first use
+        self.knowledge_bases = KnowledgeBaseRegistry(
+            settings.knowledge_bases_directory,
+            self.document_processor.embeddings,
+            embedding_batcher=self.embedding_batcher,
+            memory_budget_mb=settings.knowledge_base_memory_mb
+        )
+        self.query_decomposer = QueryDecomposer(max_parts=settings.decomposition_max_parts)
+        self.snippet_extractor = SnippetExtractor(
+            self.document_processor.embeddings,
+            per_chunk=settings.snippets_per_chunk,
+            cache_size=settings.snippet_cache_size
+        )
         self._initialize_rag_chain()
     
     def _initialize_llm(self):
@@ -33,40 +110,14 @@ class RAGService:
             return OllamaLLM(
                 base_url=settings.ollama_base_url,
                 model=settings.ollama_model,
-                temperature=0.5
+                temperature=0.5,
+                # Without it a hung connection would hold its generation worker forever
+                timeout=settings.ollama_read_timeout_seconds
             )
         except Exception as e:
             self.logger.error(f"Error initializing Ollama LLM: {str(e)}")
             raise
     
-    def _clean_response(self, response: str) -> str:
-        """Clean and format the LLM response for better readability."""
-        if not response:
-            return response
-        
-        # Remove excessive newlines and whitespace
-        cleaned = response.strip()
-        
-        # Replace multiple newlines with single newlines
-        cleaned = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned)
-        
-        # Replace single newlines with spaces (except for intentional paragraph breaks)
-        cleaned = re.sub(r'(?<!\n)\n(?!\n)', ' ', cleaned)
-        
-        # Clean up multiple spaces
-        cleaned = re.sub(r' +', ' ', cleaned)
-        
-        # Remove quotes around the entire response if present
-        cleaned = re.sub(r'^["\']+|["\']+$', '', cleaned)
-        
-        # Remove section references in parentheses at the end
-        cleaned = re.sub(r'\s*\([^)]*Section[^)]*\)\s*$', '', cleaned)
-        
-        # Clean up any remaining formatting artifacts
-        cleaned = cleaned.replace('\\n', ' ').replace('\\"', '"')
-        
-        return cleaned.strip()
-    
     def _create_prompt_template(self) -> PromptTemplate:
         """Create a custom prompt template for the RAG chain."""
         template = """You are a helpful AI assistant that answers questions based on the provided context. 
@@ -92,21 +143,27 @@ class RAGService:
             if not self.llm:
                 raise ValueError("LLM not initialized")
                 
-            vector_store = self.document_processor.get_vector_store()
-            retriever = vector_store.as_retriever(
-                search_type="similarity",
-                search_kwargs={"k": 3}  # Retrieve top 3 relevant chunks
+            self.retriever = PolicyRetriever(
+                self.document_processor,
+                index_version=self.index_version,
+                embedding_batcher=self.embedding_batcher
             )
             
             prompt_template = self._create_prompt_template()
+            self.generation_chain = prompt_template | self.llm
+            if settings.llm_recorder_mode != "off":
+                # Serve recorded completions so the pipeline runs without Ollama
+                self.generation_chain = RecordReplayChain(
+                    self.generation_chain,
+                    render=lambda inputs: prompt_template.format(**inputs),
+                    store=RecordingStore(settings.llm_recordings_path),
+                    mode=settings.llm_recorder_mode,
+                    model=settings.ollama_model,
+                    speed=settings.llm_replay_speed
+                )
+                self.logger.info(f"LLM record/replay in {settings.llm_recorder_mode} mode")
             
-            self.retrieval_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=retriever,
-                chain_type_kwargs={"prompt": prompt_template},
-                return_source_documents=True
-            )
+            self._warm_snippets(self.document_processor)
             
             self.logger.info("RAG chain initialized successfully")
             
@@ -114,67 +171,362 @@ class RAGService:
             self.logger.error(f"Error initializing RAG chain: {str(e)}")
             raise
     
-    def get_answer(self, question: str) -> Tuple[str, List[str]]:
+    def _warm_snippets(self, document_processor: DocumentProcessor):
+        """Embed chunk sentences up front when the whole corpus fits in the snippet cache."""
+        stored = document_processor.get_vector_store().get(include=["documents"])
+        if len(stored["documents"]) <= settings.snippet_cache_size:
+            self.snippet_extractor.warm(stored["documents"])
+    
+    def _open_snapshot(self, version: str) -> Tuple[DocumentProcessor, PolicyRetriever]:
+        """Load a snapshot and check that it answers a smoke query before it can go live."""
+        processor = DocumentProcessor(
+            vector_store_path=self.snapshots.snapshot_path(version),
+            embeddings=self.document_processor.embeddings
+        )
+        retriever = PolicyRetriever(processor, index_version=version, embedding_batcher=self.embedding_batcher)
+        if not retriever.search(settings.snapshot_smoke_query, k=1):
+            raise ValueError(f"Index snapshot {version} returned no results for the smoke query")
+        return processor, retriever
+    
+    def _swap_index(self, processor: DocumentProcessor, retriever: PolicyRetriever):
+        """
+        Switch live retrieval to another snapshot; in-flight requests keep their retriever,
+        and the replaced one is released once the last of them ends.
+        """
+        self._warm_snippets(processor)
+        with self._retriever_lock:
+            previous = self.retriever
+            self.document_processor = processor
+            self.index_version = retriever.index_version
+            self.retriever = retriever
+            release = previous is not None and not self._retriever_users[previous]
+            if previous is not None and not release:
+                self._retired_retrievers.add(previous)
+        if release:
+            self._release_retriever(previous)
+        self.logger.info(f"Serving index snapshot {retriever.index_version}")
+    
+    @contextmanager
+    def use_retriever(self) -> Iterator[Optional[PolicyRetriever]]:
+        """The live retriever, kept open for the request even if the index is swapped meanwhile."""
+        with self._retriever_lock:
+            retriever = self.retriever
+            self._retriever_users[retriever] += 1
+        try:
+            yield retriever
+        finally:
+            with self._retriever_lock:
+                self._retriever_users[retriever] -= 1
+                release = not self._retriever_users[retriever] and retriever in self._retired_retrievers
+                if not self._retriever_users[retriever]:
+                    del self._retriever_users[retriever]
+                if release:
+                    self._retired_retrievers.discard(retriever)
+            if release:
+                self._release_retriever(retriever)
+    
+    def _release_retriever(self, retriever: PolicyRetriever):
+        """Stop a replaced retriever's search threads and close its Chroma client and index."""
+        retriever.close()
+        retriever.document_processor.close()
+        self.logger.info(f"Released index snapshot {retriever.index_version}")
+    
+    def publish_snapshot(self, version: str, info: dict) -> str:
+        """
+        Verify a freshly built snapshot, make it live and prune old ones.
+        The snapshot is discarded if it fails verification.
+        
+        Args:
+            version: Snapshot version returned by IndexSnapshotManager.allocate
+            info: Build information for the manifest (documents, chunks, ...)
+        """
+        with self._index_lock:
+            try:
+                self.snapshots.write_manifest(version, {
+                    **info,
+                    "chunking_strategy": settings.chunking_strategy,
+                    "embedding_model": settings.embedding_model
+                })
+                processor, retriever = self._open_snapshot(version)
+            except Exception:
+                self.snapshots.discard(version)
+                raise
+            
+            self.snapshots.activate(version)
+            self._swap_index(processor, retriever)
+            self.snapshots.prune()
+            return version
+    
+    def rollback_index(self, version: Optional[str] = None) -> str:
+        """
+        Make an earlier snapshot live again.
+        
+        Args:
+            version: Snapshot to restore, defaults to the one before the active snapshot
+            
+        Returns:
+            The restored index version
+        """
+        with self._index_lock:
+            target = version or self.snapshots.previous_version()
+            if not target:
+                raise ValueError("No earlier index snapshot to roll back to")
+            
+            processor, retriever = self._open_snapshot(target)
+            self.snapshots.activate(target)
+            self._swap_index(processor, retriever)
+            return target
+    
+    def _generate(self, question: str, context: str, session_id: str = "") -> Optional[str]:
+        """
+        Generate an answer, giving up if the LLM has not produced its first token
+        within settings.generation_start_timeout_seconds. Waits for a generation slot
+        first, in turn with other sessions, for up to settings.generation_queue_timeout_seconds.
+        
+        Returns:
+            The raw answer, or None when the LLM is slow, unavailable or busy, or when
+            a replayed prompt was never recorded
+        """
+        if time.monotonic() < self._llm_unavailable_until:
+            self.logger.warning("LLM marked unavailable, skipping generation")
+            return None
+        
+        with span("queue") as queue_span:
+            admitted = self.generation_scheduler.acquire(session_id, settings.generation_queue_timeout_seconds)
+            if queue_span:
+                queue_span.attributes["admitted"] = admitted
+        if not admitted:
+            # Overloaded rather than down, so no cool-down
+            self.logger.warning(f"No generation slot within {settings.generation_queue_timeout_seconds}s, skipping generation")
+            return None
+        
+        started = threading.Event()
+        abandoned = threading.Event()
+        release_lock = threading.Lock()
+        released = False
+        
+        def release_slot(_=None):
+            nonlocal released
+            with release_lock:
+                if released:
+                    return
+                released = True
+            self.generation_scheduler.release()
+        
+        def stream() -> str:
+            parts = []
+            for part in self.generation_chain.stream({"context": context, "question": question}):
+                if abandoned.is_set():
+                    break
+                parts.append(part)
+                started.set()
+            return "".join(parts)
+        
+        future = self._generation_executor.submit(stream)
+        # The slot is held until the stream ends, or until the request gives up on it: a
+        # stalled stream only stops at its next token or the Ollama read timeout
+        future.add_done_callback(release_slot)
+        # Wake up on the first token or on completion (including a fast connection error)
+        future.add_done_callback(lambda _: started.set())
+        
+        if not started.wait(settings.generation_start_timeout_seconds):
+            abandoned.set()
+            release_slot()
+            self._mark_llm_unavailable(f"no output within {settings.generation_start_timeout_seconds}s")
+            return None
+        
+        try:
+            return future.result()
+        except ReplayMiss as e:
+            # A gap in the recordings, not an outage: only this request goes retrieval-only
+            self.logger.warning(f"LLM replay miss ({e}), serving a retrieval-only answer")
+            return None
+        except Exception as e:
+            self._mark_llm_unavailable(str(e))
+            return None
+    
+    def _mark_llm_unavailable(self, reason: str):
+        """Skip generation for a cool-down period so later requests degrade immediately."""
+        self._llm_unavailable_until = time.monotonic() + settings.llm_cooldown_seconds
+        self.logger.warning(f"LLM unavailable ({reason}), serving retrieval-only answers for {settings.llm_cooldown_seconds}s")
+    
+    def _generate_traced(self, question: str, context: str, session_id: str) -> Optional[str]:
+        with span("generate_part", question=question):
+            return self._generate(question, context, session_id)
+    
+    def _generate_parts(self, sub_queries: List[str], contexts: List[str], session_id: str = "") -> Optional[str]:
+        """Generate one partial answer per sub-query in parallel; None if any of them degraded."""
+        # Each part runs in a copy of the request context so its span joins the request's trace
+        futures = [
+            self._sub_answer_executor.submit(
+                contextvars.copy_context().run, self._generate_traced, sub_query, context, session_id
+            )
+            for sub_query, context in zip(sub_queries, contexts)
+        ]
+        parts = [future.result() for future in futures]
+        if any(part is None for part in parts):
+            return None
+        return "\n\n".join(part.strip() for part in parts if part and part.strip())
+    
+    def get_answer(
+        self,
+        question: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        knowledge_base: Optional[str] = None,
+        session_id: str = ""
+    ) -> AnswerResult:
         """
         Get answer for a question using RAG pipeline.
         
         Args:
             question: User's question
+            filters: Optional metadata filters (source, section, tag) to restrict retrieval
+            knowledge_base: Named knowledge base to answer from, defaults to settings.default_knowledge_base
+            session_id: Session asking, generations of different sessions take turns when the LLM is busy
             
         Returns:
-            Tuple of (answer, source_documents)
+            AnswerResult with the answer, its source documents and whether it is degraded
         """
+        knowledge_base = knowledge_base or settings.default_knowledge_base
+        started = time.perf_counter()
+        try:
+            if knowledge_base == settings.default_knowledge_base:
+                with self.use_retriever() as retriever:
+                    return self._answer(retriever, question, filters, session_id)
+            with self.knowledge_bases.use(knowledge_base) as retriever:
+                return self._answer(retriever, question, filters, session_id)
+        except Exception as e:
+            self.logger.error(f"Error loading knowledge base {knowledge_base}: {str(e)}")
+            return AnswerResult(answer="I'm sorry, I encountered an error while processing your question.")
+        finally:
+            self.knowledge_bases.record_latency(knowledge_base, time.perf_counter() - started)
+    
+    def _answer(
+        self,
+        retriever: Optional[PolicyRetriever],
+        question: str,
+        filters: Optional[Dict[str, List[str]]],
+        session_id: str = ""
+    ) -> AnswerResult:
+        """Run the RAG pipeline for a question against one knowledge base's retriever."""
         try:
-            if not self.retrieval_chain:
+            if not retriever or not self.generation_chain:
                 raise ValueError("RAG chain not initialized")
             
             self.logger.info(f"Processing question: {question}")
             
-            # Get response from RAG chain
-            result = self.retrieval_chain({"query": question})
+            sub_queries = [question]
+            if settings.decomposition_mode != "off":
+                sub_queries = self.query_decomposer.decompose(question)
             
-            raw_answer = result.get("result", "I couldn't generate a response.")
-            source_docs = result.get("source_documents", [])
+            # Retrieve the most relevant chunks and "stuff" them into the prompt
+            with span("retrieve", sub_queries=len(sub_queries), filtered=bool(filters)) as retrieve_span:
+                if len(sub_queries) == 1:
+                    with span("embed"):
+                        query_embedding = retriever.embed_query(question)
+                    with span("search"):
+                        results = retriever.search_by_vector(query_embedding, filters=filters, adaptive=True)
+                    results_per_query = [results]
+                else:
+                    # Compound question: embed everything in one batch, search sub-queries concurrently
+                    self.logger.info(f"Decomposed question into {len(sub_queries)} sub-queries: {sub_queries}")
+                    with span("embed"):
+                        query_embedding, *sub_embeddings = retriever.embed_queries([question] + sub_queries)
+                    with span("search"):
+                        results_per_query = retriever.search_many(sub_embeddings, filters=filters, adaptive=True)
+                        results = merge_results(results_per_query, settings.decomposition_max_chunks)
+                if retrieve_span:
+                    retrieve_span.attributes["chunks"] = len(results)
             
-            # Clean the response
-            answer = self._clean_response(raw_answer)
+            # Nothing relevant retrieved: answer right away instead of letting the LLM say it doesn't know
+            best_score = max((score for _, score in results), default=None)
+            if settings.min_relevance_score > 0 and (best_score is None or best_score < settings.min_relevance_score):
+                self.logger.info(f"Question not covered by policy (best score {best_score}), skipping generation")
+                return AnswerResult(
+                    answer=NOT_COVERED_ANSWER,
+                    out_of_scope=True,
+                    index_version=retriever.index_version
+                )
+            
+            source_docs = [doc for doc, _ in results]
+            # Small chunks were searched, the LLM gets their parent sections
+            with span("expand") as expand_span:
+                passages = retriever.context_passages(results)
+                context = "\n\n".join(passages)
+                if expand_span:
+                    expand_span.attributes["passages"] = len(passages)
+            
+            # Supporting sentences, scored against the same question embedding
+            with span("rerank", stage="snippets"):
+                snippets = self.snippet_extractor.extract(query_embedding, source_docs)
+            
+            with span("generate") as generate_span:
+                if len(sub_queries) > 1 and settings.decomposition_mode == "parallel":
+                    contexts = ["\n\n".join(retriever.context_passages(r)) for r in results_per_query]
+                    raw_answer = self._generate_parts(sub_queries, contexts, session_id)
+                else:
+                    raw_answer = self._generate(question, context, session_id)
+                degraded = raw_answer is None
+                if generate_span:
+                    generate_span.attributes["degraded"] = degraded
+            
+            with span("clean"):
+                if degraded:
+                    # LLM slow or down: answer with the retrieved passages themselves
+                    answer = build_retrieval_only_answer(question, source_docs, snippets)
+                else:
+                    # Clean the response
+                    answer = normalize_response(raw_answer or "I couldn't generate a response.")
             
             # Extract source information with better logging
             sources = []
             source_details = {}
             
             for doc in source_docs:
-                source_info = doc.metadata.get("source", "Unknown")
-                if source_info not in sources:
-                    sources.append(source_info)
-                
-                # Count occurrences of each source
-                if source_info not in source_details:
-                    source_details[source_info] = 0
-                source_details[source_info] += 1
+                # A chunk collapsed from near-duplicates stands for every file it appeared in
+                for source_info in chunk_sources(doc.metadata) or ["Unknown"]:
+                    if source_info not in sources:
+                        sources.append(source_info)
+                    
+                    # Count occurrences of each source
+                    if source_info not in source_details:
+                        source_details[source_info] = 0
+                    source_details[source_info] += 1
             
             # Log detailed information about sources used
             self.logger.info(f"Generated answer with {len(sources)} unique sources")
             for source, count in source_details.items():
                 self.logger.info(f"  - {source}: {count} chunks used")
             
-            return answer, sources
+            return AnswerResult(
+                answer=answer,
+                sources=sources,
+                snippets=snippets,
+                degraded=degraded,
+                index_version=retriever.index_version
+            )
             
         except Exception as e:
             self.logger.error(f"Error generating answer: {str(e)}")
-            return "I'm sorry, I encountered an error while processing your question.", []
+            return AnswerResult(answer="I'm sorry, I encountered an error while processing your question.")
     
     def health_check(self) -> dict:
-        """Check the health of the RAG service."""
+        """
+        Health of the RAG service from already loaded state only, so probes stay O(1).
+        Checks that do real work live in Diagnostics.
+        """
         try:
-            vector_store = self.document_processor.get_vector_store()
-            vector_store_status = "healthy" if vector_store else "unavailable"
+            vector_store_status = "healthy" if self.document_processor.vector_store is not None else "not_loaded"
             
             return {
                 "llm_type": "ollama",
                 "ollama_model": settings.ollama_model,
                 "vector_store_status": vector_store_status,
-                "rag_chain_status": "initialized" if self.retrieval_chain else "not_initialized"
+                "vector_index_mode": settings.vector_index_mode,
+                "index_version": self.index_version,
+                "llm_status": "cooling_down" if time.monotonic() < self._llm_unavailable_until else "available",
+                "embedding_batcher": self.embedding_batcher.stats() if self.embedding_batcher else None,
+                "rag_chain_status": "initialized" if self.generation_chain else "not_initialized"
             }
         except Exception as e:
             self.logger.error(f"Health check failed: {str(e)}")
@@ -0,0 +1,125 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from app.config.settings import settings
+
+
+class RateLimited(Exception):
+    """A request went over the rate limit of its session or client."""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Too many requests for this {scope}, retry in {retry_after:.1f}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by session id or client address.
+    Each key may burst up to `burst` requests, refilled at rate_per_minute. Only
+    the max_keys most recently seen keys are kept; a dropped key starts full again,
+    which is what it would have refilled to anyway unless it was seen very recently.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if rate_per_minute <= 0 or burst < 1:
+            raise ValueError("rate_per_minute must be positive and burst at least 1")
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def acquire(self, key: str) -> float:
+        """Take a token for the key; returns 0 when allowed, otherwise seconds until one is available."""
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+                self.allowed += 1
+            else:
+                retry_after = (1 - tokens) / self.rate
+                self.limited += 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate_per_minute": self.rate * 60,
+                "burst": self.burst,
+                "keys": len(self._buckets),
+                "allowed": self.allowed,
+                "limited": self.limited
+            }
+
+
+class RequestRateLimiter:
+    """
+    Per-session and per-client rate limits for chat requests.
+    Follows SRP - Only decides whether a request may proceed, endpoints turn refusals into 429s.
+
+    Requests relayed by a trusted proxy (the .NET API) are limited by the client
+    address it forwards in X-Forwarded-For; without one only the session limit applies,
+    so every user behind the proxy does not share the proxy's address bucket.
+    """
+
+    def __init__(
+        self,
+        session_limiter: TokenBucketLimiter,
+        ip_limiter: TokenBucketLimiter,
+        trusted_proxies: Sequence[str] = ()
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.session_limiter = session_limiter
+        self.ip_limiter = ip_limiter
+        self.trusted_proxies = set(trusted_proxies)
+
+    @classmethod
+    def from_settings(cls) -> "RequestRateLimiter":
+        return cls(
+            TokenBucketLimiter(settings.session_rate_per_minute, settings.session_burst, settings.rate_limit_max_keys),
+            TokenBucketLimiter(settings.ip_rate_per_minute, settings.ip_burst, settings.rate_limit_max_keys),
+            trusted_proxies=[p.strip() for p in settings.rate_limit_trusted_proxies.split(",") if p.strip()]
+        )
+
+    def client_address(self, peer: Optional[str], forwarded_for: Optional[str]) -> Optional[str]:
+        """Address to limit: the peer, or the client a trusted proxy forwarded (None if it sent none)."""
+        if peer in self.trusted_proxies:
+            if not forwarded_for:
+                return None
+            return forwarded_for.split(",")[0].strip() or None
+        return peer
+
+    def check(self, session_id: str, peer: Optional[str] = None, forwarded_for: Optional[str] = None):
+        """Count a request against its client and session; raises RateLimited when either is exhausted."""
+        address = self.client_address(peer, forwarded_for)
+        if address:
+            retry_after = self.ip_limiter.acquire(address)
+            if retry_after:
+                self.logger.warning(f"Rate limited client {address}, retry in {retry_after:.1f}s")
+                raise RateLimited("client", retry_after)
+        retry_after = self.session_limiter.acquire(session_id)
+        if retry_after:
+            self.logger.warning(f"Rate limited session {session_id}, retry in {retry_after:.1f}s")
+            raise RateLimited("session", retry_after)
+
+    def stats(self) -> dict:
+        return {"session": self.session_limiter.stats(), "client": self.ip_limiter.stats()}
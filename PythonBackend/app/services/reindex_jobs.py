@@ -0,0 +1,233 @@
+import os
+import time
+import uuid
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.config.settings import settings
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+PUBLISHING = "publishing"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+THREAD_LIMIT_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@contextmanager
+def _worker_environment(cpu_threads: int) -> Iterator[None]:
+    """
+    Thread caps in the environment of worker processes spawned inside the block.
+    They can't be set in the worker: the imports that unpickle its job load numpy,
+    whose BLAS pool reads them once, before the pool initializer runs.
+    """
+    limits = {variable: str(cpu_threads) for variable in THREAD_LIMIT_VARIABLES}
+    limits["TOKENIZERS_PARALLELISM"] = "false"
+    saved = {variable: os.environ.get(variable) for variable in limits}
+    os.environ.update(limits)
+    try:
+        yield
+    finally:
+        for variable, value in saved.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+
+def _init_worker(nice: int):
+    """Lower the priority of a reindex worker so serving latency isn't harmed."""
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+
+
+def _run_reindex(snapshot_path: str, progress, cancel_event) -> dict:
+    """
+    Build the documents into a snapshot directory. Runs in a worker process.
+    Heavy imports happen here so the serving process never pays for them.
+    """
+    try:
+        import torch
+        torch.set_num_threads(settings.reindex_cpu_threads)
+    except ImportError:
+        pass
+
+    from app.services.document_processor import DocumentProcessor
+
+    progress["status"] = RUNNING
+    progress["started_at"] = datetime.utcnow().isoformat()
+
+    processor = DocumentProcessor(vector_store_path=snapshot_path)
+
+    def on_file(done: int, total: int):
+        progress.update(files_done=done, files_total=total)
+
+    documents = processor.load_documents(
+        settings.docs_directory,
+        on_progress=on_file,
+        should_stop=cancel_event.is_set
+    )
+    if not documents:
+        raise ValueError("No documents found to build the index")
+
+    started = time.monotonic()
+
+    def on_batch(done: int, total: int):
+        elapsed = time.monotonic() - started
+        progress.update(
+            chunks_total=total,
+            chunks_embedded=done,
+            embeddings_per_second=round(done / elapsed, 2) if elapsed > 0 else None
+        )
+
+    processor.build_vector_store(
+        documents,
+        batch_size=settings.reindex_batch_size,
+        on_progress=on_batch,
+        should_stop=cancel_event.is_set
+    )
+
+    return {
+        "documents": sorted(doc.metadata.get("source", "Unknown") for doc in documents),
+        "chunks": progress.get("chunks_total", 0),
+        "parents": len(processor.parent_store) if processor.parent_store else 0,
+        "dedup": processor.dedup_report.to_dict() if processor.dedup_report else None
+    }
+
+
+class ReindexJobManager:
+    """
+    Runs knowledge base rebuilds as background jobs in a separate process.
+    Follows SRP - Schedules and tracks jobs; building happens in DocumentProcessor
+    and publishing the finished snapshot in RAGService.
+    """
+
+    def __init__(self, rag_service, job: Callable[[str, dict, object], dict] = _run_reindex):
+        """
+        Args:
+            rag_service: Service whose snapshots the jobs build into and publish
+            job: Module-level build function run in the worker process as job(snapshot_path, progress, cancel_event)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.rag_service = rag_service
+        self.job = job
+        self.jobs: Dict[str, dict] = {}
+        self._futures: Dict[str, Future] = {}
+        self._cancel_events: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._manager = None
+        self._executor = None
+
+    def _ensure_started(self):
+        # Started lazily, a backend that never reindexes never spawns the worker processes
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(settings.reindex_nice,)
+            )
+
+    def start(self) -> dict:
+        """
+        Queue a reindex job.
+
+        Raises:
+            RuntimeError: if another reindex job is still queued or running
+        """
+        with self._lock:
+            if any(self.status(job_id)["status"] not in FINISHED_STATES for job_id in self.jobs):
+                raise RuntimeError("A reindex job is already in progress")
+
+            self._ensure_started()
+            job_id = uuid.uuid4().hex
+            version, path = self.rag_service.snapshots.allocate()
+
+            progress = self._manager.dict({
+                "job_id": job_id,
+                "status": QUEUED,
+                "index_version": version,
+                "files_done": 0,
+                "files_total": None,
+                "chunks_embedded": 0,
+                "chunks_total": None,
+                "embeddings_per_second": None,
+                "error": None,
+                "created_at": datetime.utcnow().isoformat(),
+                "started_at": None,
+                "finished_at": None
+            })
+            cancel_event = self._manager.Event()
+
+            self.jobs[job_id] = progress
+            self._cancel_events[job_id] = cancel_event
+            # The worker process is spawned on the first submit and inherits the thread caps
+            with _worker_environment(settings.reindex_cpu_threads):
+                future = self._executor.submit(self.job, path, progress, cancel_event)
+            self._futures[job_id] = future
+
+        self.logger.info(f"Queued reindex job {job_id} into snapshot {version}")
+        # Publishing loads the snapshot in this process, keep it off the executor's callback thread
+        future.add_done_callback(
+            lambda f: threading.Thread(target=self._finish, args=(job_id, f), daemon=True).start()
+        )
+        return self.status(job_id)
+
+    def _finish(self, job_id: str, future: Future):
+        progress = self.jobs[job_id]
+        version = progress["index_version"]
+        try:
+            if future.cancelled():
+                raise InterruptedError("Reindex cancelled before it started")
+            info = future.result()
+            progress["status"] = PUBLISHING
+            self.rag_service.publish_snapshot(version, info)
+            progress["status"] = SUCCEEDED
+            self.logger.info(f"Reindex job {job_id} published snapshot {version}")
+        except InterruptedError as e:
+            self.rag_service.snapshots.discard(version)
+            progress.update(status=CANCELLED, error=str(e))
+            self.logger.info(f"Reindex job {job_id} cancelled")
+        except Exception as e:
+            self.rag_service.snapshots.discard(version)
+            progress.update(status=FAILED, error=str(e))
+            self.logger.error(f"Reindex job {job_id} failed: {str(e)}")
+        finally:
+            progress["finished_at"] = datetime.utcnow().isoformat()
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """Snapshot of a job's progress, or None for an unknown job."""
+        progress = self.jobs.get(job_id)
+        return dict(progress) if progress is not None else None
+
+    def list_jobs(self) -> List[dict]:
+        """All jobs of this process, newest first."""
+        return sorted((dict(p) for p in self.jobs.values()), key=lambda j: j["created_at"], reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Ask a job to stop; running jobs stop at the next file or batch boundary."""
+        if job_id not in self.jobs:
+            return None
+        if self.status(job_id)["status"] not in FINISHED_STATES:
+            self._cancel_events[job_id].set()
+            self._futures[job_id].cancel()
+        return self.status(job_id)
+
+    def shutdown(self):
+        """Stop the worker processes, cancelling queued jobs."""
+        for event in self._cancel_events.values():
+            event.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
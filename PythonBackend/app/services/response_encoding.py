@@ -0,0 +1,185 @@
+import gzip
+import json
+import uuid
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.config.settings import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MEDIA_JSON = "application/json"
+MEDIA_COMPACT_JSON = "application/vnd.rag.compact+json"
+MEDIA_MSGPACK = "application/msgpack"
+_MEDIA_ALIASES = {"application/x-msgpack": MEDIA_MSGPACK}
+COMPRESSIONS = ("zstd", "gzip")  # preference order when the client rates them equally
+
+
+def parse_quality_list(header: Optional[str]) -> List[Tuple[str, float]]:
+    """Values of an Accept or Accept-Encoding header with their q-values, best first."""
+    values = []
+    for position, part in enumerate((header or "").split(",")):
+        fields = [field.strip() for field in part.split(";")]
+        if not fields[0]:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        values.append((position, fields[0].lower(), quality))
+    values.sort(key=lambda value: (-value[2], value[0]))
+    return [(value, quality) for _, value, quality in values]
+
+
+def negotiate_media_type(accept: Optional[str], available: Sequence[str]) -> str:
+    """Best available media type for an Accept header; plain JSON when nothing else matches."""
+    for value, quality in parse_quality_list(accept):
+        if quality <= 0:
+            continue
+        value = _MEDIA_ALIASES.get(value, value)
+        if value in available:
+            return value
+        if value in ("*/*", "application/*"):
+            return MEDIA_JSON
+    return MEDIA_JSON
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> Optional[str]:
+    """Best available content coding for an Accept-Encoding header, None for identity."""
+    ranked = dict(parse_quality_list(accept_encoding))
+    wildcard = ranked.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = ranked.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compact_dict(model: BaseModel, drop: Iterable[str] = ()) -> dict:
+    """
+    The model without None values, defaults and the dropped fields, with its
+    timestamps as Unix seconds (millisecond precision; naive datetimes are UTC).
+    """
+    data = model.model_dump(exclude_none=True, exclude_defaults=True, exclude=set(drop))
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = _epoch(value)
+    return data
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return round(value.timestamp(), 3)
+
+
+def _default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+class ResponseEncoder:
+    """
+    Serializes response models according to the Accept and Accept-Encoding headers.
+    Follows SRP - Only encodes and compresses, endpoints still build the models.
+
+    application/json is the full model, as FastAPI would render it.
+    application/vnd.rag.compact+json and application/msgpack drop None values,
+    defaults and the echoed request fields, and send timestamps as Unix seconds.
+    Models are dumped directly, without the re-validation FastAPI applies to a
+    returned response_model. Bodies of at least min_bytes are compressed with
+    zstd (when zstandard is installed) or gzip.
+    """
+
+    def __init__(
+        self,
+        compression: bool = True,
+        min_bytes: int = 512,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        compact_drop: Sequence[str] = ("session_id",)
+    ):
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.compact_drop = tuple(compact_drop)
+        self.media_types = [MEDIA_JSON, MEDIA_COMPACT_JSON] + ([MEDIA_MSGPACK] if msgpack else [])
+        self.encodings = [
+            encoding for encoding in COMPRESSIONS
+            if compression and (encoding != "zstd" or zstandard is not None)
+        ]
+        # A ZstdCompressor must not be used by two threads at once, so each thread gets its own
+        self._local = threading.local()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseEncoder":
+        return cls(
+            compression=settings.response_compression_enabled,
+            min_bytes=settings.response_compression_min_bytes,
+            gzip_level=settings.response_gzip_level,
+            zstd_level=settings.response_zstd_level
+        )
+
+    def render(self, model: BaseModel, media_type: str = MEDIA_JSON) -> bytes:
+        if media_type == MEDIA_MSGPACK:
+            return msgpack.packb(compact_dict(model, self.compact_drop), default=_default)
+        if media_type == MEDIA_COMPACT_JSON:
+            data = compact_dict(model, self.compact_drop)
+            if orjson is not None:
+                return orjson.dumps(data)
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+        return model.model_dump_json().encode("utf-8")
+
+    def compress(self, body: bytes, encoding: Optional[str]) -> bytes:
+        if encoding == "zstd":
+            return self._zstd_compressor().compress(body)
+        if encoding == "gzip":
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        return body
+
+    def _zstd_compressor(self) -> "zstandard.ZstdCompressor":
+        compressor = getattr(self._local, "zstd", None)
+        if compressor is None:
+            compressor = self._local.zstd = zstandard.ZstdCompressor(level=self.zstd_level)
+        return compressor
+
+    def encode(
+        self,
+        model: BaseModel,
+        accept: Optional[str] = None,
+        accept_encoding: Optional[str] = None,
+        status_code: int = 200
+    ) -> Response:
+        media_type = negotiate_media_type(accept, self.media_types)
+        body = self.render(model, media_type)
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        encoding = negotiate_encoding(accept_encoding, self.encodings) if len(body) >= self.min_bytes else None
+        if encoding:
+            body = self.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
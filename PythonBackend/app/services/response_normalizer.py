@@ -0,0 +1,179 @@
+import re
+from typing import Dict, Optional
+
+QUOTES = "\"'"
+SECTION_MARKER = "Section"
+
+# Everything the cleanup changes inside an answer: escaped newlines and quotes, whitespace runs
+# and single newlines. Single spaces and other single whitespace characters are left alone.
+TOKEN_PATTERN = re.compile(r'\\[n"]|\s{2,}|\n')
+SPACES_PATTERN = re.compile(r' {2,}')
+# Whitespace and escaped newlines that the final strip removes at the start of an answer
+LEADING_BLANK_PATTERN = re.compile(r'(?:\s|\\n)*')
+TRAILER_PATTERN = re.compile(r'[\s"\']*')
+
+ESCAPES = {'\\n': ' ', '\\"': '"'}
+WHITESPACE_CACHE_SIZE = 1024
+
+_whitespace_cache: Dict[str, str] = {}
+
+
+def normalize_whitespace(run: str) -> str:
+    """
+    Normalize one maximal whitespace run: three or more newlines become a blank line,
+    a lone newline becomes a space and runs of spaces collapse to one.
+    """
+    cached = _whitespace_cache.get(run)
+    if cached is not None:
+        return cached
+
+    newlines = run.count('\n')
+    normalized = run
+    if newlines >= 3:
+        normalized = run[:run.index('\n')] + '\n\n' + run[run.rindex('\n') + 1:]
+    elif newlines and '\n\n' not in run:
+        normalized = run.replace('\n', ' ')
+    normalized = SPACES_PATTERN.sub(' ', normalized)
+
+    if len(_whitespace_cache) < WHITESPACE_CACHE_SIZE:
+        _whitespace_cache[run] = normalized
+    return normalized
+
+
+def _replace_token(match: "re.Match") -> str:
+    token = match.group()
+    return ESCAPES.get(token) or normalize_whitespace(token)
+
+
+def _normalize_body(text: str) -> str:
+    return TOKEN_PATTERN.sub(_replace_token, text)
+
+
+def section_reference_start(text: str) -> int:
+    """
+    Start of a trailing parenthesized reference mentioning a Section, e.g. "(see Section 4.2)",
+    or -1 if the text does not end with one.
+    """
+    close = text.rfind(')')
+    if close < 0 or text[close + 1:].strip():
+        return -1
+    opening = text.find('(', text.rfind(')', 0, close) + 1, close)
+    if opening < 0 or SECTION_MARKER not in text[opening + 1:close]:
+        return -1
+    return opening
+
+
+def _strip_trailer(text: str) -> str:
+    """Drop trailing whitespace, quotes and a trailing section reference."""
+    text = text.rstrip().rstrip(QUOTES)
+    cut = section_reference_start(text)
+    return text[:cut] if cut >= 0 else text
+
+
+def normalize_response(response: Optional[str]) -> Optional[str]:
+    """
+    Clean an LLM answer for display in a single pass over the text.
+
+    Joins wrapped lines, keeps paragraph breaks, collapses spaces, removes quotes around
+    the answer and a trailing "(... Section ...)" reference, and unescapes literal \\n and \\".
+    """
+    if not response:
+        return response
+
+    text = _strip_trailer(response.strip().lstrip(QUOTES))
+    return _normalize_body(text).strip()
+
+
+class ResponseNormalizer:
+    """
+    Incremental version of normalize_response for streamed answers.
+    Follows SRP - Only decides which part of the stream is final and can be emitted.
+
+    Text that can still change once more tokens arrive (trailing whitespace and quotes,
+    an open parenthesis that may turn out to be a section reference, a dangling backslash)
+    is held back, so the concatenated output of feed() and finish() always equals
+    normalize_response() of the whole answer.
+    """
+
+    _START, _QUOTES, _LEAD, _BODY = range(4)
+
+    def __init__(self):
+        self._state = self._START
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text and return the part of the answer that is now final."""
+        text = self._pending + chunk
+        if self._state != self._BODY:
+            text = self._skip_leading(text)
+            if self._state != self._BODY:
+                self._pending = text
+                return ""
+
+        hold = self._hold_from(text)
+        self._pending = text[hold:]
+        return _normalize_body(text[:hold])
+
+    def finish(self) -> str:
+        """Return the rest of the answer once the stream has ended."""
+        text, self._pending = self._pending, ""
+        if self._state == self._BODY or (self._state == self._LEAD and text):
+            self._state = self._START
+            return _normalize_body(_strip_trailer(text)).rstrip()
+        self._state = self._START
+        return ""
+
+    def _skip_leading(self, text: str) -> str:
+        """Drop what the final strip and the leading quote removal take off the start."""
+        if self._state == self._START:
+            text = text.lstrip()
+            if not text:
+                return text
+            self._state = self._QUOTES if text[0] in QUOTES else self._LEAD
+        if self._state == self._QUOTES:
+            text = text.lstrip(QUOTES)
+            if not text:
+                return text
+            self._state = self._LEAD
+        text = text[LEADING_BLANK_PATTERN.match(text).end():]
+        # A lone backslash may still become an escaped newline
+        if text and text != '\\':
+            self._state = self._BODY
+        return text
+
+    @staticmethod
+    def _hold_from(text: str) -> int:
+        """Index from which the text may still be changed by what follows it."""
+        hold = len(text)
+        # A dangling backslash may still become an escaped newline
+        if text.endswith('\\'):
+            hold -= 1
+        # Trailing whitespace, quotes and escaped newlines are stripped if the answer ends here
+        while hold > 0:
+            char = text[hold - 1]
+            if char.isspace() or char in QUOTES:
+                hold -= 1
+            elif char == 'n' and hold > 1 and text[hold - 2] == '\\':
+                hold -= 2
+            else:
+                break
+        # A backslash before them may still start an escaped quote
+        if hold > 0 and text[hold - 1] == '\\':
+            hold -= 1
+
+        # An open parenthesis after the last closed one may start a trailing section reference
+        close = text.rfind(')')
+        live = close >= 0 and TRAILER_PATTERN.fullmatch(text, close + 1) is not None
+        after = text.rfind(')', 0, close) + 1 if live else close + 1
+        opening = text.find('(', after)
+        if opening >= 0 and not (live and SECTION_MARKER not in text[opening + 1:close]):
+            # Whitespace in front of the reference goes with it
+            while opening > 0:
+                if text[opening - 1].isspace():
+                    opening -= 1
+                elif opening > 1 and text[opening - 2:opening] == '\\n':
+                    opening -= 2
+                else:
+                    break
+            hold = min(hold, opening)
+        return hold
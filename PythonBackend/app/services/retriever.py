@@ -0,0 +1,178 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain.schema import Document
+from app.config.settings import settings
+from app.services.document_processor import DocumentProcessor
+from app.services.embedding_batcher import EmbeddingBatcher
+
+# Version reported for the single, unversioned vector store at settings.vector_store_path
+LEGACY_INDEX_VERSION = "legacy"
+
+
+class PolicyRetriever:
+    """
+    Retrieves the policy chunks most relevant to a question, with their scores.
+    Follows SRP - Handles vector search only, generation lives in RAGService.
+    """
+
+    def __init__(
+        self,
+        document_processor: DocumentProcessor,
+        index_version: str = LEGACY_INDEX_VERSION,
+        embedding_batcher: Optional[EmbeddingBatcher] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.document_processor = document_processor
+        self.embedding_batcher = embedding_batcher
+        self.index_version = index_version
+        self.mode = settings.vector_index_mode
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=settings.decomposition_max_concurrency,
+            thread_name_prefix="retrieval"
+        )
+
+        # Load eagerly so the first request doesn't pay for it
+        self.document_processor.get_vector_store()
+        if self.mode != "chroma":
+            self.document_processor.get_vector_index()
+            self.document_processor.get_metadata_index()
+        if settings.parent_expansion_enabled:
+            self.document_processor.get_parent_store()
+
+    def embed_query(self, question: str) -> List[float]:
+        """Embed a question with the same model used for the documents."""
+        if self.embedding_batcher:
+            return self.embedding_batcher.embed_query(question)
+        return self.document_processor.embeddings.embed_query(question)
+
+    def embed_queries(self, questions: Sequence[str]) -> List[List[float]]:
+        """Embed several questions in one batched model call."""
+        if self.embedding_batcher:
+            return self.embedding_batcher.embed_queries(questions)
+        return self.document_processor.embeddings.embed_documents(list(questions))
+
+    def search(
+        self,
+        question: str,
+        k: Optional[int] = None,
+        filters: Optional[Dict[str, List[str]]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Return the top-k (document, cosine similarity) pairs for a question."""
+        return self.search_by_vector(self.embed_query(question), k, filters)
+
+    def search_by_vector(
+        self,
+        embedding: Sequence[float],
+        k: Optional[int] = None,
+        filters: Optional[Dict[str, List[str]]] = None,
+        adaptive: bool = False
+    ) -> List[Tuple[Document, float]]:
+        """
+        Return the top-k (document, cosine similarity) pairs for a query embedding.
+
+        Args:
+            embedding: Query embedding
+            k: Number of chunks, defaults to settings.retrieval_k
+            filters: Optional metadata filters (source, section, tag), resolved through
+                the inverted metadata index before any vector scoring
+            adaptive: Without an explicit k, fetch settings.retrieval_max_k candidates and
+                keep those above the largest score gap (when settings.adaptive_k_enabled)
+        """
+        if adaptive and k is None and settings.adaptive_k_enabled:
+            results = self.search_by_vector(embedding, settings.retrieval_max_k, filters)
+            keep = adaptive_k(
+                [score for _, score in results],
+                settings.retrieval_min_k,
+                settings.retrieval_max_k,
+                settings.adaptive_k_min_gap,
+                settings.retrieval_k
+            )
+            return results[:keep]
+
+        k = k or settings.retrieval_k
+
+        rows = None
+        if filters:
+            rows = self.document_processor.get_metadata_index().candidates(filters)
+            if rows is not None and not rows.size:
+                self.logger.info(f"No chunks match filters {filters}")
+                return []
+
+        if self.mode == "chroma" and rows is None:
+            vector_store = self.document_processor.get_vector_store()
+            results = vector_store.similarity_search_by_vector_with_relevance_scores(embedding, k=k)
+            # Chroma returns squared L2 distances; embeddings are unit length so this maps to cosine
+            return [(doc, 1.0 - distance / 2.0) for doc, distance in results]
+
+        index, documents = self.document_processor.get_vector_index()
+        return [(documents[row], score) for row, score in index.search(embedding, k, rows=rows)]
+
+    def context_passages(self, results: Sequence[Tuple[Document, float]]) -> List[str]:
+        """
+        Prompt context for search results: each chunk expanded to its parent section
+        (once per section) within settings.context_max_tokens, best results first.
+        """
+        chunks = [doc for doc, _ in results]
+        if not settings.parent_expansion_enabled:
+            return [doc.page_content for doc in chunks]
+        return self.document_processor.get_parent_store().expand(chunks, settings.context_max_tokens)
+
+    def search_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        k: Optional[int] = None,
+        filters: Optional[Dict[str, List[str]]] = None,
+        adaptive: bool = False
+    ) -> List[List[Tuple[Document, float]]]:
+        """Run one search per query embedding concurrently, results in input order."""
+        if len(embeddings) == 1:
+            return [self.search_by_vector(embeddings[0], k, filters, adaptive)]
+        try:
+            futures = [self._search_executor.submit(self.search_by_vector, e, k, filters, adaptive) for e in embeddings]
+        except RuntimeError:
+            # Closed by an index swap while this request was still using the retriever
+            return [self.search_by_vector(e, k, filters, adaptive) for e in embeddings]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Stop the search threads once the retriever is replaced or evicted; running searches finish."""
+        self._search_executor.shutdown(wait=False)
+
+
+def adaptive_k(scores: Sequence[float], min_k: int, max_k: int, min_gap: float, default_k: int) -> int:
+    """
+    Number of results to keep from scores sorted best first: cut at the largest drop
+    between consecutive scores if it is at least min_gap, otherwise keep default_k.
+
+    One dominant match keeps only that chunk; a flat score distribution keeps default_k.
+    """
+    count = min(len(scores), max_k)
+    if count <= min_k:
+        return count
+    gaps = [scores[i] - scores[i + 1] for i in range(min_k - 1, count - 1)]
+    largest = max(range(len(gaps)), key=gaps.__getitem__)
+    if gaps[largest] >= min_gap:
+        return min_k + largest
+    return min(default_k, count)
+
+
+def merge_results(
+    results_per_query: Sequence[Sequence[Tuple[Document, float]]],
+    max_chunks: int
+) -> List[Tuple[Document, float]]:
+    """
+    Merge per-sub-query results round-robin so every sub-query is represented,
+    dropping chunks already taken for an earlier sub-query.
+    """
+    merged: List[Tuple[Document, float]] = []
+    seen = set()
+    for rank in range(max((len(r) for r in results_per_query), default=0)):
+        for results in results_per_query:
+            if rank < len(results) and len(merged) < max_chunks:
+                doc, score = results[rank]
+                if doc.page_content not in seen:
+                    seen.add(doc.page_content)
+                    merged.append((doc, score))
+    return merged
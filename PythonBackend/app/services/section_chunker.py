@@ -0,0 +1,226 @@
+import re
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+# Numbered policy headings such as "4. Leave Policies" or "4.2 Sick Leave"
+HEADING_PATTERN = re.compile(r'^(?P<number>\d+(?:\.\d+)*)\.?[ \t]+(?P<title>\S[^\n]*?)[ \t]*$', re.MULTILINE)
+PARAGRAPH_PATTERN = re.compile(r'[^\n]*\S[^\n]*(?:\n[^\n]*\S[^\n]*)*')
+SENTENCE_PATTERN = re.compile(r'[^.!?]+(?:[.!?]+|$)')
+WORD_PATTERN = re.compile(r'\S+')
+# Rough word-piece approximation used when no tokenizer is available
+APPROX_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+MAX_HEADING_LENGTH = 80
+SECTION_PATH_SEPARATOR = " > "
+
+TokenCounter = Callable[[str], int]
+
+@dataclass(frozen=True)
+class ChunkSpan:
+    """A chunk expressed as offsets into its source text instead of a copy of it."""
+    start: int
+    end: int
+    section_path: Tuple[str, ...]
+    token_count: int
+    
+    def text(self, source: str) -> str:
+        """Slice the chunk text out of the source document."""
+        return source[self.start:self.end]
+        
+    @property
+    def section(self) -> str:
+        """Joined heading hierarchy, suitable for scalar metadata stores."""
+        return SECTION_PATH_SEPARATOR.join(self.section_path)
+
+@dataclass(frozen=True)
+class _Unit:
+    start: int
+    end: int
+    tokens: int
+    section_path: Tuple[str, ...]
+    is_heading: bool
+
+def approximate_token_count(text: str) -> int:
+    """Approximate the word-piece token count of a text."""
+    return len(APPROX_TOKEN_PATTERN.findall(text))
+
+def build_token_counter(model_name: str) -> TokenCounter:
+    """
+    Build a token counter for the embedding model's tokenizer.
+    Falls back to a regex approximation when transformers is unavailable.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        from transformers import AutoTokenizer
+        
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        tokenizer = AutoTokenizer.from_pretrained(repo_id)
+        
+        def count_tokens(text: str) -> int:
+            return len(tokenizer.encode(text, add_special_tokens=False))
+            
+        return count_tokens
+    except Exception as e:
+        logger.warning(f"Tokenizer for {model_name} unavailable, approximating token counts: {str(e)}")
+        return approximate_token_count
+
+def find_headings(text: str) -> List[Tuple[int, int, str, str]]:
+    """Return (start, end, number, heading) for every numbered heading in the text."""
+    headings = []
+    for match in HEADING_PATTERN.finditer(text):
+        title = match.group('title')
+        if len(title) > MAX_HEADING_LENGTH or title.endswith('.'):
+            continue
+        headings.append((match.start(), match.end(), match.group('number'), match.group(0).strip()))
+    return headings
+
+def section_path_at(text: str, offset: int) -> Tuple[str, ...]:
+    """Heading hierarchy in effect at a character offset of the text."""
+    stack: List[Tuple[int, str]] = []
+    for start, _, number, heading in find_headings(text):
+        if start > offset:
+            break
+        depth = number.count('.') + 1
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        stack.append((depth, heading))
+    return tuple(heading for _, heading in stack)
+
+class SectionChunker:
+    """
+    Splits policy documents along their numbered heading hierarchy.
+    Follows SRP - Only computes chunk spans, building Documents stays in DocumentProcessor.
+    
+    Chunks never cross a section boundary, are packed up to a token budget
+    and are returned as offsets so the source text is never duplicated.
+    """
+    
+    def __init__(
+        self,
+        max_tokens: int = 128,
+        overlap_tokens: int = 16,
+        token_counter: Optional[TokenCounter] = None
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be in [0, max_tokens)")
+            
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens = token_counter or approximate_token_count
+        
+    def split_text(self, text: str) -> List[ChunkSpan]:
+        """Split a document into section-aware chunk spans."""
+        return self._pack(self._units(text))
+        
+    def _units(self, text: str) -> List[_Unit]:
+        """Break the text into heading, paragraph, sentence or word-window units."""
+        units: List[_Unit] = []
+        headings = find_headings(text)
+        boundaries = [start for start, _, _, _ in headings] + [len(text)]
+        
+        # Preamble before the first heading (e.g. the document title)
+        self._body_units(text, 0, boundaries[0], (), units)
+        
+        stack: List[Tuple[int, str]] = []
+        for index, (start, end, number, heading) in enumerate(headings):
+            depth = number.count('.') + 1
+            while stack and stack[-1][0] >= depth:
+                stack.pop()
+            stack.append((depth, heading))
+            path = tuple(title for _, title in stack)
+            
+            units.append(_Unit(start, end, self.count_tokens(heading), path, True))
+            self._body_units(text, end, boundaries[index + 1], path, units)
+            
+        return units
+        
+    def _body_units(self, text: str, start: int, end: int, path: Tuple[str, ...], units: List[_Unit]):
+        for paragraph in PARAGRAPH_PATTERN.finditer(text, start, end):
+            self._fit_units(text, paragraph.start(), paragraph.end(), path, units, level=0)
+            
+    def _fit_units(self, text: str, start: int, end: int, path: Tuple[str, ...], units: List[_Unit], level: int):
+        """Emit a unit for the span, descending to sentences then words if it is over budget."""
+        span = text[start:end].strip()
+        if not span:
+            return
+        # Trim surrounding whitespace so offsets point at real content
+        start = text.index(span[0], start)
+        end = start + len(span)
+        
+        tokens = self.count_tokens(span)
+        if tokens <= self.max_tokens:
+            units.append(_Unit(start, end, tokens, path, False))
+            return
+            
+        if level == 0:
+            pieces = [(m.start(), m.end()) for m in SENTENCE_PATTERN.finditer(text, start, end)]
+            if len(pieces) > 1:
+                for piece_start, piece_end in pieces:
+                    self._fit_units(text, piece_start, piece_end, path, units, level=1)
+                return
+                
+        # Last resort: fixed windows of words
+        words = [(m.start(), m.end()) for m in WORD_PATTERN.finditer(text, start, end)]
+        window_start = 0
+        while window_start < len(words):
+            window_end = window_start
+            window_tokens = 0
+            while window_end < len(words):
+                word_tokens = self.count_tokens(text[words[window_end][0]:words[window_end][1]])
+                if window_end > window_start and window_tokens + word_tokens > self.max_tokens:
+                    break
+                window_tokens += word_tokens
+                window_end += 1
+            units.append(_Unit(words[window_start][0], words[window_end - 1][1], window_tokens, path, False))
+            window_start = window_end
+            
+    def _pack(self, units: List[_Unit]) -> List[ChunkSpan]:
+        """Greedily pack units into chunks, restarting at every heading."""
+        chunks: List[ChunkSpan] = []
+        current: List[_Unit] = []
+        current_tokens = 0
+        
+        def flush():
+            chunks.append(ChunkSpan(
+                start=current[0].start,
+                end=current[-1].end,
+                section_path=current[-1].section_path,
+                token_count=current_tokens
+            ))
+            
+        for unit in units:
+            has_body = any(not u.is_heading for u in current)
+            starts_section = unit.is_heading and has_body
+            over_budget = has_body and current_tokens + unit.tokens > self.max_tokens
+            
+            if current and (starts_section or over_budget):
+                flush()
+                if starts_section:
+                    current, current_tokens = [], 0
+                else:
+                    current = self._overlap(current)
+                    current_tokens = sum(u.tokens for u in current)
+                    # Drop overlap that would itself push the next chunk over budget
+                    while current and current_tokens + unit.tokens > self.max_tokens:
+                        current_tokens -= current.pop(0).tokens
+                        
+            current.append(unit)
+            current_tokens += unit.tokens
+            
+        if current:
+            flush()
+        return chunks
+        
+    def _overlap(self, units: List[_Unit]) -> List[_Unit]:
+        """Trailing body units of a chunk that fit in the overlap budget."""
+        overlap: List[_Unit] = []
+        tokens = 0
+        for unit in reversed(units[1:]):
+            if unit.is_heading or tokens + unit.tokens > self.overlap_tokens:
+                break
+            overlap.insert(0, unit)
+            tokens += unit.tokens
+        return overlap
@@ -0,0 +1,280 @@
+import os
+import re
+import json
+import time
+import queue
+import logging
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from app.config.settings import settings
+
+TRACEPARENT_HEADER = "traceparent"
+CORRELATION_HEADER = "X-Correlation-ID"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# W3C trace context: version-traceid-parentid-flags
+TRACEPARENT_PATTERN = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+SERVER_TIMING_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_-]')
+EXPORTERS = ("none", "jsonl", "otlp")
+
+
+@dataclass
+class Span:
+    """A timed stage of a request."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes
+        }
+
+
+@dataclass
+class Trace:
+    """The span tree of one request."""
+    trace_id: str
+    correlation_id: str
+    root: Span
+    spans: List[Span] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, span: Span):
+        # Spans may be recorded from worker threads, e.g. parallel sub-answers
+        with self._lock:
+            self.spans.append(span)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.root.span_id}-01"
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: total duration per top-level stage, plus the whole request."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span.parent_id == self.root.span_id and span.end_ns is not None:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        entries = [f"{SERVER_TIMING_NAME_PATTERN.sub('_', name)};dur={ms:.2f}" for name, ms in totals.items()]
+        entries.append(f"total;dur={self.root.duration_ms:.2f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_id(num_bytes: int) -> str:
+    return secrets.token_hex(num_bytes)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """(trace_id, parent_span_id) from a W3C traceparent header, or None if absent or invalid."""
+    if not header:
+        return None
+    match = TRACEPARENT_PATTERN.match(header.strip().lower())
+    if not match or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return match.group(1), match.group(2)
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the request being handled in this context, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a stage as a child of the current span.
+    Does nothing (and yields None) outside a traced request.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get() or trace.root
+    child = Span(name=name, trace_id=trace.trace_id, span_id=_new_id(8), parent_id=parent.span_id, attributes=attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception as e:
+        child.attributes["error"] = str(e)
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.add(child)
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per span to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, trace: Trace):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for item in [trace.root] + trace.spans:
+                record = item.to_dict()
+                record["correlation_id"] = trace.correlation_id
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+class OtlpHttpExporter:
+    """Sends spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding."""
+
+    def __init__(self, endpoint: str, service_name: str):
+        import httpx
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=5.0)
+
+    @staticmethod
+    def _attribute(key: str, value) -> dict:
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        return {"key": key, "value": typed}
+
+    def _otlp_span(self, item: Span, trace: Trace) -> dict:
+        attributes = dict(item.attributes, correlation_id=trace.correlation_id)
+        otlp = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            # SPAN_KIND_SERVER for the request, SPAN_KIND_INTERNAL for its stages
+            "kind": 2 if item is trace.root else 1,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns or time.time_ns()),
+            "attributes": [self._attribute(k, v) for k, v in attributes.items()],
+            "status": {"code": 2 if "error" in item.attributes else 1}
+        }
+        if item.parent_id:
+            otlp["parentSpanId"] = item.parent_id
+        return otlp
+
+    def export(self, trace: Trace):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self._otlp_span(item, trace) for item in [trace.root] + trace.spans]
+                }]
+            }]
+        }
+        response = self._client.post(self.endpoint, json=payload)
+        response.raise_for_status()
+
+
+class Tracer:
+    """
+    Records a span tree per request and hands finished traces to an exporter.
+    Follows SRP - Only collects and ships timings, the stages are timed where they run.
+
+    Export happens on a background thread so a slow collector never delays a response;
+    when the queue is full, traces are dropped rather than buffered without bound.
+    """
+
+    def __init__(self, exporter=None, max_queue: int = 1000):
+        self.logger = logging.getLogger(__name__)
+        self.exporter = exporter
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        """Tracer with the exporter chosen by settings.trace_exporter."""
+        if settings.trace_exporter not in EXPORTERS:
+            raise ValueError(f"Unknown trace exporter {settings.trace_exporter!r}, expected one of {EXPORTERS}")
+        exporter = None
+        if settings.trace_exporter == "jsonl":
+            exporter = JsonLinesExporter(settings.trace_jsonl_path)
+        elif settings.trace_exporter == "otlp":
+            exporter = OtlpHttpExporter(settings.trace_otlp_endpoint, settings.trace_service_name)
+        return cls(exporter)
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        **attributes
+    ) -> Iterator[Trace]:
+        """Open the root span of a request, continuing the caller's trace if it sent one."""
+        parent = parse_traceparent(traceparent)
+        trace_id, parent_id = parent if parent else (_new_id(16), None)
+        root = Span(name=name, trace_id=trace_id, span_id=_new_id(8), parent_id=parent_id, attributes=attributes)
+        trace = Trace(trace_id=trace_id, correlation_id=correlation_id or trace_id, root=root)
+
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+        try:
+            yield trace
+        finally:
+            root.end_ns = time.time_ns()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            self._export(trace)
+
+    def _export(self, trace: Trace):
+        if self.exporter is None:
+            return
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._worker.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            trace = self._queue.get()
+            if trace is None:
+                return
+            try:
+                self.exporter.export(trace)
+            except Exception as e:
+                self.logger.warning(f"Failed to export trace {trace.trace_id}: {str(e)}")
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush queued traces and stop the export thread."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
@@ -0,0 +1,160 @@
+import os
+import json
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+INDEX_MODES = ("float32", "int8", "binary")
+SCAN_BLOCK_ROWS = 8192
+
+# Number of set bits for every byte value, used for Hamming distance on packed codes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class VectorIndex:
+    """
+    Compact array-backed vector index with optional scalar or binary quantization.
+    Searches scan the quantized codes first, then re-score the best candidates
+    exactly against float32 vectors which can stay memory-mapped on disk.
+    """
+
+    def __init__(self, mode: str = "int8", rescore_factor: int = 4):
+        if mode not in INDEX_MODES:
+            raise ValueError(f"Unknown vector index mode: {mode}. Expected one of {INDEX_MODES}")
+        self.logger = logging.getLogger(__name__)
+        self.mode = mode
+        self.rescore_factor = max(1, rescore_factor)
+        self.vectors: Optional[np.ndarray] = None  # float32, unit length, possibly memory-mapped
+        self.codes: Optional[np.ndarray] = None  # int8 or packed bits
+        self.scales: Optional[np.ndarray] = None  # per-dimension int8 scales
+        self.ids: List[str] = []  # external ids of the rows, e.g. vector store ids
+
+    def __len__(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[0]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def build(self, vectors, ids: Optional[List[str]] = None) -> "VectorIndex":
+        """Build the index from a (rows, dim) matrix of embeddings."""
+        self.ids = list(ids) if ids is not None else []
+        self.vectors = np.ascontiguousarray(self._normalize(vectors))
+        self.codes = None
+        self.scales = None
+
+        if self.mode == "int8":
+            scales = np.abs(self.vectors).max(axis=0) / 127.0
+            scales[scales == 0] = 1.0
+            self.scales = scales.astype(np.float32)
+            self.codes = np.clip(np.rint(self.vectors / self.scales), -127, 127).astype(np.int8)
+        elif self.mode == "binary":
+            self.codes = np.packbits(self.vectors > 0, axis=1)
+
+        self.logger.info(f"Built {self.mode} vector index with {len(self)} vectors")
+        return self
+
+    def _scan(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """First stage: approximate scores for every (candidate) row, higher is better."""
+        source = self.vectors if self.mode == "float32" else self.codes
+        if rows is not None:
+            source = source[rows]
+
+        if self.mode == "binary":
+            query_bits = np.packbits(query > 0)
+            scores = np.empty(source.shape[0], dtype=np.float32)
+            for start in range(0, source.shape[0], SCAN_BLOCK_ROWS):
+                block = np.bitwise_xor(source[start:start + SCAN_BLOCK_ROWS], query_bits)
+                scores[start:start + block.shape[0]] = -_POPCOUNT[block].sum(axis=1, dtype=np.int32)
+            return scores
+
+        if self.mode == "int8":
+            # Fold the dequantization scales into the query so codes are used as-is
+            scaled_query = query * self.scales
+            scores = np.empty(source.shape[0], dtype=np.float32)
+            for start in range(0, source.shape[0], SCAN_BLOCK_ROWS):
+                block = source[start:start + SCAN_BLOCK_ROWS].astype(np.float32)
+                scores[start:start + block.shape[0]] = block @ scaled_query
+            return scores
+
+        return source @ query
+
+    def search(self, query, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Return the top-k (row, cosine similarity) pairs for a query vector.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            rows: Optional subset of row ids to restrict the search to
+        """
+        if not len(self) or k <= 0:
+            return []
+
+        query = self._normalize(query)
+        scores = self._scan(query, rows)
+        candidate_rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        if not candidate_rows.size:
+            return []
+
+        # Stage one: shortlist from the (cheap) quantized scores
+        shortlist_size = min(candidate_rows.size, k if self.mode == "float32" else k * self.rescore_factor)
+        if shortlist_size < candidate_rows.size:
+            shortlist = np.argpartition(-scores, shortlist_size - 1)[:shortlist_size]
+        else:
+            shortlist = np.arange(candidate_rows.size)
+
+        # Stage two: exact float32 re-scoring of the shortlist
+        if self.mode == "float32":
+            shortlist_rows = candidate_rows[shortlist]
+            exact = scores[shortlist]
+        else:
+            # Sorted rows keep reads from memory-mapped vectors sequential
+            shortlist_rows = np.sort(candidate_rows[shortlist])
+            exact = np.asarray(self.vectors[shortlist_rows] @ query)
+
+        order = np.argsort(-exact)[:k]
+        return [(int(shortlist_rows[i]), float(exact[i])) for i in order]
+
+    def memory_bytes(self) -> dict:
+        """Bytes held by the scan codes and by the float32 re-scoring vectors."""
+        codes_bytes = 0 if self.codes is None else self.codes.nbytes
+        scales_bytes = 0 if self.scales is None else self.scales.nbytes
+        vectors_bytes = 0 if self.vectors is None else self.vectors.nbytes
+        return {
+            "mode": self.mode,
+            "scan_bytes": vectors_bytes if self.mode == "float32" else codes_bytes + scales_bytes,
+            "float32_bytes": vectors_bytes,
+            "float32_memory_mapped": isinstance(self.vectors, np.memmap)
+        }
+
+    def save(self, path: str):
+        """Persist the index so the float32 vectors can be memory-mapped on load."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), self.vectors)
+        if self.codes is not None:
+            np.save(os.path.join(path, "codes.npy"), self.codes)
+        if self.scales is not None:
+            np.save(os.path.join(path, "scales.npy"), self.scales)
+        with open(os.path.join(path, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"mode": self.mode, "count": len(self), "ids": self.ids}, f)
+
+    @classmethod
+    def load(cls, path: str, rescore_factor: int = 4) -> "VectorIndex":
+        """Load a saved index, memory-mapping the float32 vectors."""
+        with open(os.path.join(path, "index.json"), encoding="utf-8") as f:
+            info = json.load(f)
+
+        index = cls(mode=info["mode"], rescore_factor=rescore_factor)
+        index.ids = info.get("ids", [])
+        mmap_mode = None if index.mode == "float32" else "r"
+        index.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode=mmap_mode)
+        if index.mode != "float32":
+            index.codes = np.load(os.path.join(path, "codes.npy"))
+        if index.mode == "int8":
+            index.scales = np.load(os.path.join(path, "scales.npy"))
+        return index
@@ -0,0 +1,101 @@
+"""
+Benchmark for document chunking strategies.
+Compares the section-aware chunker against the recursive character splitter
+on chunking throughput and retrieval hit rate over the HR policy documents.
+
+Usage (from PythonBackend/): python -m benchmarks.bench_chunking
+"""
+
+import time
+from typing import Callable, List
+
+import numpy as np
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from app.config.settings import settings
+from app.services.document_processor import DocumentProcessor
+from app.services.section_chunker import SectionChunker, build_token_counter
+
+ITERATIONS = 200
+TOP_K = 3
+
+# (question, phrase that must appear in a retrieved chunk)
+HIT_RATE_QUESTIONS = [
+    ("How many days of annual leave do employees get?", "21 days of paid annual leave"),
+    ("How much paid sick leave is allowed?", "capped at 30 days per year"),
+    ("What are the maternity leave rules?", "90 days of paid maternity leave"),
+    ("When are salaries paid?", "25th of each month"),
+    ("Does the company provide health insurance for dependents?", "extend their coverage to dependents"),
+    ("What happens if I harass a colleague?", "zero-tolerance policy toward harassment"),
+    ("How much notice do I need to give when resigning?", "written notice at least 30 days"),
+    ("Is overtime paid?", "compensated for overtime"),
+    ("What are the standard working hours?", "from 9:00 AM to 5:00 PM"),
+    ("How is employee personal data protected?", "handle sensitive data responsibly"),
+]
+
+
+def time_splitter(name: str, split: Callable[[List[Document]], List[Document]], documents: List[Document]) -> List[Document]:
+    """Time repeated splitting of the corpus and print throughput."""
+    total_chars = sum(len(doc.page_content) for doc in documents)
+    chunks = split(documents)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        split(documents)
+    elapsed = time.perf_counter() - start
+
+    mb_per_second = (total_chars * ITERATIONS) / elapsed / 1_000_000
+    print(f"{name:<12} chunks={len(chunks):>4}  {elapsed / ITERATIONS * 1000:8.3f} ms/corpus  {mb_per_second:8.2f} MB/s")
+    return chunks
+
+
+def hit_rate(chunks: List[Document], embeddings: HuggingFaceEmbeddings) -> float:
+    """Fraction of questions whose expected phrase appears in the top-k chunks."""
+    chunk_vectors = np.asarray(embeddings.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+    chunk_vectors /= np.linalg.norm(chunk_vectors, axis=1, keepdims=True)
+
+    hits = 0
+    for question, expected in HIT_RATE_QUESTIONS:
+        query = np.asarray(embeddings.embed_query(question), dtype=np.float32)
+        scores = chunk_vectors @ (query / np.linalg.norm(query))
+        top = np.argsort(-scores)[:TOP_K]
+        if any(expected in chunks[i].page_content for i in top):
+            hits += 1
+    return hits / len(HIT_RATE_QUESTIONS)
+
+
+def main():
+    """Run the chunking benchmark."""
+    print("Chunking Benchmark")
+    print("=" * 50)
+
+    processor = DocumentProcessor()
+    documents = processor.load_documents(settings.docs_directory)
+
+    recursive = RecursiveCharacterTextSplitter(
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""]
+    )
+    processor.section_chunker = SectionChunker(
+        max_tokens=settings.chunk_max_tokens,
+        overlap_tokens=settings.chunk_overlap_tokens,
+        token_counter=build_token_counter(settings.embedding_model)
+    )
+
+    print("Throughput:")
+    recursive_chunks = time_splitter("recursive", recursive.split_documents, documents)
+    section_chunks = time_splitter("section", processor._split_by_section, documents)
+
+    print(f"\nRetrieval hit rate @{TOP_K}:")
+    embeddings = HuggingFaceEmbeddings(model_name=settings.embedding_model, model_kwargs={'device': 'cpu'})
+    print(f"recursive    {hit_rate(recursive_chunks, embeddings):.2%}")
+    print(f"section      {hit_rate(section_chunks, embeddings):.2%}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
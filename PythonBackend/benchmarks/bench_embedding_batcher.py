@@ -0,0 +1,87 @@
+"""
+Benchmark for micro-batching of query embeddings.
+Concurrent clients embed questions either directly (one model call per
+question) or through the EmbeddingBatcher, for several wait windows, and
+report queries/second and per-query latency percentiles.
+
+Usage (from PythonBackend/): python -m benchmarks.bench_embedding_batcher [concurrency]
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.config.settings import settings
+from app.services.embedding_backends import create_embeddings
+from app.services.embedding_batcher import EmbeddingBatcher
+
+DEFAULT_CONCURRENCY = 16
+QUERIES_PER_CLIENT = 50
+WAIT_WINDOWS_MS = (1.0, 2.0, 5.0)
+QUESTIONS = [
+    "How many days of annual leave do employees get?",
+    "How much paid sick leave is allowed?",
+    "What are the maternity leave rules?",
+    "When are salaries paid?",
+    "Does the company provide health insurance for dependents?",
+    "How much notice do I need to give when resigning?",
+    "Is overtime paid?",
+    "What are the standard working hours?",
+]
+
+
+def run_clients(embed, concurrency: int):
+    """Closed loop: every client embeds its questions back to back. Returns (QPS, latencies in ms)."""
+    latencies = []
+    lock = threading.Lock()
+
+    def client(offset: int):
+        own = []
+        for i in range(QUERIES_PER_CLIENT):
+            start = time.perf_counter()
+            embed(QUESTIONS[(offset + i) % len(QUESTIONS)])
+            own.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(own)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, np.asarray(latencies)
+
+
+def report(label: str, qps: float, latencies, extra: str = ""):
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{label:<14} {qps:>8.1f} {p50:>8.2f} {p99:>8.2f} {extra}")
+
+
+def main():
+    """Run the query embedding batching benchmark."""
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CONCURRENCY
+    embeddings = create_embeddings()
+    embeddings.embed_query("warm up")
+
+    print("Query Embedding Batching Benchmark")
+    print("=" * 50)
+    print(f"Backend {settings.embedding_backend}, {concurrency} concurrent clients x {QUERIES_PER_CLIENT} queries\n")
+    print(f"{'mode':<14} {'QPS':>8} {'p50 ms':>8} {'p99 ms':>8} mean batch")
+
+    for label, concurrent in (("direct, 1", 1), (f"direct, {concurrency}", concurrency)):
+        qps, latencies = run_clients(embeddings.embed_query, concurrent)
+        report(label, qps, latencies)
+
+    for wait_ms in WAIT_WINDOWS_MS:
+        batcher = EmbeddingBatcher(embeddings, max_batch_size=settings.embedding_batch_max_size, max_wait_ms=wait_ms)
+        qps, latencies = run_clients(batcher.embed_query, concurrency)
+        report(f"batched {wait_ms:g}ms", qps, latencies, str(batcher.stats()["mean_batch_size"]))
+        batcher.close()
+
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark for the embedding backends.
+Every backend runs in a fresh subprocess so startup time and RSS are not
+skewed by models loaded earlier. Reports startup time (imports + model load),
+RSS after loading, single-query QPS, batch throughput over the policy chunks,
+and the cosine agreement of each backend's vectors with the torch backend.
+
+Usage (from PythonBackend/): python -m benchmarks.bench_embeddings [threads]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+QUERY_COUNT = 200
+QUERIES = [
+    "How many days of annual leave do employees get?",
+    "What are the maternity leave rules?",
+    "How much notice do I need to give when resigning?",
+    "Is overtime paid?",
+]
+
+
+def load_texts():
+    """Paragraphs of the HR policy documents."""
+    texts = []
+    docs = os.path.join(os.path.dirname(__file__), "..", "docs")
+    for name in sorted(os.listdir(docs)):
+        with open(os.path.join(docs, name), encoding="utf-8") as f:
+            texts.extend(p.strip() for p in f.read().split("\n\n") if p.strip())
+    return texts
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def worker(backend: str, vectors_path: str):
+    """Measure one backend in this process and print the results as JSON."""
+    started = time.perf_counter()
+    from app.services.embedding_backends import create_embeddings
+
+    embeddings = create_embeddings(backend)
+    embeddings.embed_query("warm up")
+    startup = time.perf_counter() - started
+    rss = rss_mb()
+
+    start = time.perf_counter()
+    for i in range(QUERY_COUNT):
+        embeddings.embed_query(QUERIES[i % len(QUERIES)])
+    qps = QUERY_COUNT / (time.perf_counter() - start)
+
+    texts = load_texts()
+    start = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    batch = len(texts) / (time.perf_counter() - start)
+    np.save(vectors_path, vectors)
+
+    print(json.dumps({"startup_s": startup, "rss_mb": rss, "qps": qps, "docs_per_s": batch}))
+
+
+def run_backend(backend: str, threads: str, vectors_path: str):
+    env = dict(os.environ, EMBEDDING_THREADS=threads)
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_embeddings", "--worker", backend, vectors_path],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    return json.loads(result.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    """Run the embedding backend benchmark."""
+    threads = sys.argv[1] if len(sys.argv) > 1 else "0"
+
+    print("Embedding Backend Benchmark")
+    print("=" * 50)
+    print(f"{len(load_texts())} policy paragraphs, {QUERY_COUNT} single queries, threads={threads or 'default'}\n")
+    print(f"{'backend':<10} {'startup s':>9} {'RSS MB':>8} {'QPS':>8} {'docs/s':>8} {'min cos':>8} {'mean cos':>9}")
+
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in BACKENDS:
+            vectors_path = os.path.join(tmp, f"{backend}.npy")
+            stats, error = run_backend(backend, threads, vectors_path)
+            if error:
+                print(f"{backend:<10} skipped: {error}")
+                continue
+
+            vectors = np.load(vectors_path)
+            if reference is None:
+                reference = vectors
+            cosines = (reference * vectors).sum(axis=1) / (
+                np.linalg.norm(reference, axis=1) * np.linalg.norm(vectors, axis=1)
+            )
+            print(
+                f"{backend:<10} {stats['startup_s']:>9.2f} {stats['rss_mb']:>8.0f} {stats['qps']:>8.1f} "
+                f"{stats['docs_per_s']:>8.1f} {cosines.min():>8.4f} {cosines.mean():>9.4f}"
+            )
+
+    print("\nCosine columns compare against the first backend that ran (torch when installed).")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,332 @@
+"""
+Load and soak test for the chat backend.
+Drives POST /chat at a fixed concurrency (closed loop) or a target request rate
+(open loop, Poisson arrivals) and reports, per interval and for the whole run,
+throughput, latency percentiles, error and degraded rates and the backend's
+resident memory, including its growth rate over the run to catch leaks.
+
+In open-loop mode latency is measured from the scheduled send time, so time
+spent queued behind a saturated backend is counted instead of hidden.
+
+With --spawn the harness starts a fake Ollama server (benchmarks.fake_ollama)
+and a backend instance pointed at it, so the numbers measure the backend itself.
+
+Usage (from PythonBackend/):
+    python -m benchmarks.bench_load --spawn --concurrency 16 --duration 120
+    python -m benchmarks.bench_load --spawn --rps 10 --duration 3600 --interval 60 --first-token-ms 500
+    python -m benchmarks.bench_load --url http://localhost:8000 --rps 5 --pid <backend pid>
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import httpx
+import numpy as np
+
+QUESTIONS = [
+    "How many days of annual leave do employees get?",
+    "How much paid sick leave is allowed?",
+    "What are the maternity leave rules?",
+    "When are salaries paid?",
+    "Does the company provide health insurance for dependents?",
+    "What happens if I harass a colleague?",
+    "How much notice do I need to give when resigning?",
+    "Is overtime paid?",
+    "What are the standard working hours?",
+    "What are the sick leave and maternity leave rules?",
+    "Can I work from home?",
+    "What is the dress code?",
+]
+
+PERCENTILES = (50, 90, 99)
+STARTUP_TIMEOUT_SECONDS = 600
+
+
+@dataclass
+class Window:
+    """Results collected over one reporting interval (or the whole run)."""
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    degraded: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    def record(self, latency: float, error: Optional[str], degraded: bool):
+        if error:
+            self.errors[error] += 1
+        else:
+            self.latencies.append(latency)
+            self.degraded += degraded
+
+    def merge(self, other: "Window"):
+        self.latencies.extend(other.latencies)
+        self.errors.update(other.errors)
+        self.degraded += other.degraded
+
+
+def read_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """Resident set size of a process in MB, from /proc or psutil when available."""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / 1e6
+    except Exception:
+        return None
+
+
+def growth_mb_per_hour(samples: List[tuple]) -> Optional[float]:
+    """Least-squares slope of (seconds, MB) samples, in MB per hour."""
+    if len(samples) < 3:
+        return None
+    seconds, mb = np.array(samples, dtype=np.float64).T
+    if seconds[-1] - seconds[0] <= 0:
+        return None
+    return float(np.polyfit(seconds, mb, 1)[0] * 3600)
+
+
+class LoadTest:
+    """
+    Sends chat requests and aggregates the results per interval.
+    Follows SRP - Only generates load and measures, the processes under test are started elsewhere.
+    """
+
+    def __init__(self, url: str, pid: Optional[int], timeout: float, max_in_flight: int):
+        self.url = url.rstrip("/") + "/chat"
+        self.pid = pid
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.window = Window()
+        self.total = Window()
+        self.in_flight = 0
+        self.rss_samples: List[tuple] = []
+        self.started = time.monotonic()
+
+    async def send(self, client: httpx.AsyncClient, scheduled: float):
+        """Send one chat request; latency counts from the time it was scheduled."""
+        self.in_flight += 1
+        error, degraded = None, False
+        payload = {"question": random.choice(QUESTIONS), "session_id": str(uuid.uuid4())}
+        try:
+            response = await client.post(self.url, json=payload, timeout=self.timeout)
+            if response.status_code != 200:
+                error = f"http_{response.status_code}"
+            else:
+                degraded = bool(response.json().get("degraded"))
+        except httpx.TimeoutException:
+            error = "timeout"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        self.window.record(time.monotonic() - scheduled, error, degraded)
+
+    async def closed_loop(self, client: httpx.AsyncClient, concurrency: int, deadline: float):
+        """Each of `concurrency` users sends its next request as soon as the previous one returns."""
+        async def user():
+            while time.monotonic() < deadline:
+                await self.send(client, time.monotonic())
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    async def open_loop(self, client: httpx.AsyncClient, rps: float, deadline: float):
+        """Poisson arrivals at `rps`, independent of how fast the backend answers."""
+        tasks = set()
+        next_at = time.monotonic()
+        while next_at < deadline:
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.in_flight >= self.max_in_flight:
+                # The backend is not keeping up; count it instead of growing the client's queue forever
+                self.window.record(0.0, "client_overload", False)
+            else:
+                task = asyncio.create_task(self.send(client, next_at))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            next_at += random.expovariate(rps)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def report(self):
+        """Print the current interval and start a new one."""
+        window, self.window = self.window, Window()
+        self.total.merge(window)
+        now = time.monotonic()
+        elapsed = now - window.started
+        rss = read_rss_mb(self.pid)
+        if rss is not None:
+            self.rss_samples.append((now - self.started, rss))
+        print(self._row(f"{now - self.started:>7.0f}s", window, elapsed, rss))
+
+    def _row(self, label: str, window: Window, elapsed: float, rss: Optional[float]) -> str:
+        latencies = np.array(window.latencies) * 1000
+        percentiles = np.percentile(latencies, PERCENTILES) if latencies.size else [float("nan")] * len(PERCENTILES)
+        total = window.requests
+        errors = sum(window.errors.values())
+        return (
+            f"{label:>8} {total:>7} {len(window.latencies) / max(elapsed, 1e-9):>7.2f} "
+            + " ".join(f"{p:>8.0f}" for p in percentiles)
+            + f" {latencies.max() if latencies.size else float('nan'):>8.0f}"
+            + f" {errors / total if total else 0:>7.2%} {window.degraded / total if total else 0:>7.2%}"
+            + (f" {rss:>8.1f}" if rss is not None else f" {'-':>8}")
+            + f" {self.in_flight:>6}"
+        )
+
+    def header(self) -> str:
+        return (
+            f"{'time':>8} {'reqs':>7} {'ok/s':>7} "
+            + " ".join(f"{f'p{p} ms':>8}" for p in PERCENTILES)
+            + f" {'max ms':>8} {'errors':>7} {'degr.':>7} {'RSS MB':>8} {'queue':>6}"
+        )
+
+    def summary(self, elapsed: float):
+        print("-" * len(self.header()))
+        print(self._row("total", self.total, elapsed, read_rss_mb(self.pid)))
+        if self.total.errors:
+            print("Errors: " + ", ".join(f"{name}={count}" for name, count in self.total.errors.most_common()))
+        if self.rss_samples:
+            growth = growth_mb_per_hour(self.rss_samples)
+            first, last = self.rss_samples[0][1], self.rss_samples[-1][1]
+            print(f"Backend RSS: {first:.1f} MB -> {last:.1f} MB"
+                  + (f", trend {growth:+.1f} MB/hour" if growth is not None else ""))
+
+
+async def run(args: argparse.Namespace, url: str, pid: Optional[int]):
+    load = LoadTest(url, pid, args.timeout, args.max_in_flight)
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        if args.warmup:
+            print(f"Warming up for {args.warmup}s...")
+            await load.closed_loop(client, max(1, args.concurrency), time.monotonic() + args.warmup)
+            load.window = Window()
+
+        mode = f"{args.rps} req/s open loop" if args.rps else f"{args.concurrency} concurrent users"
+        print(f"Load: {mode} for {args.duration}s against {url}")
+        print(load.header())
+
+        started = time.monotonic()
+        deadline = started + args.duration
+        load.started = started
+
+        async def reporter():
+            while True:
+                await asyncio.sleep(args.interval)
+                load.report()
+
+        reporting = asyncio.create_task(reporter())
+        try:
+            if args.rps:
+                await load.open_loop(client, args.rps, deadline)
+            else:
+                await load.closed_loop(client, args.concurrency, deadline)
+        finally:
+            reporting.cancel()
+        load.report()
+        load.summary(time.monotonic() - started)
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, name: str):
+    """Poll a URL until it answers, failing early if the process dies."""
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with code {process.returncode} during startup")
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(1.0)
+    raise TimeoutError(f"{name} did not become ready within {STARTUP_TIMEOUT_SECONDS}s")
+
+
+def spawn(args: argparse.Namespace) -> List[subprocess.Popen]:
+    """Start the fake Ollama server and a backend instance that uses it."""
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_ollama", "--port", str(args.fake_port),
+        "--first-token-ms", str(args.first_token_ms), "--tokens-per-second", str(args.tokens_per_second),
+        "--answer-tokens", str(args.answer_tokens), "--error-rate", str(args.llm_error_rate)
+    ])
+    wait_until_ready(f"{fake_url}/api/tags", fake, "Fake Ollama")
+
+    env = dict(os.environ, OLLAMA_BASE_URL=fake_url)
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--log-level", "warning"],
+        env=env
+    )
+    print("Starting backend (loads the embedding model and vector store)...")
+    wait_until_ready(f"http://127.0.0.1:{args.port}/health", backend, "Backend")
+    return [fake, backend]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load and soak test for POST /chat")
+    target = parser.add_argument_group("target")
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="backend to test (ignored with --spawn)")
+    target.add_argument("--pid", type=int, help="backend process id, to sample its memory")
+    target.add_argument("--spawn", action="store_true", help="start a fake Ollama and a backend instance")
+    target.add_argument("--port", type=int, default=8100, help="port of the spawned backend")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--concurrency", type=int, default=8, help="closed loop: concurrent users")
+    load.add_argument("--rps", type=float, help="open loop: target requests per second (overrides --concurrency)")
+    load.add_argument("--duration", type=float, default=60.0, help="seconds of measured load")
+    load.add_argument("--warmup", type=float, default=10.0, help="unmeasured seconds before the run")
+    load.add_argument("--interval", type=float, default=10.0, help="seconds between report lines")
+    load.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    load.add_argument("--max-in-flight", type=int, default=256, help="open loop: cap on outstanding requests")
+
+    fake = parser.add_argument_group("fake ollama (with --spawn)")
+    fake.add_argument("--fake-port", type=int, default=11500)
+    fake.add_argument("--first-token-ms", type=float, default=300.0)
+    fake.add_argument("--tokens-per-second", type=float, default=40.0)
+    fake.add_argument("--answer-tokens", type=int, default=60)
+    fake.add_argument("--llm-error-rate", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the load test."""
+    args = parse_args(argv)
+    print("Chat Load Test")
+    print("=" * 50)
+
+    processes: List[subprocess.Popen] = []
+    url, pid = args.url, args.pid
+    try:
+        if args.spawn:
+            processes = spawn(args)
+            url, pid = f"http://127.0.0.1:{args.port}", processes[-1].pid
+        asyncio.run(run(args, url, pid))
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=30)
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
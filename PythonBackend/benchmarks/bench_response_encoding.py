@@ -0,0 +1,98 @@
+"""
+Benchmark for /chat response encoding.
+Compares FastAPI's response_model path (dump, re-validate, json.dumps) with the
+negotiated encodings of ResponseEncoder, uncompressed and compressed, and
+reports CPU time and bytes per response for a typical answer with 5 snippets.
+
+Usage (from PythonBackend/): python -m benchmarks.bench_response_encoding
+"""
+
+import glob
+import json
+import os
+import time
+import uuid
+from typing import Callable
+
+from app.models.schemas import ChatResponse, SourceSnippet
+from app.services.response_encoding import MEDIA_COMPACT_JSON, MEDIA_JSON, MEDIA_MSGPACK, ResponseEncoder
+
+DOCS = os.path.join(os.path.dirname(__file__), "..", "docs")
+SNIPPETS = 5
+ANSWER_CHARS = 900
+ITERATIONS = 5_000
+
+
+def build_response() -> ChatResponse:
+    """A chat response made of policy text, as the HR knowledge base returns them."""
+    text = ""
+    for path in sorted(glob.glob(os.path.join(DOCS, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            text += " ".join(f.read().split()) + " "
+    sentences = [s.strip() + "." for s in text.split(". ") if len(s.strip()) > 40]
+    return ChatResponse(
+        response=" ".join(sentences[:20])[:ANSWER_CHARS],
+        sources=["HR_Policy_Dataset1.txt", "HR_Policy_Dataset2.txt"],
+        snippets=[
+            SourceSnippet(source="HR_Policy_Dataset1.txt", section="4. Leave Policies", text=sentence, score=0.71)
+            for sentence in sentences[20:20 + SNIPPETS]
+        ],
+        session_id=uuid.uuid4(),
+        index_version="20250101T000000Z"
+    )
+
+
+def fastapi_default(response: ChatResponse) -> bytes:
+    """What FastAPI does with a returned response_model: dump, validate the dict, dump again, json.dumps."""
+    validated = ChatResponse.model_validate(response.model_dump(by_alias=True))
+    content = validated.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def time_per_call(encode: Callable[[], bytes]) -> float:
+    """Best-of-three average seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            encode()
+        best = min(best, (time.perf_counter() - start) / ITERATIONS)
+    return best
+
+
+def main():
+    response = build_response()
+    encoder = ResponseEncoder(min_bytes=0)
+    cases = [("fastapi default", "identity", lambda: fastapi_default(response))]
+    for media_type in encoder.media_types:
+        for encoding in ["identity"] + encoder.encodings:
+            cases.append((
+                media_type.split("/")[-1],
+                encoding,
+                lambda m=media_type, e=encoding: encoder.compress(encoder.render(response, m), None if e == "identity" else e)
+            ))
+
+    print("=" * 50)
+    print("Chat response encoding")
+    print("=" * 50)
+    skipped = [m for m in (MEDIA_COMPACT_JSON, MEDIA_MSGPACK) if m not in encoder.media_types]
+    skipped += [f"{e} compression" for e in ("zstd", "gzip") if e not in encoder.encodings]
+    if skipped:
+        print(f"Not available here: {', '.join(skipped)}")
+    assert json.loads(fastapi_default(response)) == json.loads(encoder.render(response, MEDIA_JSON))
+
+    baseline_time, baseline_bytes = None, None
+    print(f"{'encoding':<20} {'compression':<12} {'µs':>8} {'bytes':>7} {'CPU saved':>10} {'bytes saved':>12}")
+    for name, encoding, encode in cases:
+        seconds, size = time_per_call(encode), len(encode())
+        if baseline_time is None:
+            baseline_time, baseline_bytes = seconds, size
+        print(
+            f"{name:<20} {encoding:<12} {seconds * 1e6:>8.1f} {size:>7} "
+            f"{(1 - seconds / baseline_time):>10.0%} {(1 - size / baseline_bytes):>12.0%}"
+        )
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
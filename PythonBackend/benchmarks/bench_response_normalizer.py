@@ -0,0 +1,83 @@
+"""
+Benchmark for LLM answer post-processing.
+Compares the original multi-pass regex cleanup with the single-pass normalizer,
+on whole answers and on answers streamed token by token, for growing answer lengths.
+
+Usage (from PythonBackend/): python -m benchmarks.bench_response_normalizer
+"""
+
+import re
+import time
+from typing import Callable
+
+from app.services.response_normalizer import ResponseNormalizer, normalize_response
+
+ANSWER_LENGTHS = [500, 5_000, 50_000, 500_000]
+TOKEN_CHARS = 4
+
+PARAGRAPH = (
+    "Employees are entitled to 21 days of paid annual leave\nper calendar year.  Unused days\n"
+    "may be carried over with the approval of a manager (see the leave policy).\n\n\n"
+    "Sick leave requires a medical certificate\\nafter three consecutive days.  "
+)
+
+
+def legacy_clean_response(response: str) -> str:
+    """The original cleanup, one regex pass per rule."""
+    if not response:
+        return response
+    cleaned = response.strip()
+    cleaned = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned)
+    cleaned = re.sub(r'(?<!\n)\n(?!\n)', ' ', cleaned)
+    cleaned = re.sub(r' +', ' ', cleaned)
+    cleaned = re.sub(r'^["\']+|["\']+$', '', cleaned)
+    cleaned = re.sub(r'\s*\([^)]*Section[^)]*\)\s*$', '', cleaned)
+    cleaned = cleaned.replace('\\n', ' ').replace('\\"', '"')
+    return cleaned.strip()
+
+
+def build_answer(length: int) -> str:
+    """A quoted answer of about the given length ending in a section reference."""
+    body = (PARAGRAPH * (length // len(PARAGRAPH) + 1))[:length]
+    return f'"{body} (see Section 4.2)"'
+
+
+def streamed(answer: str) -> str:
+    """Normalize an answer fed in LLM-token-sized pieces."""
+    normalizer = ResponseNormalizer()
+    parts = [normalizer.feed(answer[i:i + TOKEN_CHARS]) for i in range(0, len(answer), TOKEN_CHARS)]
+    return "".join(parts) + normalizer.finish()
+
+
+def time_per_call(clean: Callable[[str], str], answer: str) -> float:
+    """Best-of-three average seconds per call."""
+    iterations = max(3, 2_000_000 // len(answer))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            clean(answer)
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def main():
+    print("=" * 50)
+    print("Response post-processing")
+    print("=" * 50)
+    print(f"{'chars':>8} {'legacy µs':>12} {'single µs':>12} {'speedup':>8} {'stream µs':>12}")
+
+    for length in ANSWER_LENGTHS:
+        answer = build_answer(length)
+        assert normalize_response(answer) == legacy_clean_response(answer) == streamed(answer)
+
+        legacy = time_per_call(legacy_clean_response, answer)
+        single = time_per_call(normalize_response, answer)
+        stream = time_per_call(streamed, answer)
+        print(f"{len(answer):>8} {legacy * 1e6:>12.1f} {single * 1e6:>12.1f} {legacy / single:>7.2f}x {stream * 1e6:>12.1f}")
+
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for supporting sentence extraction.
+Times SnippetExtractor.extract on the chunks retrieved for a set of questions,
+with sentence embeddings cached (the usual case, the corpus is warmed at startup)
+and uncached, plus formatting of the retrieval-only answer.
+
+Usage (from PythonBackend/): python -m benchmarks.bench_snippets
+"""
+
+import time
+
+import numpy as np
+
+from app.config.settings import settings
+from app.services.document_processor import DocumentProcessor
+from app.services.extractive import SnippetExtractor, build_retrieval_only_answer
+
+ITERATIONS = 200
+TOP_K = (3, 5)
+QUESTIONS = [
+    "How many days of annual leave do employees get?",
+    "How much paid sick leave is allowed?",
+    "What are the maternity leave rules?",
+    "When are salaries paid?",
+    "Does the company provide health insurance for dependents?",
+    "How much notice do I need to give when resigning?",
+    "Is overtime paid?",
+    "What are the standard working hours?",
+]
+
+
+def report(label: str, milliseconds):
+    p50, p99 = np.percentile(milliseconds, [50, 99])
+    print(f"{label:<22} {p50:>8.3f} {p99:>8.3f}")
+
+
+def main():
+    print("=" * 42)
+    print("Snippet extraction (ms per request)")
+    print("=" * 42)
+
+    processor = DocumentProcessor()
+    chunks = processor.split_documents(processor.load_documents(settings.docs_directory))
+    embeddings = processor.embeddings
+    chunk_vectors = np.asarray(embeddings.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+    chunk_vectors /= np.linalg.norm(chunk_vectors, axis=1, keepdims=True)
+    queries = [np.asarray(embeddings.embed_query(q), dtype=np.float32) for q in QUESTIONS]
+
+    print(f"{len(chunks)} chunks, {len(QUESTIONS)} questions")
+    print(f"{'':<22} {'p50':>8} {'p99':>8}")
+    for k in TOP_K:
+        retrieved = [[chunks[i] for i in np.argsort(-(chunk_vectors @ query))[:k]] for query in queries]
+
+        cold = []
+        for query, documents in zip(queries, retrieved):
+            extractor = SnippetExtractor(embeddings, per_chunk=settings.snippets_per_chunk)
+            start = time.perf_counter()
+            extractor.extract(query, documents)
+            cold.append((time.perf_counter() - start) * 1000)
+
+        extractor = SnippetExtractor(embeddings, per_chunk=settings.snippets_per_chunk)
+        extractor.warm([c.page_content for c in chunks])
+        warm, formatting = [], []
+        for i in range(ITERATIONS):
+            question, query, documents = QUESTIONS[i % len(QUESTIONS)], queries[i % len(QUESTIONS)], retrieved[i % len(QUESTIONS)]
+            start = time.perf_counter()
+            snippets = extractor.extract(query, documents)
+            middle = time.perf_counter()
+            build_retrieval_only_answer(question, documents, snippets)
+            warm.append((middle - start) * 1000)
+            formatting.append((time.perf_counter() - middle) * 1000)
+
+        report(f"k={k} cached", warm)
+        report(f"k={k} uncached", cold)
+        report(f"k={k} answer format", formatting)
+
+    print("=" * 42)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Answer quality and latency regression gate over the golden HR question set.
+Runs every question of benchmarks/golden_set.json through the current
+RAGService with a deterministic stub LLM (or recorded answers), computes
+retrieval recall@k, MRR, source recall, key fact coverage of the answers,
+out-of-scope accuracy and per-stage p50 timings, and compares them with the
+stored baseline. Exits with status 1 when a metric regresses past its
+threshold, or when there is no baseline to compare with, so it can gate
+changes to chunking, k, the prompt or the model.
+
+Usage (from PythonBackend/):
+    python -m benchmarks.eval_golden                    # compare with the baseline
+    python -m benchmarks.eval_golden --update-baseline  # accept the current results
+    python -m benchmarks.eval_golden --recorded answers.json  # {question: answer} instead of the stub
+    LLM_RECORDER_MODE=replay python -m benchmarks.eval_golden  # replay recorded Ollama completions
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config.settings import settings
+from app.services.metadata_index import chunk_sources
+
+HERE = os.path.dirname(__file__)
+DEFAULT_GOLDEN_SET = os.path.join(HERE, "golden_set.json")
+DEFAULT_BASELINE = os.path.join(HERE, "eval_baseline.json")
+DEFAULT_K = 5
+DEFAULT_REPEAT = 3
+
+QUALITY_METRICS = ("recall_at_k", "mrr", "source_recall_at_k", "fact_coverage", "out_of_scope_accuracy")
+MAX_QUALITY_DROP = 0.02  # absolute drop of a quality metric that fails the gate
+MAX_LATENCY_INCREASE = 0.5  # relative p50 increase of a stage that fails the gate
+MIN_LATENCY_INCREASE_MS = 5.0  # smaller increases are treated as noise
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace("’", "'").split())
+
+
+def contains_fact(text: str, fact: str) -> bool:
+    return _normalize(fact) in _normalize(text)
+
+
+def recall_at_k(chunks: Sequence[str], facts: Sequence[str]) -> float:
+    """Fraction of the key facts found in the retrieved chunks."""
+    if not facts:
+        return 1.0
+    return sum(any(contains_fact(chunk, fact) for chunk in chunks) for fact in facts) / len(facts)
+
+
+def reciprocal_rank(chunks: Sequence[str], facts: Sequence[str]) -> float:
+    """1 / rank of the first retrieved chunk holding a key fact, 0 when none does."""
+    for rank, chunk in enumerate(chunks, start=1):
+        if any(contains_fact(chunk, fact) for fact in facts):
+            return 1.0 / rank
+    return 0.0
+
+
+def source_recall(sources: Sequence[str], expected: Sequence[str]) -> float:
+    """Fraction of the expected files among the retrieved chunks' sources."""
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(sources)) / len(expected)
+
+
+def retrieved_sources(results) -> List[str]:
+    """Source files of (document, score) search results, all of them for chunks merged from several files."""
+    return [source for doc, _ in results for source in chunk_sources(doc.metadata)]
+
+
+class StubLLM:
+    """
+    Deterministic stand-in for the generation chain.
+    Answers with the recorded answer for a question when there is one, otherwise
+    with the two context sentences sharing the most words with the question.
+    """
+
+    def __init__(self, recorded: Optional[Dict[str, str]] = None):
+        self.recorded = recorded or {}
+
+    def answer(self, question: str, context: str) -> str:
+        if question in self.recorded:
+            return self.recorded[question]
+        question_words = set(_WORD.findall(question.lower()))
+        sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(context) if s.strip()]
+        ranked = sorted(sentences, key=lambda s: -len(question_words & set(_WORD.findall(s.lower()))))
+        return " ".join(ranked[:2])
+
+    def stream(self, inputs: dict):
+        yield self.answer(inputs["question"], inputs["context"])
+
+
+def evaluate(golden: dict, k: int, repeat: int, llm: Optional[StubLLM]) -> dict:
+    """
+    Run the golden set through a fresh RAGService and aggregate quality and timing metrics.
+    Without a stub LLM the service's own generation chain is used (e.g. replaying recordings).
+    """
+    from app.services.rag_service import RAGService
+    from app.services.tracing import Tracer
+
+    service = RAGService()
+    if llm is not None:
+        service.generation_chain = llm
+    tracer = Tracer()
+
+    scores = defaultdict(list)
+    stage_ms: Dict[str, List[float]] = defaultdict(list)
+    per_question = {}
+    for item in golden["questions"]:
+        question, facts = item["question"], item.get("key_facts", [])
+        for _ in range(repeat):
+            with tracer.start_trace("eval") as trace:
+                result = service.get_answer(question)
+            stage_ms["total"].append(trace.root.duration_ms)
+            for recorded_span in trace.spans:
+                stage_ms[recorded_span.name].append(recorded_span.duration_ms)
+
+        if item.get("out_of_scope"):
+            scores["out_of_scope_accuracy"].append(float(result.out_of_scope))
+            per_question[item["id"]] = {"out_of_scope": result.out_of_scope}
+            continue
+        scores["out_of_scope_accuracy"].append(float(not result.out_of_scope))
+
+        retrieved = service.retriever.search(question, k=k)
+        chunks = [doc.page_content for doc, _ in retrieved]
+        sources = retrieved_sources(retrieved)
+        question_scores = {
+            "recall_at_k": recall_at_k(chunks, facts),
+            "mrr": reciprocal_rank(chunks, facts),
+            "source_recall_at_k": source_recall(sources, item.get("expected_sources", [])),
+            "fact_coverage": recall_at_k([result.answer], facts)
+        }
+        for name, value in question_scores.items():
+            scores[name].append(value)
+        per_question[item["id"]] = question_scores
+
+    return {
+        "k": k,
+        "questions": len(golden["questions"]),
+        "metrics": {name: round(float(np.mean(values)), 4) for name, values in scores.items()},
+        "stage_p50_ms": {name: round(float(np.percentile(values, 50)), 2) for name, values in sorted(stage_ms.items())},
+        "per_question": per_question
+    }
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    max_quality_drop: float = MAX_QUALITY_DROP,
+    max_latency_increase: float = MAX_LATENCY_INCREASE,
+    min_latency_increase_ms: float = MIN_LATENCY_INCREASE_MS
+) -> List[str]:
+    """Regressions of the current results against the baseline, empty when the gate passes."""
+    failures = []
+    for name in QUALITY_METRICS:
+        before, after = baseline["metrics"].get(name), current["metrics"].get(name)
+        if before is not None and after is not None and before - after > max_quality_drop:
+            failures.append(f"{name} dropped from {before:.4f} to {after:.4f}")
+
+    for stage, before in baseline.get("stage_p50_ms", {}).items():
+        after = current.get("stage_p50_ms", {}).get(stage)
+        if after is None:
+            continue
+        if after > before * (1 + max_latency_increase) and after - before > min_latency_increase_ms:
+            failures.append(f"{stage} p50 rose from {before:.1f} ms to {after:.1f} ms")
+    return failures
+
+
+def print_results(results: dict, baseline: Optional[dict]):
+    print(f"{'metric':<24} {'current':>9} {'baseline':>9}")
+    for name, value in results["metrics"].items():
+        before = baseline["metrics"].get(name) if baseline else None
+        print(f"{name:<24} {value:>9.4f} {before if before is not None else '-':>9}")
+    print(f"\n{'stage p50 (ms)':<24} {'current':>9} {'baseline':>9}")
+    for stage, value in results["stage_p50_ms"].items():
+        before = baseline.get("stage_p50_ms", {}).get(stage) if baseline else None
+        print(f"{stage:<24} {value:>9.2f} {before if before is not None else '-':>9}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Golden set regression gate")
+    parser.add_argument("--golden-set", default=DEFAULT_GOLDEN_SET)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="store the current results as the baseline")
+    parser.add_argument("--recorded", help="JSON file mapping questions to recorded LLM answers")
+    parser.add_argument("-k", type=int, default=DEFAULT_K, help="retrieval depth for recall@k and MRR")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per question for timings")
+    parser.add_argument("--max-quality-drop", type=float, default=MAX_QUALITY_DROP)
+    parser.add_argument("--max-latency-increase", type=float, default=MAX_LATENCY_INCREASE)
+    parser.add_argument("--min-latency-increase-ms", type=float, default=MIN_LATENCY_INCREASE_MS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the golden set evaluation, returning the process exit status."""
+    args = parse_args(argv)
+    with open(args.golden_set, encoding="utf-8") as f:
+        golden = json.load(f)
+    recorded = None
+    if args.recorded:
+        with open(args.recorded, encoding="utf-8") as f:
+            recorded = json.load(f)
+
+    print("Golden Set Evaluation")
+    print("=" * 50)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif not args.update_baseline:
+        # A gate without a baseline would pass everything
+        print(f"No baseline at {args.baseline}, run with --update-baseline to store one")
+        print("=" * 50)
+        return 1
+
+    # Replayed Ollama completions take precedence over the stub unless answers are given explicitly
+    replaying = settings.llm_recorder_mode != "off" and not recorded
+    print(f"LLM: {'record/replay (' + settings.llm_recorder_mode + ')' if replaying else 'stub'}")
+    results = evaluate(golden, args.k, args.repeat, None if replaying else StubLLM(recorded))
+    print_results(results, baseline)
+
+    status = 0
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    else:
+        failures = compare(
+            results,
+            baseline,
+            args.max_quality_drop,
+            args.max_latency_increase,
+            args.min_latency_increase_ms
+        )
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        print("\nFAILED" if failures else "\nPASSED")
+        status = 1 if failures else 0
+    print("=" * 50)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Fake Ollama server for load and soak tests.
+Streams canned answers from /api/generate and /api/chat with a configurable
+first-token latency, token rate and error rate, so the backend can be driven
+at production-like load without a GPU or a real model.
+
+Usage (from PythonBackend/):
+    python -m benchmarks.fake_ollama --port 11500 --first-token-ms 300 --tokens-per-second 40
+Then start the backend with OLLAMA_BASE_URL=http://localhost:11500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+CANNED_ANSWER = (
+    "According to the company policy, full-time employees are entitled to 21 days of paid annual leave "
+    "per calendar year. Leave requests should be submitted through the HR portal at least two weeks in "
+    "advance and approved by the direct manager. Unused days may be carried over to the next year with "
+    "the approval of the HR department, up to a maximum of five days."
+).split()
+
+
+@dataclass
+class FakeModelConfig:
+    """Timing behaviour of the fake model."""
+    first_token_ms: float = 300.0
+    tokens_per_second: float = 40.0
+    answer_tokens: int = 60
+    jitter: float = 0.2  # relative random variation of every delay
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 500
+    model: str = "llama3"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _vary(seconds: float, jitter: float) -> float:
+    return max(0.0, seconds * random.uniform(1 - jitter, 1 + jitter))
+
+
+def create_app(config: FakeModelConfig) -> FastAPI:
+    """Build the fake Ollama API."""
+    app = FastAPI(title="Fake Ollama")
+
+    async def tokens():
+        await asyncio.sleep(_vary(config.first_token_ms / 1000, config.jitter))
+        interval = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+        for i in range(config.answer_tokens):
+            if i:
+                await asyncio.sleep(_vary(interval, config.jitter))
+            yield CANNED_ANSWER[i % len(CANNED_ANSWER)] + " "
+
+    def final(started: float, **fields) -> dict:
+        return {
+            "model": config.model,
+            "created_at": _now(),
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((time.monotonic() - started) * 1e9),
+            "eval_count": config.answer_tokens,
+            **fields
+        }
+
+    def injected_error():
+        if random.random() < config.error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+        return None
+
+    @app.get("/")
+    async def root():
+        return PlainTextResponse("Ollama is running")
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": config.model, "model": config.model}]}
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        error = injected_error()
+        if error:
+            return error
+        started = time.monotonic()
+
+        if not body.get("stream", True):
+            text = "".join([token async for token in tokens()])
+            return final(started, response=text)
+
+        async def stream():
+            async for token in tokens():
+                yield json.dumps({"model": config.model, "created_at": _now(), "response": token, "done": False}) + "\n"
+            yield json.dumps(final(started, response="")) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        error = injected_error()
+        if error:
+            return error
+        started = time.monotonic()
+
+        def message(content: str) -> dict:
+            return {"role": "assistant", "content": content}
+
+        if not body.get("stream", True):
+            text = "".join([token async for token in tokens()])
+            return final(started, message=message(text))
+
+        async def stream():
+            async for token in tokens():
+                yield json.dumps({"model": config.model, "created_at": _now(), "message": message(token), "done": False}) + "\n"
+            yield json.dumps(final(started, message=message(""))) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    return app
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake Ollama server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--first-token-ms", type=float, default=FakeModelConfig.first_token_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=FakeModelConfig.tokens_per_second)
+    parser.add_argument("--answer-tokens", type=int, default=FakeModelConfig.answer_tokens)
+    parser.add_argument("--jitter", type=float, default=FakeModelConfig.jitter)
+    parser.add_argument("--error-rate", type=float, default=FakeModelConfig.error_rate)
+    parser.add_argument("--model", default=FakeModelConfig.model)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = FakeModelConfig(
+        first_token_ms=args.first_token_ms,
+        tokens_per_second=args.tokens_per_second,
+        answer_tokens=args.answer_tokens,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        model=args.model
+    )
+    print(f"Fake Ollama on http://{args.host}:{args.port} ({config})")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Unit tests for choosing the number of retrieved chunks from the score gap
+Runs offline, no backend needed
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+pytest.importorskip("langchain")
+
+from app.services.retriever import adaptive_k  # noqa: E402
+
+
+def test_dominant_match_keeps_one_chunk():
+    """A single clearly best chunk is sent alone"""
+    assert adaptive_k([0.72, 0.41, 0.39, 0.38, 0.35], min_k=1, max_k=5, min_gap=0.08, default_k=3) == 1
+
+
+def test_cut_at_largest_gap():
+    """Results are cut after the largest drop between consecutive scores"""
+    assert adaptive_k([0.61, 0.58, 0.55, 0.31, 0.30], min_k=1, max_k=5, min_gap=0.08, default_k=3) == 3
+    assert adaptive_k([0.61, 0.58, 0.31], min_k=1, max_k=5, min_gap=0.08, default_k=3) == 2
+
+
+def test_flat_scores_keep_default_k():
+    """Without a clear gap the default k is kept"""
+    assert adaptive_k([0.60, 0.58, 0.57, 0.55, 0.52], min_k=1, max_k=5, min_gap=0.08, default_k=3) == 3
+
+
+def test_bounds():
+    """min_k and max_k bound the result, short result lists are kept whole"""
+    assert adaptive_k([0.72, 0.41, 0.39], min_k=2, max_k=5, min_gap=0.08, default_k=3) == 3
+    assert adaptive_k([0.9, 0.8, 0.7, 0.6, 0.1], min_k=1, max_k=4, min_gap=0.2, default_k=3) == 3
+    assert adaptive_k([0.5], min_k=1, max_k=5, min_gap=0.08, default_k=3) == 1
+    assert adaptive_k([], min_k=1, max_k=5, min_gap=0.08, default_k=3) == 0
+
+
+if __name__ == "__main__":
+    test_dominant_match_keeps_one_chunk()
+    test_cut_at_largest_gap()
+    test_flat_scores_keep_default_k()
+    test_bounds()
+    print("✅ All adaptive k tests passed")
@@ -0,0 +1,106 @@
+"""
+Unit tests for near-duplicate chunk detection at ingestion
+Runs offline, no backend needed
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+pytest.importorskip("langchain")
+
+from langchain.schema import Document  # noqa: E402
+
+from app.services.chunk_dedup import ChunkDeduplicator, jaccard, shingles  # noqa: E402
+from app.services.metadata_index import MetadataIndex, chunk_section_paths  # noqa: E402
+from app.services.parent_store import ParentStore  # noqa: E402
+from app.services.section_chunker import SectionChunker  # noqa: E402
+
+ANNUAL_LEAVE = (
+    "Full-time employees are entitled to 21 days of paid annual leave per calendar year. Leave requests "
+    "should be submitted through the HR portal at least two weeks in advance and approved by the direct "
+    "manager. Unused days may be carried over to the next year with the approval of the HR department."
+)
+OVERTIME = (
+    "Employees who work beyond their standard hours are compensated for overtime at one and a half times "
+    "their hourly rate, provided the overtime was approved by their manager beforehand."
+)
+
+
+def _chunk(text: str, source: str, tags: str) -> Document:
+    return Document(page_content=text, metadata={"source": source, "tags": tags})
+
+
+def test_shingles_ignore_formatting():
+    """Case, punctuation and whitespace do not change the fingerprint"""
+    assert shingles("Annual  leave:\nTwenty-one DAYS") == shingles("annual leave twenty one days")
+    assert jaccard(shingles(ANNUAL_LEAVE), shingles(OVERTIME)) < 0.1
+
+
+def test_near_duplicates_collapse_with_merged_metadata():
+    """Boilerplate repeated across files is stored once and lists every source and tag"""
+    reworded = ANNUAL_LEAVE.replace("HR department.", "HR department team.")
+    chunks = [
+        _chunk(ANNUAL_LEAVE, "HR_Policy_Dataset1.txt", "leave-policies,annual-leave"),
+        _chunk(OVERTIME, "HR_Policy_Dataset1.txt", "overtime"),
+        _chunk(reworded, "HR_Policy_Dataset2.txt", "leave"),
+        _chunk(ANNUAL_LEAVE, "HR_Policy_Dataset1.txt", "annual-leave"),
+    ]
+    kept, report = ChunkDeduplicator(threshold=0.85).deduplicate(chunks)
+
+    assert [chunk.page_content for chunk in kept] == [ANNUAL_LEAVE, OVERTIME]
+    assert kept[0].metadata["sources"] == "HR_Policy_Dataset1.txt/HR_Policy_Dataset2.txt"
+    assert kept[0].metadata["tags"] == "leave-policies,annual-leave,leave"
+    assert kept[0].metadata["duplicate_count"] == 2
+    assert "sources" not in kept[1].metadata
+    assert chunks[0].metadata == {"source": "HR_Policy_Dataset1.txt", "tags": "leave-policies,annual-leave"}
+    assert (report.chunks_in, report.chunks_out, report.dedup_ratio) == (4, 2, 0.5)
+
+
+def test_duplicates_in_other_sections_stay_filterable():
+    """A duplicate's section is recorded for filters; the first occurrence's section is the one expanded to"""
+    documents = [
+        Document(page_content="1. Leave Policies\n\n" + ANNUAL_LEAVE, metadata={"source": "a.txt", "file_path": "a.txt"}),
+        Document(page_content="7. Holidays\n\n" + ANNUAL_LEAVE, metadata={"source": "b.txt", "file_path": "b.txt"}),
+    ]
+    chunks = [
+        Document(page_content=ANNUAL_LEAVE, metadata={
+            "source": doc.metadata["source"],
+            "file_path": doc.metadata["file_path"],
+            "start_index": doc.page_content.index(ANNUAL_LEAVE),
+            "section_path": doc.page_content.split("\n")[0]
+        })
+        for doc in documents
+    ]
+    kept, _ = ChunkDeduplicator(threshold=0.85).deduplicate(chunks)
+
+    assert len(kept) == 1
+    assert kept[0].metadata["section_path"] == "1. Leave Policies"
+    assert chunk_section_paths(kept[0].metadata) == ["1. Leave Policies", "7. Holidays"]
+    index = MetadataIndex([chunk.metadata for chunk in kept])
+    assert index.candidates({"section": ["Holidays"]}).tolist() == [0]
+    assert index.candidates({"section": ["Leave Policies"]}).tolist() == [0]
+
+    store = ParentStore.build(documents, kept, SectionChunker(max_tokens=256, overlap_tokens=0))
+    assert store.get(kept[0].metadata["parent_id"]).source == "a.txt"
+    assert "section_paths" not in ChunkDeduplicator().deduplicate([_chunk(ANNUAL_LEAVE, "a.txt", "")] * 2)[0][0].metadata
+
+
+def test_distinct_chunks_are_kept():
+    """Chunks below the similarity threshold are all kept, in order"""
+    half = " ".join(ANNUAL_LEAVE.split()[:20])
+    chunks = [_chunk(text, "a.txt", "") for text in (ANNUAL_LEAVE, half, OVERTIME)]
+    kept, report = ChunkDeduplicator(threshold=0.85).deduplicate(chunks)
+    assert [chunk.page_content for chunk in kept] == [ANNUAL_LEAVE, half, OVERTIME]
+    assert report.dedup_ratio == 0.0
+
+
+if __name__ == "__main__":
+    test_shingles_ignore_formatting()
+    test_near_duplicates_collapse_with_merged_metadata()
+    test_duplicates_in_other_sections_stay_filterable()
+    test_distinct_chunks_are_kept()
+    print("✅ All chunk dedup tests passed")
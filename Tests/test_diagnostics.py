@@ -0,0 +1,94 @@
+"""
+Unit tests for the cached, rate-limited diagnostics checks
+Runs offline against a fake RAG service, no backend needed
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.diagnostics import Diagnostics, DiagnosticsRateLimited  # noqa: E402
+
+
+class FakeRetriever:
+    def __init__(self):
+        self.searches = 0
+
+    def search(self, question, k=None):
+        self.searches += 1
+        return [(SimpleNamespace(metadata={"source": "HR_Policy_Dataset1.txt"}), 0.71)]
+
+
+def fake_service(path):
+    collection = SimpleNamespace(count=lambda: 42)
+    service = SimpleNamespace(
+        index_version="legacy",
+        retriever=FakeRetriever(),
+        embedding_batcher=None,
+        document_processor=SimpleNamespace(
+            vector_store=SimpleNamespace(_collection=collection),
+            vector_index=None,
+            vector_store_path=str(path)
+        ),
+        health_check=lambda: {"llm_status": "available"}
+    )
+    service.use_retriever = lambda: nullcontext(service.retriever)
+    return service
+
+
+class OfflineDiagnostics(Diagnostics):
+    """Diagnostics with the LLM ping answered locally."""
+
+    def _check_llm(self):
+        return {"model": "llama3"}
+
+
+def make_runner() -> Diagnostics:
+    path = tempfile.mkdtemp()
+    with open(os.path.join(path, "chroma.sqlite3"), "wb") as f:
+        f.write(b"x" * 2048)
+    return OfflineDiagnostics(fake_service(path))
+
+
+def test_checks_report_details():
+    """Every check reports its details and duration"""
+    result = make_runner().get()
+    assert result["status"] == "healthy"
+    assert result["checks"]["vector_store"]["collection_count"] == 42
+    assert result["checks"]["index_on_disk"]["size_mb"] == 0.0
+    assert result["checks"]["retrieval"]["top_score"] == 0.71
+    assert all("duration_ms" in check for check in result["checks"].values())
+
+
+def test_results_are_cached_and_refresh_is_rate_limited():
+    """Repeated calls reuse the last run and forced refreshes are throttled"""
+    runner = make_runner()
+    runner.get()
+    runner.get()
+    assert runner.rag_service.retriever.searches == 1
+    with pytest.raises(DiagnosticsRateLimited) as error:
+        runner.get(refresh=True)
+    assert error.value.retry_after > 0
+
+
+def test_failing_check_degrades_without_stopping_others():
+    """A failing check is reported and the remaining checks still run"""
+    runner = make_runner()
+    runner.rag_service.retriever = None
+    result = runner.get()
+    assert result["status"] == "degraded"
+    assert result["checks"]["retrieval"]["status"] == "error"
+    assert result["checks"]["vector_store"]["status"] == "ok"
+
+
+if __name__ == "__main__":
+    test_checks_report_details()
+    test_results_are_cached_and_refresh_is_rate_limited()
+    test_failing_check_degrades_without_stopping_others()
+    print("✅ All diagnostics tests passed")
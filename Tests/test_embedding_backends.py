@@ -0,0 +1,69 @@
+"""
+Numerical check of the ONNX embedding backends against sentence-transformers
+Needs onnxruntime, tokenizers and sentence-transformers, and downloads the model on first run
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+pytest.importorskip("langchain_community")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+
+from app.services.embedding_backends import compare_embeddings, create_embeddings, create_token_counter  # noqa: E402
+from app.services.section_chunker import build_token_counter  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+
+TEXTS = [
+    "Full-time employees are entitled to 21 days of paid annual leave per calendar year.",
+    "How much notice do I need to give when resigning?",
+    "Sick leave",
+    "Employees may work remotely up to two days per week with the approval of their manager. "
+    "Requests must be submitted through the HR portal.\nEquipment is provided by the IT department.",
+    " ".join(["Salaries are paid on the 25th of each month."] * 60),  # longer than the 256 token limit
+]
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return create_embeddings("torch")
+
+
+def test_onnx_matches_torch(reference):
+    """fp32 ONNX vectors are practically identical to the torch backend's"""
+    result = compare_embeddings(reference, create_embeddings("onnx"), TEXTS)
+    assert result["min_cosine"] > 0.999
+
+
+def test_onnx_int8_close_to_torch(reference):
+    """int8 quantized vectors stay close enough to query a torch-built index"""
+    result = compare_embeddings(reference, create_embeddings("onnx-int8"), TEXTS)
+    assert result["min_cosine"] > 0.98
+
+
+def test_onnx_token_counts_match_transformers():
+    """The ONNX backend counts chunk tokens with tokenizer.json exactly as the transformers tokenizer does"""
+    onnx_count = create_token_counter("onnx")
+    transformers_count = build_token_counter(settings.embedding_model)
+    assert [onnx_count(text) for text in TEXTS] == [transformers_count(text) for text in TEXTS]
+    assert onnx_count(TEXTS[-1]) > 256
+
+
+def test_unknown_backend():
+    """Unknown backend names are rejected"""
+    with pytest.raises(ValueError):
+        create_embeddings("tensorrt")
+
+
+if __name__ == "__main__":
+    torch_embeddings = create_embeddings("torch")
+    test_onnx_matches_torch(torch_embeddings)
+    test_onnx_int8_close_to_torch(torch_embeddings)
+    test_onnx_token_counts_match_transformers()
+    test_unknown_backend()
+    print("✅ All embedding backend tests passed")
@@ -0,0 +1,85 @@
+"""
+Unit tests for coalescing concurrent query embeddings into batched model calls
+Runs offline with a fake embedding model, no backend needed
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.embedding_batcher import EmbeddingBatcher  # noqa: E402
+
+
+class FakeEmbeddings:
+    """Embeds a text as [len(text), call number] and records every model call."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        threading.Event().wait(self.delay)
+        with self.lock:
+            self.calls.append(list(texts))
+            call = len(self.calls)
+        return [[float(len(text)), float(call)] for text in texts]
+
+
+def test_results_match_each_caller():
+    """Every caller gets the vectors of its own texts, in order"""
+    batcher = EmbeddingBatcher(FakeEmbeddings(), max_wait_ms=20)
+    questions = ["a" * n for n in range(1, 41)]
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        vectors = list(pool.map(batcher.embed_query, questions))
+    assert [v[0] for v in vectors] == [float(len(q)) for q in questions]
+    assert [v[0] for v in batcher.embed_queries(["xy", "xyz", "x"])] == [2.0, 3.0, 1.0]
+    batcher.close()
+
+
+def test_concurrent_requests_share_model_calls():
+    """Requests arriving within the wait window go out in one call, capped at the batch size"""
+    model = FakeEmbeddings(delay=0.01)
+    batcher = EmbeddingBatcher(model, max_batch_size=8, max_wait_ms=50)
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        list(pool.map(batcher.embed_query, [f"question {i}" for i in range(20)]))
+    assert len(model.calls) < 20
+    assert max(len(call) for call in model.calls) <= 8
+    stats = batcher.stats()
+    assert stats["requests"] == 20 and stats["batches"] == len(model.calls)
+    batcher.close()
+
+
+def test_model_errors_reach_every_caller():
+    """A failing model call raises in every request of the batch"""
+    batcher = EmbeddingBatcher(FakeEmbeddings(fail=True), max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.embed_query("question")
+    batcher.close()
+
+
+def test_submit_after_close_raises():
+    """A closed batcher refuses new requests instead of leaving them waiting forever"""
+    batcher = EmbeddingBatcher(FakeEmbeddings(delay=0.05), max_wait_ms=20)
+    queued = batcher.submit(["queued before close"])
+    batcher.close()
+    assert queued.result(timeout=1)[0][0] == float(len("queued before close"))
+    with pytest.raises(RuntimeError):
+        batcher.submit(["question"])
+    batcher.close()
+
+
+if __name__ == "__main__":
+    test_results_match_each_caller()
+    test_concurrent_requests_share_model_calls()
+    test_model_errors_reach_every_caller()
+    test_submit_after_close_raises()
+    print("✅ All embedding batcher tests passed")
@@ -0,0 +1,101 @@
+"""
+Unit tests for the golden set evaluation metrics and regression gate
+Runs offline, no backend needed
+"""
+
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from benchmarks.eval_golden import (  # noqa: E402
+    DEFAULT_GOLDEN_SET, StubLLM, compare, contains_fact, main, recall_at_k, reciprocal_rank, retrieved_sources,
+    source_recall
+)
+
+DOCS = os.path.join(os.path.dirname(__file__), "..", "PythonBackend", "docs")
+CHUNKS = [
+    "Overtime must be pre-approved by management.",
+    "Employees are entitled to 21 days of paid annual leave per year.",
+    "Sick leave is capped at 30 days per year.",
+]
+
+
+def test_golden_set_is_grounded_in_the_documents():
+    """Every key fact appears verbatim in one of its expected source files"""
+    with open(DEFAULT_GOLDEN_SET, encoding="utf-8") as f:
+        golden = json.load(f)
+    ids = [item["id"] for item in golden["questions"]]
+    assert len(ids) == len(set(ids))
+
+    for item in golden["questions"]:
+        texts = []
+        for source in item["expected_sources"]:
+            with open(os.path.join(DOCS, source), encoding="utf-8") as f:
+                texts.append(f.read())
+        for fact in item["key_facts"]:
+            assert any(contains_fact(text, fact) for text in texts), (item["id"], fact)
+        assert item.get("out_of_scope", False) == (not item["expected_sources"])
+
+
+def test_retrieval_metrics():
+    """recall@k counts facts found, MRR uses the first chunk holding any fact"""
+    facts = ["21 days of paid annual leave", "capped at 30 days per year"]
+    assert recall_at_k(CHUNKS, facts) == 1.0
+    assert recall_at_k(CHUNKS[:2], facts) == 0.5
+    assert reciprocal_rank(CHUNKS, facts) == 0.5
+    assert reciprocal_rank(CHUNKS[:1], facts) == 0.0
+    assert source_recall(["a.txt", "a.txt"], ["a.txt", "b.txt"]) == 0.5
+
+
+def test_merged_chunks_count_for_every_source():
+    """A chunk deduplicated across files counts as retrieved from each of them, commas in names included"""
+    results = [
+        (SimpleNamespace(metadata={"source": "a.txt", "sources": "a.txt/b, c.txt"}), 0.9),
+        (SimpleNamespace(metadata={"source": "d.txt"}), 0.8),
+    ]
+    sources = retrieved_sources(results)
+    assert sources == ["a.txt", "b, c.txt", "d.txt"]
+    assert source_recall(sources, ["b, c.txt", "d.txt"]) == 1.0
+
+
+def test_missing_baseline_fails_the_gate():
+    """Without a stored baseline the gate fails instead of passing everything"""
+    baseline = os.path.join(tempfile.mkdtemp(), "eval_baseline.json")
+    assert main(["--baseline", baseline]) == 1
+    assert not os.path.exists(baseline)
+
+
+def test_stub_llm_is_deterministic():
+    """The stub answers with recorded text or the best matching context sentences"""
+    context = "\n\n".join(CHUNKS)
+    llm = StubLLM({"Is overtime paid?": "Yes."})
+    assert "".join(llm.stream({"question": "Is overtime paid?", "context": context})) == "Yes."
+    answer = llm.answer("How much sick leave is allowed?", context)
+    assert answer.startswith("Sick leave is capped at 30 days per year.")
+    assert answer == llm.answer("How much sick leave is allowed?", context)
+
+
+def test_gate_flags_quality_and_latency_regressions():
+    """Drops past the thresholds fail the gate, noise within them does not"""
+    baseline = {"metrics": {"recall_at_k": 0.95, "mrr": 0.80}, "stage_p50_ms": {"retrieve": 20.0, "clean": 0.1}}
+    steady = {"metrics": {"recall_at_k": 0.94, "mrr": 0.81}, "stage_p50_ms": {"retrieve": 24.0, "clean": 0.5}}
+    worse = {"metrics": {"recall_at_k": 0.90, "mrr": 0.81}, "stage_p50_ms": {"retrieve": 45.0, "clean": 0.1}}
+
+    assert compare(steady, baseline) == []
+    failures = compare(worse, baseline)
+    assert len(failures) == 2
+    assert failures[0].startswith("recall_at_k") and failures[1].startswith("retrieve")
+
+
+if __name__ == "__main__":
+    test_golden_set_is_grounded_in_the_documents()
+    test_retrieval_metrics()
+    test_merged_chunks_count_for_every_source()
+    test_missing_baseline_fails_the_gate()
+    test_stub_llm_is_deterministic()
+    test_gate_flags_quality_and_latency_regressions()
+    print("✅ All golden set evaluation tests passed")
@@ -0,0 +1,125 @@
+"""
+Unit tests for supporting sentence snippets and retrieval-only answers
+Runs offline with a bag-of-words stand-in for the embedding model
+"""
+
+import os
+import re
+import sys
+import zlib
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+pytest.importorskip("langchain")
+
+from langchain.schema import Document  # noqa: E402
+
+from app.services.extractive import (  # noqa: E402
+    NO_PASSAGES_ANSWER, SnippetExtractor, build_retrieval_only_answer, candidate_sentences
+)
+
+
+class BagOfWordsEmbeddings:
+    """Hashed word counts, so sentences sharing words with the question score highest."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, text):
+        vector = np.zeros(256, dtype=np.float32)
+        for word in re.findall(r"[a-z]+", text.lower()):
+            vector[zlib.crc32(word.encode()) % 256] += 1
+        return vector.tolist()
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [self.embed_query(text) for text in texts]
+
+
+SICK_LEAVE = Document(
+    page_content=(
+        "4.2 Sick Leave\n\n"
+        "Employees are entitled to paid sick leave. "
+        "Sick leave is capped at 30 days per year. "
+        "A medical certificate is required after three consecutive days."
+    ),
+    metadata={"source": "HR_Policy_Dataset1.txt", "section_path": "4. Leave Policies > 4.2 Sick Leave"}
+)
+SALARY = Document(
+    page_content="5.1 Salary\n\nSalaries are paid on the 25th of each month.",
+    metadata={"source": "HR_Policy_Dataset2.txt"}
+)
+
+
+def test_candidates_skip_headings_and_fragments():
+    """Headings never become snippets, short fragments only when nothing else is left"""
+    assert candidate_sentences(SICK_LEAVE.page_content) == [
+        "Employees are entitled to paid sick leave.",
+        "Sick leave is capped at 30 days per year.",
+        "A medical certificate is required after three consecutive days.",
+    ]
+    assert candidate_sentences("2.1 Code of Conduct\n\nBe respectful.") == ["Be respectful."]
+    assert candidate_sentences("4.2 Sick Leave") == []
+    assert candidate_sentences("") == []
+
+
+def test_best_sentence_per_chunk():
+    """Each chunk's sentence closest to the question is returned, embedded once and cached"""
+    embeddings = BagOfWordsEmbeddings()
+    extractor = SnippetExtractor(embeddings, per_chunk=1)
+    question = embeddings.embed_query("How many days of sick leave per year?")
+
+    snippets = extractor.extract(question, [SICK_LEAVE, SALARY])
+    assert [(s.document_index, s.text) for s in snippets] == [
+        (0, "Sick leave is capped at 30 days per year."),
+        (1, "Salaries are paid on the 25th of each month."),
+    ]
+    assert snippets[0].source == "HR_Policy_Dataset1.txt" and snippets[0].section.endswith("4.2 Sick Leave")
+    assert snippets[1].section is None and snippets[0].score > snippets[1].score
+
+    extractor.extract(question, [SALARY, SICK_LEAVE])
+    assert embeddings.calls == 1
+
+
+def test_empty_and_heading_only_chunks():
+    """Chunks without usable sentences get no snippet and are left out of the answer"""
+    embeddings = BagOfWordsEmbeddings()
+    extractor = SnippetExtractor(embeddings)
+    empty = Document(page_content="", metadata={"source": "c"})
+    heading = Document(page_content="4.2 Sick Leave", metadata={"source": "d"})
+    question = embeddings.embed_query("sick leave")
+
+    assert extractor.extract(question, [empty, heading]) == []
+    assert build_retrieval_only_answer("sick leave", [empty, heading]) == NO_PASSAGES_ANSWER
+    assert build_retrieval_only_answer("sick leave", []) == NO_PASSAGES_ANSWER
+
+    answer = build_retrieval_only_answer("sick leave", [empty, SICK_LEAVE])
+    assert "[c]" not in answer
+    assert answer.endswith(
+        "[HR_Policy_Dataset1.txt - 4. Leave Policies > 4.2 Sick Leave] "
+        "**Employees are entitled to paid sick leave.** ... **Sick leave is capped at 30 days per year.**"
+    )
+
+
+def test_citations_use_the_snippets():
+    """The retrieval-only answer cites each chunk's source and section with its snippets highlighted"""
+    embeddings = BagOfWordsEmbeddings()
+    extractor = SnippetExtractor(embeddings)
+    question = "When are salaries paid?"
+    snippets = extractor.extract(embeddings.embed_query(question), [SICK_LEAVE, SALARY])
+
+    lines = build_retrieval_only_answer(question, [SICK_LEAVE, SALARY], snippets).split("\n\n")
+    assert len(lines) == 3
+    assert lines[1].startswith("[HR_Policy_Dataset1.txt - 4. Leave Policies > 4.2 Sick Leave] **")
+    assert lines[2] == "[HR_Policy_Dataset2.txt] **Salaries are paid on the 25th of each month.**"
+
+
+if __name__ == "__main__":
+    test_candidates_skip_headings_and_fragments()
+    test_best_sentence_per_chunk()
+    test_empty_and_heading_only_chunks()
+    test_citations_use_the_snippets()
+    print("✅ All extractive snippet tests passed")
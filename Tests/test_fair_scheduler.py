@@ -0,0 +1,69 @@
+"""
+Unit tests for fair scheduling of generations across sessions
+Runs offline with threads standing in for concurrent requests
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.fair_scheduler import FairScheduler  # noqa: E402
+
+
+def queue_requests(scheduler: FairScheduler, sessions, order: list) -> list:
+    """Start one waiting request per entry, in order, each recording when it gets the slot."""
+    threads = []
+    for session in sessions:
+        def request(session=session):
+            if scheduler.acquire(session, timeout=5):
+                order.append(session)
+                scheduler.release()
+        thread = threading.Thread(target=request)
+        thread.start()
+        threads.append(thread)
+        # Let it queue before the next one arrives
+        while scheduler.stats()["waiting"] < len(threads):
+            time.sleep(0.001)
+    return threads
+
+
+def test_waiting_sessions_take_turns():
+    """A session with many queued requests doesn't hold back a session that queued later"""
+    scheduler = FairScheduler(slots=1)
+    assert scheduler.acquire("busy")
+    order = []
+    threads = queue_requests(scheduler, ["heavy"] * 4 + ["light-1", "light-2"], order)
+    scheduler.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["heavy", "light-1", "light-2", "heavy", "heavy", "heavy"]
+    stats = scheduler.stats()
+    assert stats["active"] == 0 and stats["waiting"] == 0
+    assert stats["granted"] == 7 and stats["queued"] == 6
+
+
+def test_free_slots_and_timeouts():
+    """Free slots are granted at once; a request that can't get one in time gives up"""
+    scheduler = FairScheduler(slots=2)
+    assert scheduler.acquire("a", timeout=0) and scheduler.acquire("b", timeout=0)
+    started = time.monotonic()
+    assert not scheduler.acquire("c", timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+
+    stats = scheduler.stats()
+    assert stats["active"] == 2 and stats["waiting"] == 0 and stats["timeouts"] == 1
+    scheduler.release()
+    assert scheduler.acquire("c", timeout=0)
+    scheduler.release()
+    scheduler.release()
+    assert scheduler.stats()["active"] == 0
+
+
+if __name__ == "__main__":
+    test_waiting_sessions_take_turns()
+    test_free_slots_and_timeouts()
+    print("✅ All fair scheduler tests passed")
@@ -0,0 +1,114 @@
+"""
+Unit tests for LLM generation with retrieval-only fallback
+Runs offline with fake generation chains, no Ollama needed
+"""
+
+import os
+import sys
+import logging
+import pathlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+pytest.importorskip("langchain_community")
+
+from app.config.settings import settings  # noqa: E402
+from app.services.fair_scheduler import FairScheduler  # noqa: E402
+from app.services.llm_recorder import RecordingStore, RecordReplayChain  # noqa: E402
+from app.services.rag_service import RAGService  # noqa: E402
+
+
+class StalledChain:
+    """Chain whose stream never sends a token until unblocked, like a hung Ollama connection."""
+
+    def __init__(self):
+        self.unblock = threading.Event()
+        self.calls = 0
+
+    def stream(self, inputs):
+        self.calls += 1
+        self.unblock.wait(5)
+        raise TimeoutError("Read timed out")
+
+
+class TokenChain:
+    def stream(self, inputs):
+        yield "Employees get "
+        yield "20 days."
+
+
+def make_service(chain, workers: int = 1) -> RAGService:
+    """RAGService with only what generation needs, no index or LLM client."""
+    service = RAGService.__new__(RAGService)
+    service.logger = logging.getLogger(__name__)
+    service.generation_chain = chain
+    service._generation_executor = ThreadPoolExecutor(max_workers=workers)
+    service.generation_scheduler = FairScheduler(workers)
+    service._llm_unavailable_until = 0.0
+    return service
+
+
+@pytest.fixture
+def fast_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, "generation_start_timeout_seconds", 0.05)
+    monkeypatch.setattr(settings, "generation_queue_timeout_seconds", 5.0)
+    monkeypatch.setattr(settings, "llm_cooldown_seconds", 30.0)
+
+
+def test_tokens_are_joined(fast_timeouts):
+    """A responsive LLM's streamed tokens make up the answer"""
+    service = make_service(TokenChain())
+    assert service._generate("annual leave?", "context", "s1") == "Employees get 20 days."
+    assert service.generation_scheduler.stats()["active"] == 0
+
+
+def test_stalled_stream_gives_up_its_slot(fast_timeouts):
+    """A hung stream degrades its request and frees the slot at once, so later requests don't queue behind it"""
+    chain = StalledChain()
+    service = make_service(chain)
+
+    started = time.monotonic()
+    assert service._generate("annual leave?", "context", "s1") is None
+    assert time.monotonic() - started < 1.0
+    assert service.generation_scheduler.stats()["active"] == 0
+    assert service._llm_unavailable_until > time.monotonic()
+
+    # Cool-down over while the first stream still hangs: the next request is admitted right away
+    service._llm_unavailable_until = 0.0
+    started = time.monotonic()
+    assert service._generate("sick leave?", "context", "s2") is None
+    assert time.monotonic() - started < 1.0
+    assert service.generation_scheduler.stats()["timeouts"] == 0
+
+    # When the read timeout ends the hung streams their slots aren't released a second time
+    chain.unblock.set()
+    service._generation_executor.shutdown(wait=True)
+    assert service.generation_scheduler.stats()["active"] == 0
+    assert chain.calls == 2
+
+
+def test_replay_miss_skips_the_cool_down(fast_timeouts, tmp_path):
+    """An unrecorded prompt in replay mode degrades only its own request, the next one still replays"""
+    store = RecordingStore(str(tmp_path / "recordings.jsonl.gz"))
+    recorder = RecordReplayChain(TokenChain(), lambda inputs: inputs["question"], store, mode="auto", speed=0)
+    assert make_service(recorder)._generate("annual leave?", "context", "s1") == "Employees get 20 days."
+
+    service = make_service(RecordReplayChain(None, lambda inputs: inputs["question"], store, mode="replay", speed=0))
+    assert service._generate("sick leave?", "context", "s1") is None
+    assert service._llm_unavailable_until == 0.0
+    assert service._generate("annual leave?", "context", "s1") == "Employees get 20 days."
+    assert service.generation_scheduler.stats()["active"] == 0
+
+
+if __name__ == "__main__":
+    settings.generation_start_timeout_seconds = 0.05
+    test_tokens_are_joined(None)
+    test_stalled_stream_gives_up_its_slot(None)
+    test_replay_miss_skips_the_cool_down(None, pathlib.Path(tempfile.mkdtemp()))
+    print("✅ All generation tests passed")
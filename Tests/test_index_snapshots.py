@@ -0,0 +1,107 @@
+"""
+Unit tests for versioned index snapshots
+Runs offline in a temporary directory, no backend needed
+"""
+
+import os
+import sys
+import logging
+import tempfile
+import threading
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.index_snapshots import IndexSnapshotManager  # noqa: E402
+
+
+def _build(manager: IndexSnapshotManager, complete: bool = True) -> str:
+    version, _ = manager.allocate()
+    if complete:
+        manager.write_manifest(version, {"chunks": 1})
+    return version
+
+
+def test_activate_and_rollback_order():
+    """Activation is recorded in CURRENT and rollback targets the previous build"""
+    with tempfile.TemporaryDirectory() as root:
+        manager = IndexSnapshotManager(root, keep=3)
+        assert manager.active_version() is None
+
+        first, second = _build(manager), _build(manager)
+        manager.activate(second)
+        assert manager.active_version() == second
+        assert manager.previous_version() == first
+        assert manager.previous_version(first) is None
+
+        incomplete = _build(manager, complete=False)
+        assert incomplete not in [m["version"] for m in manager.list_snapshots()]
+        try:
+            manager.activate(incomplete)
+            assert False, "incomplete snapshots must not be activated"
+        except ValueError:
+            pass
+
+
+def test_prune_keeps_newest_and_active():
+    """Pruning keeps the newest snapshots and never deletes the active one"""
+    with tempfile.TemporaryDirectory() as root:
+        manager = IndexSnapshotManager(root, keep=2)
+        versions = [_build(manager) for _ in range(4)]
+        manager.activate(versions[0])
+
+        removed = manager.prune()
+        assert removed == [versions[1]]
+        assert [m["version"] for m in manager.list_snapshots()] == [versions[0], versions[2], versions[3]]
+
+
+class StubProcessor:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StubRetriever:
+    def __init__(self, version: str):
+        self.index_version = version
+        self.document_processor = StubProcessor()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_swapped_out_index_is_released_after_its_requests():
+    """A replaced snapshot's retriever and Chroma client are closed once no request uses them"""
+    pytest.importorskip("langchain_community")
+    from app.services.rag_service import RAGService
+
+    service = RAGService.__new__(RAGService)
+    service.logger = logging.getLogger(__name__)
+    service._warm_snippets = lambda processor: None
+    service.retriever = None
+    service._retriever_lock = threading.Lock()
+    service._retriever_users = Counter()
+    service._retired_retrievers = set()
+
+    first, second, third = StubRetriever("v1"), StubRetriever("v2"), StubRetriever("v3")
+    service._swap_index(first.document_processor, first)
+    with service.use_retriever() as in_flight:
+        service._swap_index(second.document_processor, second)
+        assert in_flight is first and not first.document_processor.closed
+    assert first.closed and first.document_processor.closed
+
+    service._swap_index(third.document_processor, third)
+    assert second.document_processor.closed and not third.document_processor.closed
+    assert service.retriever is third and not service._retriever_users and not service._retired_retrievers
+
+
+if __name__ == "__main__":
+    test_activate_and_rollback_order()
+    test_prune_keeps_newest_and_active()
+    test_swapped_out_index_is_released_after_its_requests()
+    print("✅ All index snapshot tests passed")
@@ -0,0 +1,179 @@
+"""
+Unit tests for lazily loaded, LRU-evicted knowledge bases
+Runs offline with stub retrievers, no backend needed
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+pytest.importorskip("langchain")
+
+from app.services.knowledge_bases import KnowledgeBaseRegistry, _LoadedKnowledgeBase  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class StubProcessor:
+    def __init__(self):
+        self.size = MB
+        self.closed = False
+
+    def memory_bytes(self):
+        return self.size
+
+    def close(self):
+        self.closed = True
+
+
+class StubRetriever:
+    def __init__(self, name: str):
+        self.name = name
+        self.document_processor = StubProcessor()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StubRegistry(KnowledgeBaseRegistry):
+    """Registry whose knowledge bases load as named placeholders of 1 MB each."""
+
+    def _load(self, name):
+        retriever = StubRetriever(name)
+        return _LoadedKnowledgeBase(retriever=retriever, size_bytes=retriever.document_processor.memory_bytes())
+
+
+def make_registry(names, budget_mb: float) -> KnowledgeBaseRegistry:
+    root = tempfile.mkdtemp()
+    for name in names:
+        os.makedirs(os.path.join(root, name, "docs"))
+    return StubRegistry(root, embeddings=None, memory_budget_mb=budget_mb)
+
+
+def test_discovery_and_lazy_loading():
+    """Knowledge bases are found on disk and loaded once, on first use"""
+    registry = make_registry(["acme", "globex"], budget_mb=10)
+    assert registry.names() == ["acme", "globex"]
+    assert not registry.exists("initech") and not registry.exists("../acme")
+
+    for _ in range(3):
+        with registry.use("acme") as retriever:
+            assert retriever.name == "acme"
+    stats = registry.stats()["knowledge_bases"]["acme"]
+    assert (stats["requests"], stats["loads"], stats["hits"]) == (3, 1, 2)
+    assert "globex" not in registry.stats()["knowledge_bases"]
+
+    with pytest.raises(KeyError):
+        with registry.use("initech"):
+            pass
+
+
+def test_least_recently_used_is_evicted_over_budget():
+    """Over the memory budget the least recently used knowledge base is evicted and closed"""
+    registry = make_registry(["a", "b", "c"], budget_mb=2)
+    retrievers = {}
+    for name in ("a", "b", "a", "c"):
+        with registry.use(name) as retriever:
+            retrievers[name] = retriever
+    assert retrievers["b"].closed and not retrievers["a"].closed and not retrievers["c"].closed
+    assert retrievers["b"].document_processor.closed and not retrievers["a"].document_processor.closed
+    stats = registry.stats()
+    assert not stats["knowledge_bases"]["b"]["loaded"]
+    assert stats["knowledge_bases"]["b"]["evictions"] == 1
+    assert stats["knowledge_bases"]["a"]["loaded"] and stats["knowledge_bases"]["c"]["loaded"]
+    assert stats["memory_used_mb"] == 2
+
+
+def test_knowledge_bases_in_use_are_not_evicted():
+    """A knowledge base serving a request stays loaded until the request ends"""
+    registry = make_registry(["a", "b"], budget_mb=1)
+    with registry.use("a"):
+        with registry.use("b"):
+            assert registry.stats()["knowledge_bases"]["a"]["loaded"]
+        assert not registry.stats()["knowledge_bases"]["b"]["loaded"]
+    assert registry.stats()["memory_used_mb"] == 1
+
+
+def test_lazily_built_indexes_count_after_the_request():
+    """Memory a request adds, like the index built on a first filtered query, counts toward the budget"""
+    registry = make_registry(["a", "b"], budget_mb=2.5)
+    with registry.use("a") as a:
+        pass
+    with registry.use("b") as b:
+        b.document_processor.size = 2 * MB
+        assert registry.stats()["knowledge_bases"]["a"]["loaded"]
+    stats = registry.stats()
+    assert a.closed and not stats["knowledge_bases"]["a"]["loaded"]
+    assert stats["knowledge_bases"]["b"]["size_mb"] == round(2 * MB / 1e6, 2) and stats["memory_used_mb"] == 2
+
+
+def test_latency_percentiles():
+    """Recorded request latencies are reported as percentiles per knowledge base"""
+    registry = make_registry(["a"], budget_mb=1)
+    for ms in range(1, 101):
+        registry.record_latency("a", ms / 1000)
+    stats = registry.stats()["knowledge_bases"]["a"]
+    assert 49 <= stats["latency_p50_ms"] <= 52 and 94 <= stats["latency_p95_ms"] <= 96
+
+
+class FakeChromaSystem:
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeChromaClient:
+    """Mirrors chromadb's class-level cache of one system per persist directory."""
+    _identifier_to_system = {}
+
+    def __init__(self, path: str):
+        self._identifier = path
+        self._identifier_to_system[path] = FakeChromaSystem()
+
+
+def test_loaded_size_and_release():
+    """A knowledge base counts its loaded index and texts, and closing it releases the cached Chroma system"""
+    pytest.importorskip("langchain_community")
+    from types import SimpleNamespace
+
+    import numpy as np
+    from langchain.schema import Document
+
+    from app.services.document_processor import DocumentProcessor
+    from app.services.vector_index import VectorIndex
+
+    processor = DocumentProcessor(vector_store_path=tempfile.mkdtemp(), embeddings=object())
+    index_path = os.path.join(processor.vector_store_path, "index_int8")
+    VectorIndex(mode="int8").build(np.random.rand(100, 384), ids=[str(i) for i in range(100)]).save(index_path)
+    processor.vector_index = VectorIndex.load(index_path)
+    processor.indexed_documents = [Document(page_content="x" * 1000, metadata={"source": "a.txt"})] * 100
+    client = FakeChromaClient(processor.vector_store_path)
+    processor.vector_store = SimpleNamespace(_client=client)
+
+    # int8 codes and scales are resident, the memory-mapped float32 vectors are not
+    size = processor.memory_bytes()
+    assert 100 * (384 + 1000) < size < 100 * (384 * 4 + 1000)
+    processor.get_metadata_index()
+    assert processor.memory_bytes() > size
+
+    system = client._identifier_to_system[processor.vector_store_path]
+    processor.close()
+    assert system.stopped and processor.vector_store_path not in client._identifier_to_system
+    assert processor.vector_index is None and processor.memory_bytes() == 0
+
+
+if __name__ == "__main__":
+    test_discovery_and_lazy_loading()
+    test_least_recently_used_is_evicted_over_budget()
+    test_knowledge_bases_in_use_are_not_evicted()
+    test_lazily_built_indexes_count_after_the_request()
+    test_latency_percentiles()
+    test_loaded_size_and_release()
+    print("✅ All knowledge base tests passed")
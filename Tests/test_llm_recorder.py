@@ -0,0 +1,92 @@
+"""
+Unit tests for recording and replaying LLM completions
+Runs offline with a fake generation chain, no Ollama needed
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.llm_recorder import RecordingStore, RecordReplayChain, prompt_key  # noqa: E402
+
+INPUTS = {"context": "Sick leave is capped at 30 days per year.", "question": "How much sick leave?"}
+
+
+class FakeChain:
+    """Streams a fixed answer word by word, 20 ms apart, and counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, inputs):
+        self.calls += 1
+        for word in ["Up ", "to ", "30 ", "days."]:
+            time.sleep(0.02)
+            yield word
+
+
+def render(inputs: dict) -> str:
+    return f"Context: {inputs['context']}\nQuestion: {inputs['question']}"
+
+
+def make_chain(path: str, mode: str, speed: float = 0.0, chain=None) -> RecordReplayChain:
+    return RecordReplayChain(chain or FakeChain(), render, RecordingStore(path), mode=mode, model="llama3", speed=speed)
+
+
+def test_record_then_replay_from_disk():
+    """A recorded completion is served back from the file without calling the LLM"""
+    path = os.path.join(tempfile.mkdtemp(), "recordings", "completions.jsonl.gz")
+    recorder = make_chain(path, "record")
+    assert recorder.invoke(INPUTS) == "Up to 30 days."
+    recording = recorder.store.get(prompt_key("llama3", render(INPUTS)))
+    assert len(recording.delays_ms) == 4 and all(delay >= 15 for delay in recording.delays_ms)
+
+    live = FakeChain()
+    replayer = make_chain(path, "replay", chain=live)
+    assert len(replayer.store) == 1
+    assert list(replayer.stream(INPUTS)) == ["Up ", "to ", "30 ", "days."]
+    assert live.calls == 0
+
+
+def test_replay_timing():
+    """Replay reproduces the recorded token timing scaled by the speed factor"""
+    path = os.path.join(tempfile.mkdtemp(), "completions.jsonl.gz")
+    make_chain(path, "record").invoke(INPUTS)
+
+    start = time.perf_counter()
+    make_chain(path, "replay", speed=0).invoke(INPUTS)
+    instant = time.perf_counter() - start
+    start = time.perf_counter()
+    make_chain(path, "replay", speed=1.0).invoke(INPUTS)
+    recorded_speed = time.perf_counter() - start
+    assert instant < 0.02 < 0.06 < recorded_speed
+
+
+def test_misses():
+    """Replay fails on unknown prompts, auto records them, partial streams are not stored"""
+    path = os.path.join(tempfile.mkdtemp(), "completions.jsonl.gz")
+    with pytest.raises(KeyError):
+        make_chain(path, "replay").stream(INPUTS)
+
+    partial = make_chain(path, "record").stream(INPUTS)
+    next(partial)
+    partial.close()
+    assert len(RecordingStore(path)) == 0
+
+    live = FakeChain()
+    auto = make_chain(path, "auto", chain=live)
+    auto.invoke(INPUTS)
+    auto.invoke(INPUTS)
+    assert live.calls == 1
+
+
+if __name__ == "__main__":
+    test_record_then_replay_from_disk()
+    test_replay_timing()
+    test_misses()
+    print("✅ All LLM record/replay tests passed")
@@ -0,0 +1,68 @@
+"""
+Unit tests for the inverted metadata index used by filtered retrieval
+Runs offline, no backend needed
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.metadata_index import MetadataIndex, section_metadata  # noqa: E402
+from app.services.section_chunker import SECTION_PATH_SEPARATOR  # noqa: E402
+
+
+def _chunk(source: str, *path: str) -> dict:
+    metadata = {"source": source, "section_path": SECTION_PATH_SEPARATOR.join(path)}
+    metadata.update(section_metadata(path))
+    return metadata
+
+
+METADATAS = [
+    _chunk("HR_Policy_Dataset1.txt", "2. Workplace Conduct", "2.1 Code of Conduct"),
+    _chunk("HR_Policy_Dataset1.txt", "4. Leave Policies", "4.1 Annual Leave"),
+    _chunk("HR_Policy_Dataset1.txt", "4. Leave Policies", "4.2 Sick Leave"),
+    _chunk("HR_Policy_Dataset2.txt", "5. Working Hours and Attendance", "5.2 Overtime"),
+]
+
+
+def test_section_metadata():
+    """Top-level section and slug tags are derived from the heading path"""
+    metadata = section_metadata(("4. Leave Policies", "4.2 Sick Leave"))
+    assert metadata == {"section": "4. Leave Policies", "tags": "leave-policies,sick-leave"}
+
+
+def test_filters_resolve_to_candidate_rows():
+    """Values are OR-ed within a field and fields are AND-ed"""
+    index = MetadataIndex(METADATAS)
+
+    assert index.candidates(None) is None
+    assert index.candidates({"section": ["Leave Policies"]}).tolist() == [1, 2]
+    assert index.candidates({"section": ["4.2 sick leave", "Overtime"]}).tolist() == [2, 3]
+    assert index.candidates({"tag": ["leave-policies"], "source": ["HR_Policy_Dataset2.txt"]}).tolist() == []
+    assert index.candidates({"source": ["hr_policy_dataset1.txt"], "tag": ["code-of-conduct"]}).tolist() == [0]
+
+
+def test_collapsed_duplicates_match_every_source():
+    """A chunk merged from near-duplicates in several files matches a filter on any of them"""
+    merged = dict(METADATAS[1], sources="HR_Policy_Dataset1.txt/HR_Policy_Dataset2.txt")
+    index = MetadataIndex([merged, METADATAS[3]])
+
+    assert index.candidates({"source": ["HR_Policy_Dataset2.txt"]}).tolist() == [0, 1]
+    assert index.candidates({"source": ["HR_Policy_Dataset1.txt"]}).tolist() == [0]
+
+
+def test_file_names_with_commas():
+    """A comma in a file name doesn't split it into several sources"""
+    index = MetadataIndex([{"source": "Leave, 2024.txt"}, {"sources": "Leave, 2024.txt/Leave.txt"}])
+
+    assert index.candidates({"source": ["Leave, 2024.txt"]}).tolist() == [0, 1]
+    assert index.candidates({"source": ["Leave"]}).tolist() == []
+
+
+if __name__ == "__main__":
+    test_section_metadata()
+    test_filters_resolve_to_candidate_rows()
+    test_collapsed_duplicates_match_every_source()
+    test_file_names_with_commas()
+    print("✅ All metadata index tests passed")
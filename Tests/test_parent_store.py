@@ -0,0 +1,106 @@
+"""
+Unit tests for small-to-big retrieval: chunk to parent section mapping and context packing
+Runs offline on the HR policy documents, no vector store needed
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.parent_store import ParentStore  # noqa: E402
+from app.services.section_chunker import SectionChunker  # noqa: E402
+
+DOCS = os.path.join(os.path.dirname(__file__), "..", "PythonBackend", "docs")
+
+
+def load_documents():
+    documents = []
+    for filename in sorted(os.listdir(DOCS)):
+        path = os.path.join(DOCS, filename)
+        with open(path, encoding="utf-8") as f:
+            documents.append(SimpleNamespace(page_content=f.read(), metadata={"source": filename, "file_path": path}))
+    return documents
+
+
+def split(documents, max_tokens: int = 64):
+    """Small chunks the way DocumentProcessor cuts them with the section strategy."""
+    chunks = []
+    for doc in documents:
+        for span in SectionChunker(max_tokens=max_tokens, overlap_tokens=8).split_text(doc.page_content):
+            metadata = dict(doc.metadata, start_index=span.start, section_path=span.section, token_count=span.token_count)
+            chunks.append(SimpleNamespace(page_content=span.text(doc.page_content), metadata=metadata))
+    return chunks
+
+
+def build():
+    documents = load_documents()
+    chunks = split(documents)
+    return ParentStore.build(documents, chunks, SectionChunker(max_tokens=512, overlap_tokens=0), depth=1), chunks
+
+
+def test_every_chunk_points_to_a_parent_holding_it():
+    """Chunks map to the top-level section they were cut from, and each section is stored once"""
+    store, chunks = build()
+    assert 0 < len(store) < len(chunks)
+    for chunk in chunks:
+        parent = store.get(chunk.metadata["parent_id"])
+        assert chunk.page_content in parent.text
+        assert parent.source == chunk.metadata["source"]
+        assert chunk.metadata["section_path"].startswith(parent.section_path)
+
+
+def test_long_sections_are_split():
+    """A section over the parent budget becomes several parents, each holding its chunks' midpoints"""
+    documents = load_documents()
+    chunks = split(documents, max_tokens=32)
+    store = ParentStore.build(documents, chunks, SectionChunker(max_tokens=80, overlap_tokens=0), depth=1)
+    leave = [p for p in store._parents.values() if p.section_path == "4. Leave Policies"]
+    assert len(leave) >= 2 and all(p.token_count <= 80 for p in leave)
+    for chunk in chunks:
+        parent = store.get(chunk.metadata["parent_id"])
+        assert parent.start <= chunk.metadata["start_index"] + len(chunk.page_content) // 2 <= parent.end
+
+
+def test_expand_deduplicates_parents_within_budget():
+    """Siblings share one parent passage, and the token budget falls back to chunks, then stops"""
+    store, chunks = build()
+    by_parent = {}
+    for chunk in chunks:
+        by_parent.setdefault(chunk.metadata["parent_id"], []).append(chunk)
+    siblings = next(group for group in by_parent.values() if len(group) >= 2)
+    parent = store.get(siblings[0].metadata["parent_id"])
+
+    assert store.expand(siblings[:2], max_tokens=2000) == [parent.text]
+
+    other = next(group[0] for group in by_parent.values() if group[0] not in siblings)
+    small_budget = parent.token_count + other.metadata["token_count"]
+    passages = store.expand([siblings[0], other, siblings[1]], max_tokens=small_budget)
+    assert passages[0] == parent.text
+    if store.get(other.metadata["parent_id"]).token_count > other.metadata["token_count"]:
+        assert passages[1] == other.page_content
+
+    assert store.expand(siblings, max_tokens=1) == [siblings[0].page_content]
+
+
+def test_save_and_load():
+    """Parents round-trip through the vector store directory; stores without them expand to chunks"""
+    store, chunks = build()
+    directory = tempfile.mkdtemp()
+    assert len(ParentStore.load(directory)) == 0
+    assert ParentStore.load(directory).expand(chunks[:2], max_tokens=2000) == [c.page_content for c in chunks[:2]]
+
+    store.save(directory)
+    loaded = ParentStore.load(directory)
+    assert len(loaded) == len(store)
+    assert loaded.get(chunks[0].metadata["parent_id"]) == store.get(chunks[0].metadata["parent_id"])
+
+
+if __name__ == "__main__":
+    test_every_chunk_points_to_a_parent_holding_it()
+    test_long_sections_are_split()
+    test_expand_deduplicates_parents_within_budget()
+    test_save_and_load()
+    print("✅ All parent store tests passed")
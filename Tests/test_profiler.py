@@ -0,0 +1,123 @@
+"""
+Unit tests for the on-demand request profiler
+Runs offline, profiles busy loops in the test thread instead of real requests
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.profiler import RequestProfiler  # noqa: E402
+
+
+def busy_request(seconds: float = 0.1) -> int:
+    """Stand-in for a request handler: burns CPU for a while."""
+    total, end = 0, time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+def allocating_request() -> list:
+    return [bytearray(1024) for _ in range(2000)]
+
+
+def test_collapsed_stacks_of_profiled_requests():
+    """Profiled requests show up as collapsed stacks and the session ends after N requests"""
+    profiler = RequestProfiler(interval_ms=1.0)
+    profiler.start(requests=2, allocations=False)
+    for _ in range(2):
+        with profiler.profile_request():
+            busy_request()
+
+    status = profiler.status()
+    assert not status["active"] and status["requests_profiled"] == 2
+    assert status["samples"] > 10 and status["finished_at"] is not None
+
+    lines = profiler.collapsed_stacks().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    frames = stack.split(";")
+    assert int(count) > 0 and frames[-1].startswith("busy_request (")
+    assert any(frame.startswith("test_collapsed_stacks_of_profiled_requests (") for frame in frames)
+
+
+def test_allocation_report():
+    """Allocations made during the session are listed with the allocating line"""
+    profiler = RequestProfiler()
+    profiler.start(requests=1)
+    with profiler.profile_request():
+        kept = allocating_request()
+    report = profiler.allocation_report()
+    assert len(kept) == 2000
+    assert report.startswith("Top 25 allocation sites")
+    assert "test_profiler.py" in report and "bytearray(1024)" in report
+
+
+def test_allocation_report_is_built_outside_the_lock():
+    """Profiled threads aren't blocked while the session's allocation report is compared"""
+    profiler = RequestProfiler()
+    compare = profiler._top_allocations
+    blocked = []
+
+    def slow_compare(snapshot, baseline, limit=25):
+        acquired = profiler._lock.acquire(timeout=1)
+        blocked.append(not acquired)
+        if acquired:
+            profiler._lock.release()
+        return compare(snapshot, baseline, limit)
+
+    profiler._top_allocations = slow_compare
+    profiler.start(requests=1)
+    with profiler.profile_request():
+        allocating_request()
+    assert blocked == [False]
+    assert profiler.allocation_report().startswith("Top 25 allocation sites")
+
+
+def test_session_lifecycle():
+    """One session at a time, the time window ends it, the hook is a no-op outside a session"""
+    profiler = RequestProfiler(interval_ms=1.0, max_seconds=0.05)
+    with profiler.profile_request():
+        busy_request(0.01)
+    assert profiler.status()["requests_profiled"] == 0
+
+    profiler.start(requests=100, seconds=10, allocations=False)
+    with pytest.raises(RuntimeError):
+        profiler.start()
+    time.sleep(0.2)
+    assert not profiler.active
+
+    profiler.start(requests=100, allocations=False)
+    profiler.stop()
+    assert not profiler.active and profiler.collapsed_stacks() == ""
+
+
+def test_request_spanning_two_sessions():
+    """A request that outlives its session neither counts in the next one nor stays registered"""
+    profiler = RequestProfiler(interval_ms=1.0)
+    profiler.start(requests=1, allocations=False)
+    with profiler.profile_request():
+        profiler.stop()
+        profiler.start(requests=1, allocations=False)
+    assert profiler.active and profiler.status()["requests_profiled"] == 0
+    assert not profiler._request_threads
+
+    with profiler.profile_request():
+        busy_request(0.05)
+    assert not profiler.active and profiler.status()["requests_profiled"] == 1
+    assert not profiler._request_threads
+    assert profiler.collapsed_stacks()
+
+
+if __name__ == "__main__":
+    test_collapsed_stacks_of_profiled_requests()
+    test_allocation_report()
+    test_allocation_report_is_built_outside_the_lock()
+    test_session_lifecycle()
+    test_request_spanning_two_sessions()
+    print("✅ All profiler tests passed")
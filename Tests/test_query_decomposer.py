@@ -0,0 +1,77 @@
+"""
+Unit tests for compound question decomposition
+Runs offline, no backend needed
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.query_decomposer import QueryDecomposer  # noqa: E402
+
+
+def test_coordinated_topics_share_frame_and_head():
+    """Frame words and a shared head noun are carried over to every sub-query"""
+    decomposer = QueryDecomposer()
+    assert decomposer.decompose("What are the sick leave and maternity leave rules?") == [
+        "What are the sick leave rules?",
+        "What are the maternity leave rules?",
+    ]
+    assert decomposer.decompose("Tell me about salary, bonuses and health insurance") == [
+        "Tell me about salary",
+        "Tell me about bonuses",
+        "Tell me about health insurance",
+    ]
+
+
+def test_predicate_is_kept_in_every_part():
+    """Verbs, objects and prepositions before the coordinated topics go into every sub-query"""
+    decomposer = QueryDecomposer()
+    assert decomposer.decompose("How do I report harassment and discrimination?") == [
+        "How do I report harassment?",
+        "How do I report discrimination?",
+    ]
+    assert decomposer.decompose("Who approves overtime and leave?") == [
+        "Who approves overtime?",
+        "Who approves leave?",
+    ]
+    assert decomposer.decompose("What is the dress code for men and women?") == [
+        "What is the dress code for men?",
+        "What is the dress code for women?",
+    ]
+
+
+def test_non_noun_phrase_coordination_is_not_split():
+    """Coordinated modifiers, verbs and clauses and set phrases stay one question"""
+    decomposer = QueryDecomposer()
+    for question in [
+        "Do part-time and contract employees get health insurance?",
+        "What are the terms and conditions for resignation?",
+        "What are the terms and conditions?",
+        "What are the health and safety rules?",
+        "Who approves and pays overtime?",
+        "How much sick leave and annual leave do I get?",
+    ]:
+        assert decomposer.decompose(question) == [question]
+
+
+def test_multiple_questions_and_simple_questions():
+    """Separate questions are split, simple questions are left alone"""
+    decomposer = QueryDecomposer(max_parts=2)
+    assert decomposer.decompose("How much sick leave do I get? And what about overtime?") == [
+        "How much sick leave do I get?",
+        "And what about overtime?",
+    ]
+    assert decomposer.decompose("How many days of annual leave do I get?") == [
+        "How many days of annual leave do I get?"
+    ]
+    assert len(decomposer.decompose("Tell me about salary, bonuses and health insurance")) == 2
+
+
+if __name__ == "__main__":
+    test_coordinated_topics_share_frame_and_head()
+    test_predicate_is_kept_in_every_part()
+    test_non_noun_phrase_coordination_is_not_split()
+    test_multiple_questions_and_simple_questions()
+    print("✅ All query decomposer tests passed")
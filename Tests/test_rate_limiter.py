@@ -0,0 +1,87 @@
+"""
+Unit tests for per-session and per-client rate limiting
+Runs offline with a fake clock, no backend needed
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.rate_limiter import RateLimited, RequestRateLimiter, TokenBucketLimiter  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_burst_and_refill():
+    """A key may burst, is then limited with a retry hint, and refills at the configured rate"""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate_per_minute=60, burst=3, clock=clock)
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") == pytest.approx(1.0)
+    assert limiter.acquire("b") == 0.0
+
+    clock.now += 1.0
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("a") > 0
+    clock.now += 60
+    assert [limiter.acquire("a") for _ in range(4)][-1] > 0
+
+    stats = limiter.stats()
+    assert stats["keys"] == 2 and stats["allowed"] == 8 and stats["limited"] == 3
+
+
+def test_least_recently_seen_keys_are_dropped():
+    """Only max_keys buckets are kept"""
+    limiter = TokenBucketLimiter(rate_per_minute=1, burst=1, max_keys=2, clock=FakeClock())
+    for key in ["a", "b", "c"]:
+        limiter.acquire(key)
+    assert limiter.stats()["keys"] == 2
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("c") > 0
+
+
+def test_session_and_client_limits():
+    """Sessions and direct clients are limited; a trusted proxy is limited by the address it forwards"""
+    clock = FakeClock()
+    limiter = RequestRateLimiter(
+        TokenBucketLimiter(rate_per_minute=60, burst=2, clock=clock),
+        TokenBucketLimiter(rate_per_minute=60, burst=4, clock=clock),
+        trusted_proxies=["127.0.0.1"]
+    )
+    limiter.check("s1", peer="10.0.0.5")
+    limiter.check("s1", peer="10.0.0.5")
+    with pytest.raises(RateLimited) as limited:
+        limiter.check("s1", peer="10.0.0.5")
+    assert limited.value.scope == "session" and limited.value.retry_after > 0
+
+    # The refused request still counted against the client
+    limiter.check("s2", peer="10.0.0.5")
+    with pytest.raises(RateLimited) as limited:
+        limiter.check("s3", peer="10.0.0.5")
+    assert limited.value.scope == "client"
+
+    # Users behind the proxy don't share its address bucket
+    for session in ["p1", "p2", "p3", "p4", "p5"]:
+        limiter.check(session, peer="127.0.0.1")
+    assert limiter.client_address("127.0.0.1", "203.0.113.7, 10.1.1.1") == "203.0.113.7"
+    assert limiter.client_address("127.0.0.1", None) is None
+    assert limiter.client_address("10.0.0.5", "203.0.113.7") == "10.0.0.5"
+
+    stats = limiter.stats()
+    assert stats["session"]["limited"] == 1 and stats["client"]["limited"] == 1
+
+
+if __name__ == "__main__":
+    test_token_bucket_burst_and_refill()
+    test_least_recently_seen_keys_are_dropped()
+    test_session_and_client_limits()
+    print("✅ All rate limiter tests passed")
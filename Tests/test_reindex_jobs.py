@@ -0,0 +1,164 @@
+"""
+Unit tests for background reindex jobs
+Runs offline: jobs go through the real worker process pool with lightweight build functions
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.config.settings import settings  # noqa: E402
+from app.services.index_snapshots import IndexSnapshotManager  # noqa: E402
+from app.services.reindex_jobs import (  # noqa: E402
+    CANCELLED, FAILED, FINISHED_STATES, RUNNING, SUCCEEDED, THREAD_LIMIT_VARIABLES, ReindexJobManager
+)
+
+FILES = 3
+INFO = {"documents": ["HR_Policy_Dataset1.txt"], "chunks": 10}
+
+
+def fake_reindex(snapshot_path: str, progress, cancel_event, file_seconds: float = 0.0) -> dict:
+    """Stands in for _run_reindex in the worker: loads "files" one at a time, checking for cancellation."""
+    progress.update(status=RUNNING, worker_pid=os.getpid())
+    for done in range(1, FILES + 1):
+        if cancel_event.is_set():
+            raise InterruptedError("Reindex cancelled")
+        progress.update(files_done=done, files_total=FILES)
+        time.sleep(file_seconds)
+    progress.update(chunks_embedded=10, chunks_total=10)
+    return INFO
+
+
+def slow_reindex(snapshot_path: str, progress, cancel_event) -> dict:
+    return fake_reindex(snapshot_path, progress, cancel_event, file_seconds=0.5)
+
+
+def environment_reindex(snapshot_path: str, progress, cancel_event) -> dict:
+    return {variable: os.environ.get(variable) for variable in THREAD_LIMIT_VARIABLES}
+
+
+def failing_reindex(snapshot_path: str, progress, cancel_event) -> dict:
+    raise ValueError("No documents found to build the index")
+
+
+class FakeRAGService:
+    def __init__(self):
+        self.snapshots = IndexSnapshotManager(tempfile.mkdtemp())
+        self.published = []
+
+    def publish_snapshot(self, version: str, info: dict) -> str:
+        self.published.append((version, info))
+        self.snapshots.write_manifest(version, info)
+        self.snapshots.activate(version)
+        return version
+
+
+def wait_until(jobs: ReindexJobManager, job_id: str, condition, timeout: float = 60.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = jobs.status(job_id)
+        if condition(status):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} stuck in {jobs.status(job_id)}")
+
+
+def finished(status: dict) -> bool:
+    return status["status"] in FINISHED_STATES
+
+
+def test_job_builds_in_worker_process_and_publishes():
+    """A job builds in the worker process, reports progress and publishes its snapshot"""
+    jobs = ReindexJobManager(FakeRAGService(), job=fake_reindex)
+    try:
+        queued = jobs.start()
+        assert queued["files_done"] == 0 and queued["finished_at"] is None
+
+        status = wait_until(jobs, queued["job_id"], finished)
+        assert status["status"] == SUCCEEDED
+        assert status["worker_pid"] != os.getpid()
+        assert (status["files_done"], status["files_total"], status["chunks_embedded"]) == (FILES, FILES, 10)
+        assert status["finished_at"] is not None
+        assert jobs.rag_service.published == [(queued["index_version"], INFO)]
+        assert jobs.rag_service.snapshots.active_version() == queued["index_version"]
+        assert [job["job_id"] for job in jobs.list_jobs()] == [queued["job_id"]]
+    finally:
+        jobs.shutdown()
+
+
+def test_one_job_at_a_time_and_cancellation():
+    """A second job is refused while one runs; a cancelled job stops between files and is discarded"""
+    jobs = ReindexJobManager(FakeRAGService(), job=slow_reindex)
+    try:
+        job_id = jobs.start()["job_id"]
+        wait_until(jobs, job_id, lambda s: s["status"] == RUNNING and s["files_done"] >= 1)
+        with pytest.raises(RuntimeError):
+            jobs.start()
+
+        jobs.cancel(job_id)
+        status = wait_until(jobs, job_id, finished)
+        assert status["status"] == CANCELLED and status["files_done"] < FILES
+        assert jobs.rag_service.published == []
+        assert not os.path.exists(jobs.rag_service.snapshots.snapshot_path(status["index_version"]))
+        assert jobs.cancel("unknown") is None
+    finally:
+        jobs.shutdown()
+
+
+def test_failed_job_is_discarded():
+    """A build error fails the job, discards its snapshot and lets the next job start"""
+    jobs = ReindexJobManager(FakeRAGService(), job=failing_reindex)
+    try:
+        job_id = jobs.start()["job_id"]
+        status = wait_until(jobs, job_id, finished)
+        assert status["status"] == FAILED and "No documents" in status["error"]
+        assert not os.path.exists(jobs.rag_service.snapshots.snapshot_path(status["index_version"]))
+
+        jobs.job = fake_reindex
+        assert wait_until(jobs, jobs.start()["job_id"], finished)["status"] == SUCCEEDED
+    finally:
+        jobs.shutdown()
+
+
+def test_worker_starts_with_thread_caps():
+    """The worker process is spawned with the BLAS thread caps already set, the server's environment is untouched"""
+    before = {variable: os.environ.get(variable) for variable in THREAD_LIMIT_VARIABLES}
+    jobs = ReindexJobManager(FakeRAGService(), job=environment_reindex)
+    try:
+        status = wait_until(jobs, jobs.start()["job_id"], finished)
+        assert status["status"] == SUCCEEDED
+        caps = jobs.rag_service.published[0][1]
+        assert caps == {variable: str(settings.reindex_cpu_threads) for variable in THREAD_LIMIT_VARIABLES}
+        assert {variable: os.environ.get(variable) for variable in THREAD_LIMIT_VARIABLES} == before
+    finally:
+        jobs.shutdown()
+
+
+def test_document_loading_stops_before_the_next_file():
+    """Cancelling while documents load stops before the next file instead of after all of them"""
+    pytest.importorskip("langchain_community")
+    from app.services.document_processor import DocumentProcessor
+
+    docs = tempfile.mkdtemp()
+    for i in range(FILES):
+        with open(os.path.join(docs, f"policy{i}.txt"), "w", encoding="utf-8") as f:
+            f.write(f"{i}. Policy\n\nText of policy {i}.")
+    processor = DocumentProcessor(vector_store_path=tempfile.mkdtemp(), embeddings=object(), docs_directory=docs)
+    loaded = []
+    with pytest.raises(InterruptedError):
+        processor.load_documents(docs, on_progress=lambda done, total: loaded.append(done), should_stop=lambda: bool(loaded))
+    assert loaded == [1]
+
+
+if __name__ == "__main__":
+    test_job_builds_in_worker_process_and_publishes()
+    test_one_job_at_a_time_and_cancellation()
+    test_failed_job_is_discarded()
+    test_worker_starts_with_thread_caps()
+    test_document_loading_stops_before_the_next_file()
+    print("✅ All reindex job tests passed")
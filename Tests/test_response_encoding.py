@@ -0,0 +1,114 @@
+"""
+Unit tests for negotiated encoding and compression of chat responses
+Runs offline, no backend needed
+"""
+
+import gzip
+import json
+import os
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.models.schemas import ChatResponse, SourceSnippet  # noqa: E402
+from app.services.response_encoding import (  # noqa: E402
+    MEDIA_COMPACT_JSON, MEDIA_JSON, MEDIA_MSGPACK, ResponseEncoder, compact_dict, negotiate_encoding,
+    negotiate_media_type
+)
+
+
+def make_response(answer: str = "Employees are entitled to 21 days of paid annual leave per year.") -> ChatResponse:
+    return ChatResponse(
+        response=answer,
+        timestamp=datetime(2025, 1, 1, 12, 0, 0, 250000),
+        sources=["HR_Policy_Dataset1.txt"],
+        snippets=[SourceSnippet(source="HR_Policy_Dataset1.txt", text="21 days of paid annual leave", score=0.8)],
+        session_id=uuid.uuid4()
+    )
+
+
+def test_negotiation():
+    """Accept and Accept-Encoding are matched by q-value, falling back to JSON and identity"""
+    available = [MEDIA_JSON, MEDIA_COMPACT_JSON, MEDIA_MSGPACK]
+    assert negotiate_media_type(None, available) == MEDIA_JSON
+    assert negotiate_media_type("*/*", available) == MEDIA_JSON
+    assert negotiate_media_type("application/x-msgpack", available) == MEDIA_MSGPACK
+    assert negotiate_media_type("application/msgpack", [MEDIA_JSON]) == MEDIA_JSON
+    assert negotiate_media_type(f"{MEDIA_JSON};q=0.5, {MEDIA_COMPACT_JSON}", available) == MEDIA_COMPACT_JSON
+
+    assert negotiate_encoding(None, ["zstd", "gzip"]) is None
+    assert negotiate_encoding("gzip, deflate, br", ["zstd", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("zstd;q=0.5, gzip", ["zstd", "gzip"]) == "gzip"
+    assert negotiate_encoding("*, gzip;q=0", ["gzip"]) is None
+    assert negotiate_encoding("identity", ["zstd", "gzip"]) is None
+
+
+def test_full_json_matches_the_model():
+    """Plain JSON is the full model, compressed only past the size threshold"""
+    encoder = ResponseEncoder(min_bytes=512)
+    short = make_response()
+    response = encoder.encode(short, accept_encoding="gzip")
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"] == MEDIA_JSON
+    assert json.loads(response.body) == json.loads(short.model_dump_json())
+
+    long = make_response(" ".join(["Overtime must be pre-approved by management."] * 40))
+    response = encoder.encode(long, accept="application/json", accept_encoding="gzip, deflate")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert len(response.body) < len(long.response)
+    assert json.loads(gzip.decompress(response.body)) == json.loads(long.model_dump_json())
+
+    assert "content-encoding" not in ResponseEncoder(compression=False).encode(long, accept_encoding="gzip").headers
+
+
+def test_compact_encodings():
+    """Compact encodings drop None values, defaults and the session id, timestamps are Unix seconds"""
+    model = make_response()
+    data = compact_dict(model, drop=("session_id",))
+    assert data["timestamp"] == 1735732800.25
+    assert "session_id" not in data and "degraded" not in data and "index_version" not in data
+    assert data["snippets"] == [{"source": "HR_Policy_Dataset1.txt", "text": "21 days of paid annual leave", "score": 0.8}]
+
+    encoder = ResponseEncoder()
+    response = encoder.encode(model, accept=MEDIA_COMPACT_JSON)
+    assert response.headers["content-type"] == MEDIA_COMPACT_JSON
+    assert json.loads(response.body) == data
+    assert len(response.body) < len(encoder.render(model))
+
+
+def test_msgpack():
+    """msgpack carries the same compact data when the package is installed"""
+    msgpack = pytest.importorskip("msgpack")
+    model = make_response()
+    response = ResponseEncoder().encode(model, accept="application/msgpack")
+    assert response.headers["content-type"] == MEDIA_MSGPACK
+    assert msgpack.unpackb(response.body) == compact_dict(model, drop=("session_id",))
+
+
+def test_concurrent_zstd_compression():
+    """Responses compressed with zstd from many threads at once all decompress to their own body"""
+    zstandard = pytest.importorskip("zstandard")
+    encoder = ResponseEncoder(min_bytes=0)
+    models = [make_response(f"Answer {i}: " + "annual leave " * (50 + i)) for i in range(64)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(lambda model: encoder.encode(model, accept_encoding="zstd"), models))
+    decompressor = zstandard.ZstdDecompressor()
+    for model, response in zip(models, responses):
+        assert response.headers["content-encoding"] == "zstd"
+        assert decompressor.decompress(response.body) == encoder.render(model)
+
+
+if __name__ == "__main__":
+    test_negotiation()
+    test_full_json_matches_the_model()
+    test_compact_encodings()
+    test_msgpack()
+    test_concurrent_zstd_compression()
+    print("✅ All response encoding tests passed")
@@ -0,0 +1,92 @@
+"""
+Property tests for the single-pass response normalizer
+Checks it against the original multi-pass cleanup, whole and streamed
+Runs offline, no backend needed
+"""
+
+import os
+import re
+import sys
+
+from hypothesis import given, settings, strategies as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.response_normalizer import ResponseNormalizer, normalize_response  # noqa: E402
+
+
+def legacy_clean_response(response: str) -> str:
+    """The cleanup RAGService used before, one regex pass per rule"""
+    if not response:
+        return response
+    cleaned = response.strip()
+    cleaned = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned)
+    cleaned = re.sub(r'(?<!\n)\n(?!\n)', ' ', cleaned)
+    cleaned = re.sub(r' +', ' ', cleaned)
+    cleaned = re.sub(r'^["\']+|["\']+$', '', cleaned)
+    cleaned = re.sub(r'\s*\([^)]*Section[^)]*\)\s*$', '', cleaned)
+    cleaned = cleaned.replace('\\n', ' ').replace('\\"', '"')
+    return cleaned.strip()
+
+
+# Fragments that exercise every rule and their interactions
+FRAGMENTS = st.sampled_from([
+    " ", "  ", "\n", "\n\n", "\t", "\r", "\xa0", " ", '"', "'", "\\", "\\n", '\\"', "n",
+    "(", ")", "Section", " (see Section 2)", "word", "Leave", ".", ",",
+])
+ANSWERS = st.lists(FRAGMENTS, max_size=30).map("".join)
+
+
+def stream(text: str, cuts: list) -> str:
+    """Normalize text fed in pieces split at the given offsets"""
+    normalizer = ResponseNormalizer()
+    offsets = [0] + sorted(cut % (len(text) + 1) for cut in cuts) + [len(text)]
+    output = "".join(normalizer.feed(text[start:end]) for start, end in zip(offsets, offsets[1:]))
+    return output + normalizer.finish()
+
+
+@settings(max_examples=2000, deadline=None)
+@given(ANSWERS)
+def test_matches_legacy_cleanup(answer):
+    """Single-pass output equals the multi-pass cleanup"""
+    assert normalize_response(answer) == legacy_clean_response(answer)
+
+
+@settings(max_examples=500, deadline=None)
+@given(st.text(max_size=60))
+def test_matches_legacy_cleanup_on_any_text(answer):
+    """Equality also holds for arbitrary unicode text"""
+    assert normalize_response(answer) == legacy_clean_response(answer)
+
+
+@settings(max_examples=2000, deadline=None)
+@given(ANSWERS, st.lists(st.integers(min_value=0), max_size=8))
+def test_streamed_output_matches_whole_text(answer, cuts):
+    """Feeding an answer in arbitrary pieces gives the same result as cleaning it at once"""
+    assert stream(answer, cuts) == (legacy_clean_response(answer) or "")
+
+
+def test_examples():
+    """Typical LLM output is cleaned as before"""
+    answer = '"Employees get 21 days\nof annual leave.\n\n\n\nUnused days expire. (see Section 3.1)"'
+    assert normalize_response(answer) == "Employees get 21 days of annual leave.\n\nUnused days expire."
+    assert normalize_response("Paid on the 25th\\nof each month") == "Paid on the 25th of each month"
+    assert normalize_response("") == ""
+
+
+def test_stream_emits_final_text_early():
+    """Settled text is emitted before the stream ends, a possible trailing reference is held back"""
+    normalizer = ResponseNormalizer()
+    assert normalizer.feed('"Employees get ') == "Employees get"
+    assert normalizer.feed("21 days (see Sect") == " 21 days"
+    assert normalizer.feed("ion 3.1)") == ""
+    assert normalizer.finish() == ""
+
+
+if __name__ == "__main__":
+    test_matches_legacy_cleanup()
+    test_matches_legacy_cleanup_on_any_text()
+    test_streamed_output_matches_whole_text()
+    test_examples()
+    test_stream_emits_final_text_early()
+    print("✅ All response normalizer tests passed")
@@ -0,0 +1,61 @@
+"""
+Unit tests for the section-aware chunker
+Runs offline against the HR policy documents, no backend needed
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.section_chunker import SectionChunker  # noqa: E402
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "..", "PythonBackend", "docs")
+
+
+def _load(name: str) -> str:
+    with open(os.path.join(DOCS_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_chunks_follow_heading_hierarchy():
+    """Each subsection starts its own chunk and records its section path"""
+    text = _load("HR_Policy_Dataset1.txt")
+    chunks = SectionChunker(max_tokens=128, overlap_tokens=16).split_text(text)
+
+    sick_leave = [c for c in chunks if c.section_path[-1:] == ("4.2 Sick Leave",)]
+    assert len(sick_leave) == 1
+    assert sick_leave[0].section_path == ("4. Leave Policies", "4.2 Sick Leave")
+    assert sick_leave[0].text(text).startswith("4.2 Sick Leave")
+    assert "Maternity" not in sick_leave[0].text(text)
+
+
+def test_offsets_point_into_source():
+    """Chunk offsets slice the original text and never run backwards"""
+    text = _load("HR_Policy_Dataset2.txt")
+    chunks = SectionChunker(max_tokens=32, overlap_tokens=8).split_text(text)
+
+    assert chunks
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous.start < current.start
+    for chunk in chunks:
+        assert 0 <= chunk.start < chunk.end <= len(text)
+        assert chunk.text(text) == text[chunk.start:chunk.end].strip()
+
+
+def test_token_budget_respected():
+    """Body text is packed within the token budget using the supplied counter"""
+    text = "1. Long Section\n\n" + " ".join(f"word{i}." for i in range(200))
+    chunker = SectionChunker(max_tokens=20, overlap_tokens=4, token_counter=lambda s: len(s.split()))
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 5
+    assert all(c.token_count <= 20 + 3 for c in chunks)
+    assert all(c.section == "1. Long Section" for c in chunks)
+
+
+if __name__ == "__main__":
+    test_chunks_follow_heading_hierarchy()
+    test_offsets_point_into_source()
+    test_token_budget_respected()
+    print("✅ All section chunker tests passed")
@@ -0,0 +1,97 @@
+"""
+Unit tests for request tracing
+Runs offline, no backend or collector needed
+"""
+
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PythonBackend"))
+
+from app.services.tracing import JsonLinesExporter, Tracer, current_trace, parse_traceparent, span  # noqa: E402
+
+CALLER_TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+def test_parse_traceparent():
+    """Valid W3C headers are continued, malformed or all-zero ones are ignored"""
+    assert parse_traceparent(CALLER_TRACEPARENT) == ("0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331")
+    assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") is None
+    assert parse_traceparent("not-a-traceparent") is None
+    assert parse_traceparent(None) is None
+
+
+def test_span_tree_and_server_timing():
+    """Stages nest under the request span and repeated top-level stages add up in Server-Timing"""
+    tracer = Tracer()
+    with tracer.start_trace("POST /chat", traceparent=CALLER_TRACEPARENT, correlation_id="req-42") as trace:
+        with span("retrieve"):
+            with span("embed"):
+                pass
+        with span("generate"):
+            pass
+        with span("generate"):
+            pass
+
+    assert trace.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert trace.root.parent_id == "b7ad6b7169203331"
+    assert trace.correlation_id == "req-42"
+    assert trace.traceparent.startswith("00-0af7651916cd43dd8448eb211c80319c-")
+
+    by_name = {s.name: s for s in trace.spans}
+    assert by_name["embed"].parent_id == by_name["retrieve"].span_id
+    assert by_name["retrieve"].parent_id == trace.root.span_id
+
+    timing = trace.server_timing()
+    assert [entry.split(";")[0] for entry in timing.split(", ")] == ["retrieve", "generate", "total"]
+    assert current_trace() is None
+
+
+def test_spans_outside_a_trace_and_in_worker_threads():
+    """Spans are no-ops outside a request and join the trace from a copied context"""
+    with span("orphan") as orphan:
+        assert orphan is None
+
+    def generate_part():
+        with span("generate_part"):
+            pass
+
+    tracer = Tracer()
+    with tracer.start_trace("POST /chat") as trace:
+        with span("generate") as generate, ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(copy_context().run, generate_part) for _ in range(2)]
+            [f.result() for f in futures]
+
+    assert trace.correlation_id == trace.trace_id
+    parts = [s for s in trace.spans if s.name == "generate_part"]
+    assert len(parts) == 2
+    assert all(s.parent_id == generate.span_id for s in parts)
+
+
+def test_jsonl_export():
+    """Finished traces are written as one JSON span per line by the background exporter"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "spans.jsonl")
+        tracer = Tracer(JsonLinesExporter(path))
+        with tracer.start_trace("POST /chat", correlation_id="req-7"):
+            with span("retrieve", chunks=3):
+                pass
+        tracer.shutdown()
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["name"] for r in records] == ["POST /chat", "retrieve"]
+        assert records[1]["attributes"] == {"chunks": 3}
+        assert all(r["correlation_id"] == "req-7" for r in records)
+
+
+if __name__ == "__main__":
+    test_parse_traceparent()
+    test_span_tree_and_server_timing()
+    test_spans_outside_a_trace_and_in_worker_threads()
+    test_jsonl_export()
+    print("✅ All tracing tests passed")